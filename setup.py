@@ -40,7 +40,9 @@ CLASSIFIERS = ['Development Status :: 4 - Beta',
 
 # Add here console scripts like ['hello_world =
 # smdc_perftests.module:function']
-CONSOLE_SCRIPTS = []
+CONSOLE_SCRIPTS = [
+    'smdc_merge_results = smdc_perftests.performance_tests.merge_results:main',
+    'smdc_regression_gate = smdc_perftests.performance_tests.regression:main']
 
 # Versioneer configuration
 versioneer.VCS = 'git'
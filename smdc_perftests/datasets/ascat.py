@@ -27,6 +27,10 @@ import pandas as pd
 import os
 import pygeogrids.grids as grids
 from datetime import timedelta
+from multiprocessing.pool import ThreadPool
+
+from smdc_perftests import stages
+from smdc_perftests import helper
 
 
 class ASCAT_grid(grids.CellGrid):
@@ -62,7 +66,7 @@ class ASCAT_grid(grids.CellGrid):
                                          gpis=gpis[valid_points])
 
 
-class ASCAT_netcdf(object):
+class ASCAT_netcdf(helper.ImageIterationMixin):
 
     """
     Class for reading ASCAT data from netCDF files
@@ -73,6 +77,9 @@ class ASCAT_netcdf(object):
 
     """
 
+    #: time read by get_avg_image if only a start date is given
+    image_span = timedelta(days=1)
+
     def __init__(self, fname, variables=None, avg_var=None, time_var='time',
                  gpi_var='gpis_correct', cell_var='cells_correct',
                  get_exact_time=False):
@@ -165,13 +172,17 @@ class ASCAT_netcdf(object):
                                                  self.ds.variables[self.time_var])
 
         date_slice = slice(start_index, end_index, None)
+        stages.mark('date2index')
         # get position in netCDF from location id
         pos = np.where(self.gpis == locationid)[0][0]
+        stages.mark('index_lookup')
         ts = {}
         for v in self.variables:
             ts[v] = self.ds.variables[v][date_slice, pos]
+        stages.mark('read')
 
         ds = pd.DataFrame(ts, index=self.times)
+        stages.mark('dataframe')
         if self.get_exact_time:
             # read exact time values for gpi and
             ds = ds.dropna(how='all')
@@ -183,9 +194,97 @@ class ASCAT_netcdf(object):
             et = pd.DataFrame({'date': exact_time}, index=exact_time)
             et = et.resample("H", how='first')
             ds = ds.join(et).dropna().set_index('date')
+            stages.mark('exact_time')
 
         return ds
 
+    def _read_cell(self, cellID, date_slice):
+        """
+        read all variables of a cell with one read per variable
+
+        Returns
+        -------
+        gpis: numpy.ndarray
+            gpis of the cell
+        data: dict
+            (time, gpi) arrays of the variables
+        """
+        cell_pos = np.where(self.cells == cellID)[0]
+        gpi_slice = slice(cell_pos[0], cell_pos[-1] + 1, None)
+        data = {}
+        for v in self.variables:
+            data[v] = self.ds.variables[v][date_slice, gpi_slice]
+        return self.gpis[gpi_slice], data
+
+    def iter_cell_timeseries(self, cell, date_start=None, date_end=None,
+                             prefetch=False):
+        """
+        Iterate over the time series of all gpis of one or more cells.
+        Each variable of a cell is read at once instead of one read per
+        gpi and at most two cells are held in memory.
+
+        Parameters
+        ----------
+        cell: int or list
+            cell or cells to read
+        date_start: datetime, optional
+            start date of the time series
+        date_end: datetime, optional
+            end date of the time series
+        prefetch: boolean, optional
+            if set the next cell is read in a background thread while
+            the time series of the current cell are consumed. The dataset
+            must not be read otherwise during the iteration since the
+            netCDF library is not thread safe.
+
+        Yields
+        ------
+        gpi: int
+            grid point index
+        ts: dict
+            time series of every variable and the times under the name
+            of the time variable. The arrays are views into the data of
+            the cell and must be copied if they are kept.
+        """
+        try:
+            cells = list(cell)
+        except TypeError:
+            cells = [cell]
+
+        start_index, end_index = None, None
+        if date_start is not None:
+            start_index = nc.date2index(
+                date_start, self.ds.variables[self.time_var])
+        if date_end is not None:
+            end_index = nc.date2index(
+                date_end, self.ds.variables[self.time_var])
+        date_slice = slice(start_index, end_index, None)
+        times = self.times[date_slice]
+
+        pool = None
+        if prefetch:
+            pool = ThreadPool(1)
+        pending = None
+        try:
+            for i, cellID in enumerate(cells):
+                if pending is None:
+                    gpis, data = self._read_cell(cellID, date_slice)
+                else:
+                    gpis, data = pending.get()
+                pending = None
+                if pool is not None and i + 1 < len(cells):
+                    pending = pool.apply_async(self._read_cell,
+                                               (cells[i + 1], date_slice))
+                for pos, gpi in enumerate(gpis):
+                    ts = dict((v, data[v][:, pos]) for v in data)
+                    ts[self.time_var] = times
+                    yield gpi, ts
+        finally:
+            if pool is not None:
+                # waits for a running read if the iteration stopped early
+                pool.close()
+                pool.join()
+
     def get_avg_image(self, date_start, date_end=None, cellID=None):
         """
         Reads image from dataset, takes the average if more than one value is in the result array.
@@ -202,7 +301,7 @@ class ASCAT_netcdf(object):
             not defined at the moment.
         """
         if date_end is None:
-            date_end = date_start + timedelta(days=1)
+            date_end = date_start + self.image_span
         img = self.get_data(date_start, date_end, cellID=cellID)
         # calculate average
         for v in img:
@@ -210,6 +309,7 @@ class ASCAT_netcdf(object):
                 if v in self.avg_var:
                     img[v][img['ssf'] != 1] = np.nan
                     img[v] = np.nanmean(img[v], axis=0)
+        stages.mark('average')
         return img
 
     def get_data(self, date_start, date_end, cellID=None):
@@ -232,18 +332,23 @@ class ASCAT_netcdf(object):
         end_index = nc.netcdftime.date2index(date_end,
                                              self.ds.variables[self.time_var])
         date_slice = slice(start_index, end_index + 1, None)
+        stages.mark('date2index')
 
         gpi_slice = slice(None, None, None)
         if cellID is not None:
             cell_pos = np.where(self.cells == cellID)[0]
             gpi_slice = slice(cell_pos[0], cell_pos[-1] + 1, None)
+        stages.mark('index_lookup')
 
         img = {}
         for v in self.variables:
             if v in ['ssm', 'ssm_noise']:
-                img[v] = self.ds.variables[v][
-                    date_slice, gpi_slice].astype(np.float)
+                data = self.ds.variables[v][date_slice, gpi_slice]
+                stages.mark('read')
+                img[v] = data.astype(np.float)
+                stages.mark('conversion')
             else:
                 img[v] = self.ds.variables[v][date_slice, gpi_slice]
+                stages.mark('read')
 
         return img
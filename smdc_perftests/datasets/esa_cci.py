@@ -26,6 +26,9 @@ import numpy as np
 import os
 import pygeogrids.grids as grids
 
+from smdc_perftests import stages
+from smdc_perftests import helper
+
 
 class ESACCI_grid(grids.BasicGrid):
 
@@ -56,7 +59,7 @@ class ESACCI_grid(grids.BasicGrid):
                                               subset=self.land_ind, shape=(1440, 720))
 
 
-class ESACCI_netcdf(object):
+class ESACCI_netcdf(helper.ImageIterationMixin):
 
     """
     Class for reading ESA CCI data from netCDF files
@@ -136,11 +139,14 @@ class ESACCI_netcdf(object):
                                                  self.ds.variables[self.time_var])
 
         date_slice = slice(start_index, end_index, None)
+        stages.mark('date2index')
         # get row, column from location id
         row, col = self.grid.gpi2rowcol(locationid)
+        stages.mark('index_lookup')
         ts = {}
         for v in self.variables:
             ts[v] = self.ds.variables[v][date_slice, row, col]
+        stages.mark('read')
         return ts
 
     def get_avg_image(self, date_start, date_end=None, cellID=None):
@@ -168,6 +174,7 @@ class ESACCI_netcdf(object):
                     img[v] = img[v].mean(axis=0)
             else:
                 img[v] = img[v].mean(axis=0)
+        stages.mark('average')
         return img
 
     def get_data(self, date_start, date_end, cellID=1):
@@ -190,9 +197,11 @@ class ESACCI_netcdf(object):
         end_index = nc.netcdftime.date2index(date_end,
                                              self.ds.variables[self.time_var])
         date_slice = slice(start_index, end_index + 1, None)
+        stages.mark('date2index')
 
         img = {}
         for v in self.variables:
             img[v] = self.ds.variables[v][date_slice, :, :]
+        stages.mark('read')
 
         return img
@@ -21,9 +21,21 @@ Created on Wed Apr  1 14:50:18 2015
 @author: christoph.paulik@geo.tuwien.ac.at
 '''
 
+import os
+import ctypes
+import ctypes.util
+import sys
 import random
+import threading
+import Queue
 from datetime import timedelta
 
+import numpy as np
+
+# value of POSIX_FADV_DONTNEED and POSIX_FADV_WILLNEED on linux
+POSIX_FADV_DONTNEED = getattr(os, 'POSIX_FADV_DONTNEED', 4)
+POSIX_FADV_WILLNEED = getattr(os, 'POSIX_FADV_WILLNEED', 3)
+
 
 def generate_date_list(minimum, maximum, n=500, max_spread=30,
                        min_spread=None):
@@ -66,3 +78,341 @@ def generate_date_list(minimum, maximum, n=500, max_spread=30,
         date_list.append([start_date, end_date])
 
     return date_list
+
+
+def generate_date_ranges(minimum, maximum, n=500, start='uniform',
+                         half_life=365.0, spread='uniform', min_spread=None,
+                         max_spread=30, period=None, seed=3000):
+    """
+    Vectorized generation of date ranges.
+
+    Parameters
+    ----------
+    minimum: datetime
+        minimum datetime
+    maximum: datetime
+        maximum datetime
+    n: int, optional
+        number of date ranges to generate
+    start: string, optional
+        distribution of the start dates, 'uniform' or 'recency'. Recency
+        weighted start dates are more likely the closer they are to the
+        maximum.
+    half_life: float, optional
+        half life in days of the weights of recency weighted start dates
+    spread: string, optional
+        distribution of the number of days between start and end date,
+        'fixed' uses max_spread, 'uniform' and 'loguniform' draw
+        between min_spread and max_spread
+    min_spread: int, optional
+        minimum spread in days, default is max_spread
+    max_spread: int, optional
+        maximum spread in days
+    period: string, optional
+        'month' or 'year' aligns the ranges to calendar periods, each range
+        then covers the whole period of its start date and the spread
+        is not used
+    seed: int, optional
+        seed of the random number generator
+
+    Returns
+    -------
+    date_ranges: numpy.ndarray
+        datetime64[D] array of shape (n, 2) with the start and end dates,
+        end dates are clipped to the maximum. See date_range_list to
+        use them with the test_cases functions.
+    """
+    if min_spread is None:
+        min_spread = max_spread
+    rng = np.random.RandomState(seed)
+    first = np.datetime64(minimum, 'D')
+    last = np.datetime64(maximum, 'D')
+    delta_days = (last - first).astype(np.int64)
+
+    if start == 'uniform':
+        offsets = rng.randint(delta_days, size=n)
+    elif start == 'recency':
+        # inverse of the cdf of an exponential distribution of the age
+        # truncated at delta_days
+        rate = np.log(2) / half_life
+        u = rng.random_sample(n)
+        age = -np.log1p(-u * -np.expm1(-rate * delta_days)) / rate
+        offsets = delta_days - 1 - np.floor(age).astype(np.int64)
+    else:
+        raise ValueError("Unknown start distribution %s" % start)
+    starts = first + offsets
+
+    if period is not None:
+        if period == 'month':
+            unit = 'M'
+        elif period == 'year':
+            unit = 'Y'
+        else:
+            raise ValueError("Unknown period %s" % period)
+        aligned = starts.astype('datetime64[%s]' % unit)
+        starts = np.maximum(aligned.astype('datetime64[D]'), first)
+        ends = (aligned + 1).astype('datetime64[D]') - 1
+    else:
+        if spread == 'fixed':
+            days = np.full(n, max_spread, dtype=np.int64)
+        elif spread == 'uniform':
+            days = rng.randint(min_spread, max_spread + 1, size=n)
+        elif spread == 'loguniform':
+            days = np.round(np.exp(rng.uniform(
+                np.log(max(min_spread, 1)), np.log(max(max_spread, 1)),
+                size=n))).astype(np.int64)
+        else:
+            raise ValueError("Unknown spread distribution %s" % spread)
+        ends = starts + days
+
+    return np.column_stack([starts, np.minimum(ends, last)])
+
+
+def date_range_list(date_ranges):
+    """
+    Parameters
+    ----------
+    date_ranges: numpy.ndarray
+        datetime64 array of start and end dates, e.g. from
+        generate_date_ranges
+
+    Returns
+    -------
+    date_list: list
+        list of [start, end] datetime lists as returned by
+        generate_date_list
+    """
+    return date_ranges.astype('datetime64[us]').astype(object).tolist()
+
+
+def image_dates(date_start, date_end, step=timedelta(days=1)):
+    """
+    Parameters
+    ----------
+    date_start: datetime
+        first date
+    date_end: datetime
+        last date, included if it is reached by the steps
+    step: timedelta, optional
+        time between two dates
+
+    Returns
+    -------
+    dates: list
+        dates from date_start to date_end
+    """
+    dates = []
+    date = date_start
+    while date <= date_end:
+        dates.append(date)
+        date = date + step
+    return dates
+
+
+class _ReaderError(object):
+
+    """
+    exception raised in the reader thread of iter_images
+    """
+
+    def __init__(self, exc_info):
+        self.exc_info = exc_info
+
+
+def iter_images(dataset, date_start, date_end, step=timedelta(days=1),
+                prefetch=2, **kwargs):
+    """
+    Iterate over the images of a dataset between two dates. The next
+    images are read by a background thread into a bounded queue while
+    the current one is processed.
+
+    The dataset must not be read otherwise during the iteration
+    since the netCDF library is not thread safe.
+
+    Parameters
+    ----------
+    dataset: dataset instance
+        instance implementing the get_avg_image method
+    date_start: datetime
+        date of the first image
+    date_end: datetime
+        date of the last image
+    step: timedelta, optional
+        time between two images
+    prefetch: int, optional
+        number of images that are read ahead, 0 reads every image
+        when it is requested without a background thread
+    **kwargs:
+        other keywords are passed to the get_avg_image method
+        of the dataset, e.g. cellID
+
+    Yields
+    ------
+    date: datetime
+        date of the image
+    img: dict
+        image as returned by get_avg_image
+    """
+    dates = image_dates(date_start, date_end, step)
+    if prefetch < 1:
+        for date in dates:
+            yield date, dataset.get_avg_image(date, **kwargs)
+        return
+
+    images = Queue.Queue(maxsize=prefetch)
+    stop = threading.Event()
+    done = object()
+
+    def put(item):
+        # give up if the iteration stopped while the queue is full
+        while not stop.is_set():
+            try:
+                images.put(item, timeout=0.1)
+                return True
+            except Queue.Full:
+                pass
+        return False
+
+    def read():
+        try:
+            for date in dates:
+                if stop.is_set():
+                    return
+                if not put((date, dataset.get_avg_image(date, **kwargs))):
+                    return
+        except Exception:
+            put(_ReaderError(sys.exc_info()))
+            return
+        put(done)
+
+    reader = threading.Thread(target=read)
+    reader.daemon = True
+    reader.start()
+    try:
+        while True:
+            item = images.get()
+            if item is done:
+                break
+            if isinstance(item, _ReaderError):
+                exc_type, exc_value, traceback = item.exc_info
+                raise exc_type, exc_value, traceback
+            yield item
+    finally:
+        stop.set()
+        reader.join()
+
+
+class ImageIterationMixin(object):
+
+    """
+    Adds iter_images to a dataset class implementing get_avg_image.
+    """
+
+    def iter_images(self, date_start, date_end, step=timedelta(days=1),
+                    prefetch=2, cellID=None):
+        """
+        Iterate over the images between two dates, the next images
+        are read in a background thread, see helper.iter_images.
+
+        Parameters
+        ----------
+        date_start: datetime
+            date of the first image
+        date_end: datetime
+            date of the last image
+        step: timedelta, optional
+            time between two images
+        prefetch: int, optional
+            number of images that are read ahead, 0 disables prefetching
+        cellID: int, optional
+            cell id to which the images should be limited
+
+        Yields
+        ------
+        date: datetime
+            date of the image
+        img: dict
+            image as returned by get_avg_image
+        """
+        return iter_images(self, date_start, date_end, step=step,
+                           prefetch=prefetch, cellID=cellID)
+
+
+def _posix_fadvise(fd, offset, length, advice):
+    """
+    posix_fadvise for python versions that do not provide
+    os.posix_fadvise
+    """
+    if hasattr(os, 'posix_fadvise'):
+        os.posix_fadvise(fd, offset, length, advice)
+        return
+    libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+    ret = libc.posix_fadvise(ctypes.c_int(fd), ctypes.c_longlong(offset),
+                             ctypes.c_longlong(length), ctypes.c_int(advice))
+    if ret != 0:
+        raise OSError(ret, os.strerror(ret))
+
+
+def evict_page_cache(fname):
+    """
+    Evict the pages of a file from the page cache of the operating system
+    so that the next read has to go to the disk. This does not need
+    root privileges but only works for pages that are not dirty.
+
+    The chunk cache of an open netCDF/HDF5 file is not affected.
+
+    Parameters
+    ----------
+    fname: string
+        file to evict
+    """
+    fd = os.open(fname, os.O_RDONLY)
+    try:
+        _posix_fadvise(fd, 0, 0, POSIX_FADV_DONTNEED)
+    finally:
+        os.close(fd)
+
+
+def warm_page_cache(fname, block_size=2 ** 24):
+    """
+    Read a file completely so that it is in the page cache
+    of the operating system.
+
+    Parameters
+    ----------
+    fname: string
+        file to read
+    block_size: int, optional
+        number of bytes to read at once
+    """
+    fd = os.open(fname, os.O_RDONLY)
+    try:
+        _posix_fadvise(fd, 0, 0, POSIX_FADV_WILLNEED)
+        while os.read(fd, block_size):
+            pass
+    finally:
+        os.close(fd)
+
+
+def prepare_page_cache(fnames, mode):
+    """
+    Bring files into a defined page cache state.
+
+    Parameters
+    ----------
+    fnames: list
+        list of filenames
+    mode: string or None
+        'cold' evicts the files from the page cache, 'warm' reads them
+        into the page cache. None does nothing.
+    """
+    if mode is None:
+        return
+    if mode == 'cold':
+        cache_func = evict_page_cache
+    elif mode == 'warm':
+        cache_func = warm_page_cache
+    else:
+        raise ValueError("Unknown cache mode %s" % mode)
+    for fname in fnames:
+        cache_func(fname)
@@ -20,10 +20,14 @@ Created on Thu Apr  2 14:30:51 2015
 
 @author: christoph.paulik@geo.tuwien.ac.at
 '''
+from multiprocessing import Pool
+
+import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 
 import smdc_perftests.performance_tests.test_cases as test_cases
+from smdc_perftests.performance_tests.store import ResultsStore
 
 try:
     import seaborn as sns
@@ -33,15 +37,75 @@ except ImportError:
     pass
 
 
-def prep_results(results_files, name_fm=None, grouping_f=None):
+def summary_table(results_files, n_processes=8):
+    """
+    Summary statistics and metadata of many results, e.g. to group
+    them by the fingerprint of the machine they ran on.
+
+    Parameters
+    ----------
+    results_files: list or ResultsStore
+        list of filenames to load or a results store whose summary
+        statistics are queried without loading any measurements
+    n_processes: int, optional
+        number of processes loading the summaries of the result files.
+        Processes are used since the netCDF library is not thread safe.
+
+    Returns
+    -------
+    df : pandas.DataFrame
+        one row per result indexed by its name, with a column
+        for each summary statistic and each metadata attribute
+    """
+    if isinstance(results_files, ResultsStore):
+        return results_files.summary(attrs=True)
+    if n_processes > 1 and len(results_files) > 1:
+        pool = Pool(min(n_processes, len(results_files)))
+        try:
+            summaries = pool.map(test_cases.load_summary, results_files)
+        finally:
+            pool.close()
+            pool.join()
+    else:
+        summaries = map(test_cases.load_summary, results_files)
+    rows = []
+    for summary in summaries:
+        row = dict(summary['attrs'])
+        for stat in test_cases.SUMMARY_STATS:
+            row[stat] = summary[stat]
+        rows.append(row)
+    attrs = sorted(set(attr for summary in summaries
+                       for attr in summary['attrs']))
+    return pd.DataFrame(rows, index=[summary['name']
+                                     for summary in summaries],
+                        columns=test_cases.SUMMARY_STATS + attrs)
+
+
+def _matches(row, filters):
+    """
+    check if a row of the summary table passes all filters
+    """
+    for field, condition in filters.items():
+        value = row.get(field)
+        if callable(condition):
+            if not condition(value):
+                return False
+        elif value != condition:
+            return False
+    return True
+
+
+def prep_results(results_files, name_fm=None, grouping_f=None,
+                 n_processes=8, group_by=None, filters=None):
     """
-    Takes a list of results file names and bundles the results into a
-    pandas DataFrame
+    Takes a list of results file names or a results store and bundles
+    the results into a pandas DataFrame
 
     Parameters
     ----------
-    results_files: list
-        list of filenames to load
+    results_files: list or ResultsStore
+        list of filenames to load or a results store whose summary
+        statistics are queried without loading any measurements
     name_fm: function, optional
         if set a function that gets the name of the results and
         returns a more meaningful name. This is useful if the names of
@@ -49,6 +113,15 @@ def prep_results(results_files, name_fm=None, grouping_f=None):
     grouping_f: function ,optional
         can be used to assign groups according to the name of the
         results. Gets the name and returns a string.
+    n_processes: int, optional
+        number of processes loading the summaries of the result files
+    group_by: string, optional
+        metadata attribute, e.g. 'cpu_model' or 'chunks_sm', whose
+        values are used as groups instead of grouping_f
+    filters: dict, optional
+        only results whose metadata attributes match are used. Values
+        are compared for equality or, if callable, get the value of
+        the attribute and return True for matching results.
 
     Returns
     -------
@@ -59,24 +132,190 @@ def prep_results(results_files, name_fm=None, grouping_f=None):
         name_fm = lambda x: x
     if grouping_f is None:
         grouping_f = lambda x: 'means'
+    if filters is None:
+        filters = {}
 
     d = {}
     names = []
 
-    for fname in results_files:
-        res = test_cases.TestResults(fname)
-        name = name_fm(res.name)
+    table = summary_table(results_files, n_processes=n_processes)
+    for res_name, row in table.iterrows():
+        row = row.to_dict()
+        if not _matches(row, filters):
+            continue
+        name = name_fm(res_name)
         if name not in names:
             names.append(name)
-        group = grouping_f(res.name)
+        if group_by is not None:
+            group = str(row.get(group_by))
+        else:
+            group = grouping_f(res_name)
         if group not in d:
             d[group] = []
-        d[group].append(res.mean)
+        d[group].append(row['mean'])
 
     df = pd.DataFrame(d, index=names)
     return df
 
 
+def chunks_touched(results, variable):
+    """
+    Number of chunks along the time axis each call of detailed results
+    touched, from the start_index and end_index columns and the chunk
+    shape stored in the fingerprint of the results.
+
+    Parameters
+    ----------
+    results: TestResults
+        detailed results with request context columns
+    variable: string
+        variable whose chunk shape is used
+
+    Returns
+    -------
+    chunks: numpy.ndarray
+        chunks touched per call, -1 if the context is not known
+    """
+    chunks = results.attrs.get('chunks_' + variable, 'contiguous')
+    if chunks == 'contiguous':
+        time_chunk = None
+    else:
+        time_chunk = int(str(chunks).split(',')[0])
+    columns = results.columns
+    start = columns['start_index']
+    end = columns['end_index']
+    if time_chunk is None:
+        touched = np.ones(start.shape, dtype=np.int64)
+    else:
+        touched = end // time_chunk - start // time_chunk + 1
+    touched[(start < 0) | (end < 0)] = -1
+    return touched
+
+
+def _huber_irls(X, y, c=1.345, max_iter=50, tol=1e-8):
+    """
+    Huber M-estimate of a linear model by iteratively
+    reweighted least squares with MAD scale.
+    """
+    beta = np.linalg.lstsq(X, y, rcond=None)[0]
+    scale = 0.0
+    for _ in range(max_iter):
+        residuals = y - X.dot(beta)
+        scale = np.median(np.abs(residuals - np.median(residuals))) / 0.6745
+        if scale == 0:
+            break
+        u = np.abs(residuals) / scale
+        weights = np.minimum(1.0, c / np.maximum(u, 1e-12))
+        sqrt_w = np.sqrt(weights)
+        new_beta = np.linalg.lstsq(X * sqrt_w[:, np.newaxis], y * sqrt_w,
+                                   rcond=None)[0]
+        converged = np.max(np.abs(new_beta - beta)) <= \
+            tol * (np.max(np.abs(beta)) + tol)
+        beta = new_beta
+        if converged:
+            break
+    return beta, scale
+
+
+def fit_cost_model(results, features=['n_timesteps'], chunk_variable=None):
+    """
+    Fit the latency of the calls of detailed results with a robust
+    linear model, e.g. latency = overhead + b * timesteps + c * chunks.
+    Huber regression is used so that a few slow calls, e.g. page
+    faults or a busy disk, do not distort the marginal costs.
+
+    Parameters
+    ----------
+    results: TestResults
+        detailed results with request context columns
+    features: list, optional
+        columns of the results used as features. 'chunks_touched' is
+        computed with the chunk shape of chunk_variable.
+    chunk_variable: string, optional
+        variable whose chunk shape is used for 'chunks_touched'
+
+    Returns
+    -------
+    model: pandas.Series
+        fixed overhead per call in seconds, marginal cost in seconds
+        per unit of each feature, the number of calls used and the
+        robust scale of the residuals
+    """
+    values = []
+    for feature in features:
+        if feature == 'chunks_touched':
+            values.append(chunks_touched(results, chunk_variable))
+        else:
+            values.append(results.columns[feature])
+    y = results.measurements
+    X = np.column_stack([np.ones(y.shape)] + values).astype(np.float64)
+    valid = np.all(X >= 0, axis=1)
+    if valid.sum() < len(features) + 1:
+        raise ValueError("Not enough calls with known context to fit "
+                         "the cost model of %s." % results.name)
+    beta, scale = _huber_irls(X[valid], y[valid])
+    model = pd.Series(beta, index=['overhead'] + list(features))
+    model['n'] = valid.sum()
+    model['residual_scale'] = scale
+    return model
+
+
+def cost_models(results, features=['n_timesteps'], chunk_variable=None,
+                name_fm=None):
+    """
+    Fit cost models for several dataset variants
+
+    Parameters
+    ----------
+    results: list
+        list of detailed TestResults
+    features: list, optional
+        see fit_cost_model
+    chunk_variable: string, optional
+        see fit_cost_model
+    name_fm: function, optional
+        gets the name of the results and returns the name of the row
+
+    Returns
+    -------
+    df: pandas.DataFrame
+        one cost model per row
+    """
+    if name_fm is None:
+        name_fm = lambda x: x
+    models = [fit_cost_model(res, features=features,
+                             chunk_variable=chunk_variable)
+              for res in results]
+    return pd.DataFrame(models, index=[name_fm(res.name) for res in results])
+
+
+def predict_runtime(model, workload):
+    """
+    Predict the runtime of a workload with a fitted cost model
+
+    Parameters
+    ----------
+    model: pandas.Series
+        cost model returned by fit_cost_model
+    workload: dict or pandas.DataFrame
+        one array of values per feature of the model, one
+        value per request
+
+    Returns
+    -------
+    runtime: float
+        predicted runtime of all requests in seconds
+    """
+    features = [f for f in model.index
+                if f not in ['overhead', 'n', 'residual_scale']]
+    n_requests = len(np.asarray(workload[features[0]])) if features else 0
+    runtime = model['overhead'] * n_requests
+    for feature in features:
+        runtime += model[feature] * np.sum(np.asarray(workload[feature],
+                                                      dtype=np.float64))
+    return float(runtime)
+
+
 def bar_plot(df, show=True):
     """
     Make a bar plot from the gathered results
@@ -0,0 +1,339 @@
+# Copyright (c) 2026,Vienna University of Technology,
+# Department of Geodesy and Geoinformation
+# All rights reserved.
+
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL VIENNA UNIVERSITY OF TECHNOLOGY,
+# DEPARTMENT OF GEODESY AND GEOINFORMATION BE LIABLE FOR ANY
+# DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND
+# ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+'''
+Module for the statistical comparison of test results.
+
+Latency measurements are usually right skewed, so next to the Welch
+t-test on the means a rank based Mann-Whitney U test and bootstrap
+confidence intervals of the ratio of medians are available.
+
+All comparisons are of the second results relative to the first ones,
+positive effect sizes and ratios above 1 mean that the second results
+are slower.
+
+Created on Tue Oct 20 09:15:40 2026
+'''
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+
+def welch_ttest(res_a, res_b):
+    """
+    Welch's t-test for different means with unequal variances.
+    Only the moments are needed, not the raw measurements.
+
+    Parameters
+    ----------
+    res_a: TestResults
+        first results
+    res_b: TestResults
+        second results
+
+    Returns
+    -------
+    t_val: float
+        t statistic of mean_b - mean_a
+    df: float
+        Welch-Satterthwaite degrees of freedom
+    p_val: float
+        two sided p-value
+    """
+    se_a = res_a.var / res_a.n
+    se_b = res_b.var / res_b.n
+    t_val = (res_b.mean - res_a.mean) / np.sqrt(se_a + se_b)
+    df = (se_a + se_b) ** 2 / (se_a ** 2 / (res_a.n - 1) +
+                               se_b ** 2 / (res_b.n - 1))
+    p_val = 2 * stats.t.sf(np.abs(t_val), df)
+    return t_val, df, p_val
+
+
+def hedges_g(res_a, res_b):
+    """
+    standardized difference of the means with small sample correction
+
+    Parameters
+    ----------
+    res_a: TestResults
+        first results
+    res_b: TestResults
+        second results
+
+    Returns
+    -------
+    g: float
+        (mean_b - mean_a) / pooled standard deviation, corrected for bias
+    """
+    n = res_a.n + res_b.n
+    pooled = np.sqrt(((res_a.n - 1) * res_a.var + (res_b.n - 1) * res_b.var) /
+                     (n - 2.0))
+    return (res_b.mean - res_a.mean) / pooled * (1 - 3.0 / (4 * n - 9))
+
+
+def _mann_whitney_u(sorted_a, sorted_b):
+    """
+    Mann-Whitney U of b against a for sorted samples with a tie
+    corrected normal approximation of the two sided p-value.
+    """
+    n_a = float(sorted_a.size)
+    n_b = float(sorted_b.size)
+    less = np.searchsorted(sorted_a, sorted_b, side='left')
+    less_equal = np.searchsorted(sorted_a, sorted_b, side='right')
+    u_b = np.sum(less + (less_equal - less) / 2.0)
+
+    n = n_a + n_b
+    ties = np.unique(np.concatenate([sorted_a, sorted_b]),
+                     return_counts=True)[1].astype(np.float64)
+    tie_term = np.sum(ties ** 3 - ties) / (n * (n - 1))
+    sigma = np.sqrt(n_a * n_b / 12.0 * ((n + 1) - tie_term))
+    if sigma == 0:
+        return u_b, 1.0
+    # continuity correction
+    z = np.abs(np.abs(u_b - n_a * n_b / 2.0) - 0.5) / sigma
+    p_val = min(2 * stats.norm.sf(z), 1.0)
+    return u_b, p_val
+
+
+def mann_whitney_u(res_a, res_b):
+    """
+    Mann-Whitney U test, does not assume normality.
+
+    Parameters
+    ----------
+    res_a: TestResults
+        first results
+    res_b: TestResults
+        second results
+
+    Returns
+    -------
+    u_val: float
+        U statistic of the second results
+    p_val: float
+        two sided p-value from the normal approximation
+    cliffs_delta: float
+        P(b > a) - P(b < a), the effect size between -1 and 1
+    """
+    u_val, p_val = _mann_whitney_u(np.sort(res_a.measurements),
+                                   np.sort(res_b.measurements))
+    cliffs_delta = 2 * u_val / (res_a.n * res_b.n) - 1
+    return u_val, p_val, cliffs_delta
+
+
+def _bootstrap_medians(values, n_boot, rng, max_elements=2 ** 24):
+    """
+    medians of n_boot resamples of values. The resampling is
+    vectorized in blocks of at most max_elements values.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    block = max(1, max_elements // max(values.size, 1))
+    medians = []
+    for start in range(0, n_boot, block):
+        size = min(block, n_boot - start)
+        index = rng.randint(0, values.size, size=(size, values.size))
+        medians.append(np.median(values[index], axis=1))
+    return np.concatenate(medians)
+
+
+def median_ratio(res_a, res_b, n_boot=2000, conf_level=95, seed=0):
+    """
+    ratio of the medians with a percentile bootstrap confidence interval
+
+    Parameters
+    ----------
+    res_a: TestResults
+        first results
+    res_b: TestResults
+        second results
+    n_boot: int, optional
+        number of bootstrap resamples
+    conf_level: float, optional
+        confidence level in percent
+    seed: int, optional
+        seed of the random resampling
+
+    Returns
+    -------
+    lower: float
+        lower confidence interval boundary
+    ratio: float
+        median_b / median_a
+    upper: float
+        upper confidence interval boundary
+    """
+    rng = np.random.RandomState(seed)
+    boot = (_bootstrap_medians(res_b.measurements, n_boot, rng) /
+            _bootstrap_medians(res_a.measurements, n_boot, rng))
+    alpha = (100 - conf_level) / 2.0
+    lower, upper = np.percentile(boot, [alpha, 100 - alpha])
+    return lower, res_b.median / res_a.median, upper
+
+
+def compare(res_a, res_b, n_boot=2000, conf_level=95, seed=0):
+    """
+    run all comparisons of two results
+
+    Parameters
+    ----------
+    res_a: TestResults
+        first results
+    res_b: TestResults
+        second results
+    n_boot: int, optional
+        number of bootstrap resamples
+    conf_level: float, optional
+        confidence level in percent
+    seed: int, optional
+        seed of the random resampling
+
+    Returns
+    -------
+    comparison: dict
+        median_ratio, ratio_lower, ratio_upper, welch_p, mwu_p,
+        hedges_g and cliffs_delta
+    """
+    lower, ratio, upper = median_ratio(res_a, res_b, n_boot=n_boot,
+                                       conf_level=conf_level, seed=seed)
+    u_val, mwu_p, cliffs_delta = mann_whitney_u(res_a, res_b)
+    return {'median_ratio': ratio,
+            'ratio_lower': lower,
+            'ratio_upper': upper,
+            'welch_p': welch_ttest(res_a, res_b)[2],
+            'mwu_p': mwu_p,
+            'hedges_g': hedges_g(res_a, res_b),
+            'cliffs_delta': cliffs_delta}
+
+
+def holm(p_values):
+    """
+    Holm-Bonferroni adjustment of p-values for multiple comparisons
+
+    Parameters
+    ----------
+    p_values: numpy.ndarray
+        p-values, nan values are ignored
+
+    Returns
+    -------
+    adjusted: numpy.ndarray
+        adjusted p-values
+    """
+    p_values = np.asarray(p_values, dtype=np.float64)
+    adjusted = np.full(p_values.shape, np.nan)
+    valid = np.flatnonzero(~np.isnan(p_values))
+    order = valid[np.argsort(p_values.flat[valid])]
+    m = order.size
+    scaled = p_values.flat[order] * (m - np.arange(m))
+    adjusted.flat[order] = np.minimum(np.maximum.accumulate(scaled), 1)
+    return adjusted
+
+
+def compare_matrix(results, n_boot=1000, conf_level=95, seed=0,
+                   adjust='holm'):
+    """
+    Pairwise comparison of many results. Each result is loaded, sorted
+    and bootstrapped only once, the pairwise statistics are computed
+    from these.
+
+    Parameters
+    ----------
+    results: list
+        list of TestResults
+    n_boot: int, optional
+        number of bootstrap resamples
+    conf_level: float, optional
+        confidence level in percent
+    seed: int, optional
+        seed of the random resampling
+    adjust: string, optional
+        'holm' adjusts the p-values for the number of comparisons,
+        None leaves them as they are
+
+    Returns
+    -------
+    matrices: dict
+        pandas.DataFrame for median_ratio, ratio_lower, ratio_upper,
+        welch_p, mwu_p, hedges_g and cliffs_delta. The rows are the
+        first and the columns the second results of each comparison.
+    """
+    rng = np.random.RandomState(seed)
+    names = [res.name for res in results]
+    k = len(results)
+    n = np.array([res.n for res in results], dtype=np.float64)
+    mean = np.array([res.mean for res in results])
+    var = np.array([res.var for res in results])
+    median = np.array([res.median for res in results])
+    sorted_values = []
+    boot = np.empty((k, n_boot))
+    for i, res in enumerate(results):
+        values = res.measurements
+        sorted_values.append(np.sort(values))
+        boot[i] = _bootstrap_medians(values, n_boot, rng)
+
+    # a in rows, b in columns
+    n_a, n_b = n[:, np.newaxis], n[np.newaxis, :]
+    se_a, se_b = (var / n)[:, np.newaxis], (var / n)[np.newaxis, :]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        t_val = (mean[np.newaxis, :] - mean[:, np.newaxis]) / \
+            np.sqrt(se_a + se_b)
+        df = (se_a + se_b) ** 2 / (se_a ** 2 / (n_a - 1) +
+                                   se_b ** 2 / (n_b - 1))
+        welch_p = 2 * stats.t.sf(np.abs(t_val), df)
+        pooled = np.sqrt(((n_a - 1) * var[:, np.newaxis] +
+                          (n_b - 1) * var[np.newaxis, :]) /
+                         (n_a + n_b - 2))
+        g = ((mean[np.newaxis, :] - mean[:, np.newaxis]) / pooled *
+             (1 - 3.0 / (4 * (n_a + n_b) - 9)))
+        ratios = boot[np.newaxis, :, :] / boot[:, np.newaxis, :]
+        alpha = (100 - conf_level) / 2.0
+        ratio_lower, ratio_upper = np.percentile(ratios, [alpha, 100 - alpha],
+                                                 axis=2)
+        ratio = median[np.newaxis, :] / median[:, np.newaxis]
+
+    mwu_p = np.full((k, k), np.nan)
+    cliffs_delta = np.zeros((k, k))
+    for i in range(k):
+        for j in range(i + 1, k):
+            u_val, p_val = _mann_whitney_u(sorted_values[i],
+                                           sorted_values[j])
+            mwu_p[i, j] = mwu_p[j, i] = p_val
+            cliffs_delta[i, j] = 2 * u_val / (n[i] * n[j]) - 1
+            cliffs_delta[j, i] = -cliffs_delta[i, j]
+    np.fill_diagonal(welch_p, np.nan)
+
+    if adjust == 'holm':
+        # every pair is one comparison
+        upper = np.triu_indices(k, 1)
+        for p_matrix in [welch_p, mwu_p]:
+            adjusted = holm(p_matrix[upper])
+            p_matrix[upper] = adjusted
+            p_matrix[upper[1], upper[0]] = adjusted
+    elif adjust is not None:
+        raise ValueError("Unknown p-value adjustment %s" % adjust)
+
+    matrices = {'median_ratio': ratio,
+                'ratio_lower': ratio_lower,
+                'ratio_upper': ratio_upper,
+                'welch_p': welch_p,
+                'mwu_p': mwu_p,
+                'hedges_g': g,
+                'cliffs_delta': cliffs_delta}
+    for key in matrices:
+        matrices[key] = pd.DataFrame(matrices[key], index=names,
+                                     columns=names)
+    return matrices
@@ -0,0 +1,222 @@
+# Copyright (c) 2026,Vienna University of Technology,
+# Department of Geodesy and Geoinformation
+# All rights reserved.
+
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL VIENNA UNIVERSITY OF TECHNOLOGY,
+# DEPARTMENT OF GEODESY AND GEOINFORMATION BE LIABLE FOR ANY
+# DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND
+# ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+'''
+Fingerprint of the environment and the dataset a test ran on. It is
+stored in the metadata of the results so that results from different
+machines and dataset layouts can be told apart.
+
+Created on Thu Oct 22 09:40:17 2026
+'''
+
+import os
+import platform
+import multiprocessing
+
+import numpy as np
+import netCDF4
+
+
+def cpu_info(fname='/proc/cpuinfo'):
+    """
+    Parameters
+    ----------
+    fname: string, optional
+        file to read the cpu model from
+
+    Returns
+    -------
+    info: dict
+        cpu_model and cpu_count
+    """
+    model = platform.processor() or 'unknown'
+    try:
+        with open(fname) as cpuinfo:
+            for line in cpuinfo:
+                if line.startswith('model name'):
+                    model = line.split(':', 1)[1].strip()
+                    break
+    except IOError:
+        pass
+    return {'cpu_model': model,
+            'cpu_count': multiprocessing.cpu_count()}
+
+
+def memory_total(fname='/proc/meminfo'):
+    """
+    Parameters
+    ----------
+    fname: string, optional
+        file to read the memory size from
+
+    Returns
+    -------
+    mem_total: int
+        total memory in bytes, -1 if unknown
+    """
+    try:
+        with open(fname) as meminfo:
+            for line in meminfo:
+                if line.startswith('MemTotal:'):
+                    return int(line.split()[1]) * 1024
+    except IOError:
+        pass
+    return -1
+
+
+def filesystem_type(path, fname='/proc/mounts'):
+    """
+    Parameters
+    ----------
+    path: string
+        path of a file
+    fname: string, optional
+        file listing the mounted filesystems
+
+    Returns
+    -------
+    fs_type: string
+        type of the filesystem the file is stored on,
+        'unknown' if it can not be found
+    """
+    path = os.path.realpath(path)
+    fs_type, mount_len = 'unknown', -1
+    try:
+        with open(fname) as mounts:
+            for line in mounts:
+                parts = line.split()
+                if len(parts) < 3:
+                    continue
+                mount_point = parts[1]
+                if (path == mount_point or
+                        path.startswith(mount_point.rstrip('/') + '/')) \
+                        and len(mount_point) > mount_len:
+                    fs_type, mount_len = parts[2], len(mount_point)
+    except IOError:
+        pass
+    return fs_type
+
+
+def library_versions():
+    """
+    Returns
+    -------
+    versions: dict
+        versions of python, numpy, netCDF4-python and the
+        netCDF and HDF5 libraries
+    """
+    return {'python_version': platform.python_version(),
+            'numpy_version': np.__version__,
+            'netcdf4_python_version': netCDF4.__version__,
+            'netcdf_version': netCDF4.__netcdf4libversion__,
+            'hdf5_version': netCDF4.__hdf5libversion__}
+
+
+def variable_layout(ncdata, variables=None):
+    """
+    Storage layout of the variables of a netCDF file
+
+    Parameters
+    ----------
+    ncdata: netCDF4.Dataset
+        open dataset
+    variables: list, optional
+        names of the variables, default are all variables
+
+    Returns
+    -------
+    layout: dict
+        chunks_<variable> and compression_<variable> as strings,
+        the chunk shape is 'contiguous' for unchunked variables
+    """
+    if variables is None:
+        variables = ncdata.variables.keys()
+    layout = {}
+    for name in variables:
+        var = ncdata.variables[name]
+        chunking = var.chunking()
+        if chunking == 'contiguous' or chunking is None:
+            chunks = 'contiguous'
+        else:
+            chunks = ','.join(str(size) for size in chunking)
+        filters = var.filters() or {}
+        if filters.get('zlib'):
+            compression = 'zlib%d' % filters.get('complevel', 0)
+            if filters.get('shuffle'):
+                compression += '+shuffle'
+        else:
+            compression = 'none'
+        layout['chunks_' + name] = chunks
+        layout['compression_' + name] = compression
+    return layout
+
+
+def dataset_fingerprint(dataset):
+    """
+    Fingerprint of the data file of a dataset. Uses the fname, ds and
+    variables attributes of the readers in smdc_perftests.datasets.
+
+    Parameters
+    ----------
+    dataset: dataset instance
+        dataset to describe
+
+    Returns
+    -------
+    fingerprint: dict
+        filesystem type, file size and storage layout of the
+        variables read. Empty if the dataset has no fname attribute.
+    """
+    fname = getattr(dataset, 'fname', None)
+    if fname is None or not os.path.exists(fname):
+        return {}
+    fingerprint = {'fs_type': filesystem_type(fname),
+                   'file_size': os.path.getsize(fname)}
+    ncdata = getattr(dataset, 'ds', None)
+    if isinstance(ncdata, netCDF4.Dataset):
+        variables = getattr(dataset, 'variables', None)
+        fingerprint.update(variable_layout(ncdata, variables))
+    return fingerprint
+
+
+def fingerprint(dataset=None, **params):
+    """
+    Fingerprint of the environment, the dataset and the
+    parameters of a test run.
+
+    Parameters
+    ----------
+    dataset: dataset instance, optional
+        dataset the test runs on
+    **params: strings or numbers
+        parameters of the test harness, e.g. repeats
+
+    Returns
+    -------
+    fingerprint: dict
+        values are strings or numbers so that they can
+        be stored as netCDF attributes
+    """
+    fingerprint = cpu_info()
+    fingerprint['mem_total'] = memory_total()
+    fingerprint.update(library_versions())
+    if dataset is not None:
+        fingerprint.update(dataset_fingerprint(dataset))
+    for key, value in params.items():
+        if value is None:
+            value = 'None'
+        fingerprint[key] = value
+    return fingerprint
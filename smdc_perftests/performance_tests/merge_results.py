@@ -0,0 +1,108 @@
+# Copyright (c) 2026,Vienna University of Technology,
+# Department of Geodesy and Geoinformation
+# All rights reserved.
+
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL VIENNA UNIVERSITY OF TECHNOLOGY,
+# DEPARTMENT OF GEODESY AND GEOINFORMATION BE LIABLE FOR ANY
+# DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND
+# ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+'''
+Merge the results of benchmarks that were split across processes
+or machines into one result per test.
+
+Usage::
+
+    smdc_merge_results -o merged/ host1/results/ host2/results/
+
+Created on Mon Oct 19 14:20:12 2026
+'''
+
+import os
+import glob
+import argparse
+
+from smdc_perftests.performance_tests.test_cases import TestResults
+
+
+def merge_files(results_files):
+    """
+    Load result files and merge the ones with the same test name
+
+    Parameters
+    ----------
+    results_files: list
+        list of filenames to load
+
+    Returns
+    -------
+    merged: dict
+        merged TestResults with the test names as keys
+    """
+    merged = {}
+    for fname in results_files:
+        res = TestResults(fname)
+        if res.name in merged:
+            merged[res.name] = merged[res.name].merge(res)
+        else:
+            merged[res.name] = res
+    return merged
+
+
+def merge_directories(results_dirs, out_dir):
+    """
+    Merge all result files in the given directories by test name and
+    write one file per test into out_dir.
+
+    Parameters
+    ----------
+    results_dirs: list
+        directories containing result .nc files
+    out_dir: string
+        directory to write the merged results to
+
+    Returns
+    -------
+    fnames: list
+        written files
+    """
+    results_files = []
+    for results_dir in results_dirs:
+        results_files.extend(
+            sorted(glob.glob(os.path.join(results_dir, "*.nc"))))
+    merged = merge_files(results_files)
+    if not os.path.exists(out_dir):
+        os.makedirs(out_dir)
+    fnames = []
+    for name in sorted(merged):
+        fname = os.path.join(out_dir, name + ".nc")
+        merged[name].to_nc(fname)
+        fnames.append(fname)
+    return fnames
+
+
+def main(args=None):
+    """
+    command line interface of merge_directories
+    """
+    parser = argparse.ArgumentParser(
+        description="Merge result files of sharded benchmark runs by "
+                    "test name.")
+    parser.add_argument("results_dirs", nargs='+',
+                        help="directories containing result .nc files")
+    parser.add_argument("-o", "--output", required=True,
+                        help="directory to write the merged results to")
+    args = parser.parse_args(args)
+    fnames = merge_directories(args.results_dirs, args.output)
+    print "merged results into {} files".format(len(fnames))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,294 @@
+# Copyright (c) 2026,Vienna University of Technology,
+# Department of Geodesy and Geoinformation
+# All rights reserved.
+
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL VIENNA UNIVERSITY OF TECHNOLOGY,
+# DEPARTMENT OF GEODESY AND GEOINFORMATION BE LIABLE FOR ANY
+# DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND
+# ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+'''
+Capture of slow outlier calls. A stack sampler runs during the whole
+test and only the samples taken during calls slower than a threshold
+are written to an outlier log, so the median is not slowed down by
+profiling every call.
+
+Created on Wed Oct 28 09:33:52 2026
+'''
+
+import json
+import time
+import signal
+from collections import deque
+
+import numpy as np
+
+
+#: interval timers and their signals StackSampler can sample with
+TIMERS = {'real': (signal.ITIMER_REAL, signal.SIGALRM),
+          'prof': (signal.ITIMER_PROF, signal.SIGPROF)}
+
+
+class StackSampler(object):
+
+    """
+    Samples the stack of the main thread with an interval timer
+    into a ring buffer.
+
+    The default real time timer counts wall clock time, so the stacks
+    of calls blocked on I/O are sampled as well. The profiling timer
+    only counts the CPU time of the process and leaves out the time
+    blocked in system calls. Interrupted system calls are restarted,
+    but on Python 2 time.sleep returns early when the real time timer
+    fires during the sleep.
+
+    Parameters
+    ----------
+    interval: float, optional
+        sampling interval in seconds of wall clock or CPU time
+    max_samples: int, optional
+        size of the ring buffer, older samples are discarded
+    max_depth: int, optional
+        maximum number of frames per sample
+    timer: string, optional
+        'real' to sample in wall clock time with SIGALRM or 'prof'
+        to sample in CPU time with SIGPROF
+    """
+
+    def __init__(self, interval=0.005, max_samples=10000, max_depth=30,
+                 timer='real'):
+        if timer not in TIMERS:
+            raise ValueError("Unknown timer %s, use one of %s" %
+                             (timer, ", ".join(sorted(TIMERS))))
+        self.interval = interval
+        self.max_depth = max_depth
+        self.timer = timer
+        self._itimer, self._signal = TIMERS[timer]
+        self.samples = deque(maxlen=max_samples)
+        self._previous_handler = None
+        self.running = False
+
+    def _handler(self, signum, frame):
+        stack = []
+        while frame is not None and len(stack) < self.max_depth:
+            code = frame.f_code
+            stack.append((code.co_filename, frame.f_lineno, code.co_name))
+            frame = frame.f_back
+        self.samples.append((time.time(), stack))
+
+    def start(self):
+        """
+        start sampling, must be called from the main thread
+        """
+        self._previous_handler = signal.signal(self._signal, self._handler)
+        # signal.signal makes the signal interrupt system calls on
+        # Python 2, restart them instead so the readers never see EINTR
+        signal.siginterrupt(self._signal, False)
+        signal.setitimer(self._itimer, self.interval, self.interval)
+        self.running = True
+
+    def stop(self):
+        """
+        stop sampling and restore the previous signal handler
+        """
+        if not self.running:
+            return
+        signal.setitimer(self._itimer, 0, 0)
+        signal.signal(self._signal, self._previous_handler)
+        self.running = False
+
+    def samples_between(self, start, end):
+        """
+        Parameters
+        ----------
+        start: float
+            start time as returned by time.time()
+        end: float
+            end time as returned by time.time()
+
+        Returns
+        -------
+        stacks: list
+            sampled stacks, innermost frame first, as lists of
+            'file:line(function)' strings
+        """
+        return [['%s:%d(%s)' % frame for frame in stack]
+                for timestamp, stack in list(self.samples)
+                if start <= timestamp <= end]
+
+
+class LatencyThreshold(object):
+
+    """
+    Decides which calls are outliers, either by an absolute latency or
+    by a percentile of the latencies of the recent calls.
+
+    Parameters
+    ----------
+    absolute: float, optional
+        calls slower than this many seconds are outliers
+    percentile: float, optional
+        calls slower than this percentile of the last window calls
+        are outliers, used if absolute is not given
+    window: int, optional
+        number of recent calls the percentile is computed from
+    min_calls: int, optional
+        no call is an outlier before this many calls were seen when
+        a percentile is used
+    update_every: int, optional
+        the percentile is recomputed after this many calls
+    """
+
+    def __init__(self, absolute=None, percentile=99.9, window=10000,
+                 min_calls=100, update_every=100):
+        self.absolute = absolute
+        self.percentile = percentile
+        self.min_calls = min_calls
+        self.update_every = update_every
+        self._window = deque(maxlen=window)
+        self._since_update = 0
+        self.value = absolute
+
+    def is_outlier(self, duration):
+        """
+        Parameters
+        ----------
+        duration: float
+            duration of a call in seconds
+
+        Returns
+        -------
+        outlier: boolean
+            True if the call is slower than the threshold
+        """
+        if self.absolute is not None:
+            return duration > self.absolute
+        self._window.append(duration)
+        self._since_update += 1
+        if len(self._window) < self.min_calls:
+            return False
+        if self.value is None or self._since_update >= self.update_every:
+            self.value = float(np.percentile(self._window, self.percentile))
+            self._since_update = 0
+        return duration > self.value
+
+
+class OutlierCapture(object):
+
+    """
+    Writes the stacks, arguments, request context and I/O counters of
+    calls over a latency threshold to a log with one JSON object per
+    line. Used by SelfTimingDataset.
+
+    Parameters
+    ----------
+    log_file: string
+        path and filename of the outlier log
+    threshold: LatencyThreshold, optional
+        default is the 99.9th percentile of the last 10000 calls
+    sampler: StackSampler, optional
+        default samples every 5 ms of CPU time
+    """
+
+    def __init__(self, log_file, threshold=None, sampler=None):
+        if threshold is None:
+            threshold = LatencyThreshold()
+        if sampler is None:
+            sampler = StackSampler()
+        self.log_file = log_file
+        self.threshold = threshold
+        self.sampler = sampler
+        self.n_outliers = 0
+        self._log = None
+
+    def start(self):
+        """
+        open the log and start the stack sampler
+        """
+        self._log = open(self.log_file, 'a')
+        self.sampler.start()
+
+    def stop(self):
+        """
+        stop the stack sampler and close the log
+        """
+        self.sampler.stop()
+        if self._log is not None:
+            self._log.close()
+            self._log = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *args):
+        self.stop()
+
+    def check(self, funcname, start, end, args=(), kwargs=None,
+              context=None, io=None):
+        """
+        log a call if it is slower than the threshold
+
+        Parameters
+        ----------
+        funcname: string
+            name of the called function
+        start: float
+            start time as returned by time.time()
+        end: float
+            end time as returned by time.time()
+        args: tuple, optional
+            positional arguments of the call
+        kwargs: dict, optional
+            keyword arguments of the call
+        context: dict, optional
+            request context of the call
+        io: dict, optional
+            I/O counters of the call
+
+        Returns
+        -------
+        outlier: boolean
+            True if the call was logged
+        """
+        duration = end - start
+        if not self.threshold.is_outlier(duration):
+            return False
+        self.n_outliers += 1
+        record = {'time': start,
+                  'function': funcname,
+                  'duration': duration,
+                  'threshold': self.threshold.value,
+                  'args': [repr(arg) for arg in args],
+                  'kwargs': dict((key, repr(value)) for key, value in
+                                 (kwargs or {}).items()),
+                  'context': context or {},
+                  'io': io or {},
+                  'stacks': self.sampler.samples_between(start, end)}
+        if self._log is not None:
+            self._log.write(json.dumps(record) + '\n')
+            self._log.flush()
+        return True
+
+
+def read_outlier_log(log_file):
+    """
+    Parameters
+    ----------
+    log_file: string
+        path and filename of the outlier log
+
+    Returns
+    -------
+    records: list
+        one dictionary per logged call
+    """
+    with open(log_file) as log:
+        return [json.loads(line) for line in log if line.strip()]
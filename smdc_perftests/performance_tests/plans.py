@@ -0,0 +1,167 @@
+# Copyright (c) 2026,Vienna University of Technology,
+# Department of Geodesy and Geoinformation
+# All rights reserved.
+
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL VIENNA UNIVERSITY OF TECHNOLOGY,
+# DEPARTMENT OF GEODESY AND GEOINFORMATION BE LIABLE FOR ANY
+# DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND
+# ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+'''
+Precomputed workload plans. A plan samples the positions of the
+requests of every workload before the tests run, so the timed runs only
+iterate over an index array. Each workload has its own random stream
+derived from the seed of the plan and the name of the workload, so
+adding a workload does not change the requests of the others. Plans are
+stored as .npz files to repeat a test run exactly.
+
+Created on Tue Nov  3 09:41:27 2026
+'''
+
+import zlib
+
+import numpy as np
+
+
+class WorkloadPlan(object):
+
+    """
+    Index arrays of the requests of several workloads, one row per run.
+
+    Parameters
+    ----------
+    seed: int, optional
+        seed of the plan, a random seed is chosen if not given
+    """
+
+    def __init__(self, seed=None):
+        if seed is None:
+            seed = np.random.RandomState().randint(2 ** 31 - 1)
+        self.seed = int(seed)
+        self.indices = {}
+        self.sizes = {}
+        self._position = {}
+
+    def rng(self, workload):
+        """
+        Parameters
+        ----------
+        workload: string
+            name of the workload
+
+        Returns
+        -------
+        rng: numpy.random.RandomState
+            random stream of the workload, independent of the
+            streams of the other workloads
+        """
+        return np.random.RandomState(
+            [self.seed, zlib.crc32(workload) & 0xffffffff])
+
+    def add(self, workload, size, n, runs=1, replace=False):
+        """
+        sample the requests of a workload
+
+        Parameters
+        ----------
+        workload: string
+            name of the workload, e.g. 'gpi'
+        size: int
+            size of the population the requests are taken from,
+            e.g. the length of the gpi list
+        n: int
+            number of requests per run
+        runs: int, optional
+            number of runs, each run gets its own sample
+        replace: boolean, optional
+            if set a position can be requested several times per run,
+            by default the requests of a run are distinct like with
+            random.sample
+
+        Returns
+        -------
+        index: numpy.ndarray
+            positions of the requests, shape (runs, n)
+        """
+        rng = self.rng(workload)
+        index = np.empty((runs, n), dtype=np.int64)
+        for run in xrange(runs):
+            index[run] = rng.choice(size, size=n, replace=replace)
+        self.indices[workload] = index
+        self.sizes[workload] = size
+        self._position[workload] = 0
+        return index
+
+    def __contains__(self, workload):
+        return workload in self.indices
+
+    def next_run(self, workload):
+        """
+        Parameters
+        ----------
+        workload: string
+            name of the workload
+
+        Returns
+        -------
+        index: numpy.ndarray
+            positions of the requests of the next run. After the last
+            run the plan starts again with the first one.
+        """
+        index = self.indices[workload]
+        position = self._position[workload]
+        self._position[workload] = (position + 1) % len(index)
+        return index[position]
+
+    def reset(self):
+        """
+        start all workloads again with their first run
+        """
+        for workload in self._position:
+            self._position[workload] = 0
+
+    def save(self, filename):
+        """
+        Parameters
+        ----------
+        filename: string
+            path and filename of the .npz file
+        """
+        arrays = {}
+        for workload, index in self.indices.items():
+            arrays['workload_' + workload] = index
+            arrays['size_' + workload] = self.sizes[workload]
+        np.savez(filename, seed=self.seed, **arrays)
+
+
+def load_plan(filename):
+    """
+    Parameters
+    ----------
+    filename: string
+        path and filename of a plan written by WorkloadPlan.save
+
+    Returns
+    -------
+    plan: WorkloadPlan
+        plan starting with the first run of every workload
+    """
+    data = np.load(filename)
+    try:
+        plan = WorkloadPlan(seed=int(data['seed']))
+        for key in data.files:
+            if key.startswith('workload_'):
+                workload = key[len('workload_'):]
+                plan.indices[workload] = data[key]
+                plan.sizes[workload] = int(data['size_' + workload])
+                plan._position[workload] = 0
+    finally:
+        data.close()
+    return plan
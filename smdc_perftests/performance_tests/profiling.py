@@ -0,0 +1,105 @@
+# Copyright (c) 2026,Vienna University of Technology,
+# Department of Geodesy and Geoinformation
+# All rights reserved.
+
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL VIENNA UNIVERSITY OF TECHNOLOGY,
+# DEPARTMENT OF GEODESY AND GEOINFORMATION BE LIABLE FOR ANY
+# DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND
+# ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+'''
+Aggregation of the cProfile profiles of profiled tests.
+
+Created on Tue Oct 27 10:15:09 2026
+'''
+
+import os
+import pstats
+
+import pandas as pd
+
+
+def _function_name(func):
+    """
+    readable name of a pstats function key
+    """
+    filename, line, name = func
+    if filename == '~':
+        # built-in functions
+        return name
+    return '%s:%d(%s)' % (os.path.basename(filename), line, name)
+
+
+def hot_functions(pstats_files, top=20, sort='tottime'):
+    """
+    Merge profiles of several workloads or datasets into one
+    table of the functions that take the most time.
+
+    Parameters
+    ----------
+    pstats_files: list
+        profiles written by pstats.Stats.dump_stats
+    top: int, optional
+        number of functions in the table
+    sort: string, optional
+        column to sort by, 'tottime', 'cumtime' or 'ncalls'
+
+    Returns
+    -------
+    table: pandas.DataFrame
+        ncalls, tottime and cumtime of each function summed over all
+        profiles, the share of tottime in percent and the number of
+        profiles the function appears in
+    """
+    merged = {}
+    total_tt = 0.0
+    for fname in pstats_files:
+        stats = pstats.Stats(fname).stats
+        for func, (cc, nc, tt, ct, callers) in stats.items():
+            name = _function_name(func)
+            if name not in merged:
+                merged[name] = [0, 0.0, 0.0, 0]
+            merged[name][0] += nc
+            merged[name][1] += tt
+            merged[name][2] += ct
+            merged[name][3] += 1
+            total_tt += tt
+    table = pd.DataFrame.from_dict(
+        merged, orient='index',
+        columns=['ncalls', 'tottime', 'cumtime', 'profiles'])
+    if total_tt > 0:
+        table['percent'] = 100.0 * table['tottime'] / total_tt
+    else:
+        table['percent'] = 0.0
+    table = table[['ncalls', 'tottime', 'percent', 'cumtime', 'profiles']]
+    return table.sort_values(sort, ascending=False).head(top)
+
+
+def write_hot_functions(pstats_files, filename, top=20, sort='tottime'):
+    """
+    write the table of hot_functions as text
+
+    Parameters
+    ----------
+    pstats_files: list
+        profiles written by pstats.Stats.dump_stats
+    filename: string
+        path and filename of the table
+    top: int, optional
+        number of functions in the table
+    sort: string, optional
+        column to sort by
+    """
+    table = hot_functions(pstats_files, top=top, sort=sort)
+    with pd.option_context('display.width', 200,
+                           'display.max_colwidth', 120):
+        text = table.to_string(float_format=lambda x: '%.4f' % x)
+    with open(filename, 'w') as table_file:
+        table_file.write(text + '\n')
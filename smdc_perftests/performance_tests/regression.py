@@ -0,0 +1,268 @@
+# Copyright (c) 2026,Vienna University of Technology,
+# Department of Geodesy and Geoinformation
+# All rights reserved.
+
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL VIENNA UNIVERSITY OF TECHNOLOGY,
+# DEPARTMENT OF GEODESY AND GEOINFORMATION BE LIABLE FOR ANY
+# DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND
+# ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+'''
+Regression gate comparing a candidate against a baseline benchmark run.
+
+Usage::
+
+    smdc_regression_gate baseline_results/ candidate_results/ --threshold 0.05
+    smdc_regression_gate baseline_run candidate_run --store results.sqlite
+
+The command exits with status 1 if any workload got significantly slower
+by more than the threshold. It also fails if nothing could be compared, if
+a workload exists in only one of the runs or if a workload has fewer than
+--min-n measurements. Use --allow-unpaired to compare runs that contain
+different workloads on purpose.
+
+Created on Tue Oct 20 13:48:25 2026
+'''
+
+import os
+import glob
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from smdc_perftests.performance_tests.test_cases import TestResults
+from smdc_perftests.performance_tests import compare
+
+
+def workload_key(name):
+    """
+    Name of the workload without the name of the test run, e.g.
+    'test-rand-gpi_detailed' for 'ESACCI-2Images_test-rand-gpi_detailed'.
+    Results of different runs are paired by this key.
+
+    Parameters
+    ----------
+    name: string
+        name of the results
+
+    Returns
+    -------
+    key: string
+        workload part of the name
+    """
+    pos = name.rfind('_test-')
+    if pos == -1:
+        return name
+    return name[pos + 1:]
+
+
+def _strip_run(names):
+    """
+    Names without the prefix up to the last '_' that all of them share,
+    e.g. ['v1_cci_test-rand-gpi', 'v1_ascat_test-rand-gpi'] become
+    ['cci_test-rand-gpi', 'ascat_test-rand-gpi']
+    """
+    prefix = os.path.commonprefix(names)
+    prefix = prefix[:prefix.rfind('_') + 1]
+    return [name[len(prefix):] for name in names]
+
+
+def _by_key(results, key):
+    """
+    TestResults by key, results whose keys collide, e.g. the same
+    workload on several datasets of one run, are keyed by the dataset
+    and workload part of their name so that they pair across runs
+    """
+    keys = [key(res.name) for res in results]
+    colliding = [i for i, res_key in enumerate(keys)
+                 if keys.count(res_key) > 1]
+    stripped = _strip_run([results[i].name for i in colliding])
+    for i, res_key in zip(colliding, stripped):
+        keys[i] = res_key
+    return dict(zip(keys, results))
+
+
+def load_directory(results_dir, key=workload_key):
+    """
+    Parameters
+    ----------
+    results_dir: string
+        directory containing result .nc files
+    key: function, optional
+        gets the name of the results and returns the key to pair by
+
+    Returns
+    -------
+    results: dict
+        TestResults by key, by the name without the common run prefix
+        if several results of the directory have the same key
+    """
+    return _by_key([TestResults(fname) for fname in
+                    sorted(glob.glob(os.path.join(results_dir, "*.nc")))],
+                   key)
+
+
+def load_run(store, run, key=workload_key):
+    """
+    Parameters
+    ----------
+    store: ResultsStore
+        store containing the run
+    run: string
+        name of the test run
+    key: function, optional
+        gets the name of the results and returns the key to pair by
+
+    Returns
+    -------
+    results: dict
+        TestResults by key, by the name without the common run prefix
+        if several results of the run have the same key
+    """
+    return _by_key(store.load_many(store.names(run=run), run=run), key)
+
+
+def regression_table(baseline, candidate, threshold=0.05, alpha=0.05,
+                     n_boot=1000, min_n=2):
+    """
+    Compare the paired results of a baseline and a candidate.
+
+    A workload regresses if the median of the candidate is more than
+    threshold slower than the median of the baseline and the
+    Mann-Whitney U test is significant at level alpha.
+
+    Parameters
+    ----------
+    baseline: dict
+        TestResults of the baseline by key
+    candidate: dict
+        TestResults of the candidate by key
+    threshold: float, optional
+        tolerated relative slowdown of the median
+    alpha: float, optional
+        significance level
+    n_boot: int, optional
+        number of bootstrap resamples for the confidence interval
+    min_n: int, optional
+        results with fewer measurements are not compared
+
+    Returns
+    -------
+    table: pandas.DataFrame
+        one row per workload that exists in both runs
+    """
+    rows = []
+    keys = sorted(set(baseline) & set(candidate))
+    for key in keys:
+        base, cand = baseline[key], candidate[key]
+        row = {'workload': key,
+               'n_baseline': base.n,
+               'n_candidate': cand.n,
+               'baseline_median': base.median,
+               'candidate_median': cand.median,
+               'change': cand.median / base.median - 1}
+        if base.n >= min_n and cand.n >= min_n:
+            result = compare.compare(base, cand, n_boot=n_boot,
+                                     conf_level=100 * (1 - alpha))
+            row['change_lower'] = result['ratio_lower'] - 1
+            row['change_upper'] = result['ratio_upper'] - 1
+            row['mwu_p'] = result['mwu_p']
+            row['cliffs_delta'] = result['cliffs_delta']
+            row['regression'] = bool(row['change'] > threshold and
+                                     result['mwu_p'] < alpha)
+        else:
+            row['change_lower'] = np.nan
+            row['change_upper'] = np.nan
+            row['mwu_p'] = np.nan
+            row['cliffs_delta'] = np.nan
+            row['regression'] = False
+        rows.append(row)
+    columns = ['n_baseline', 'n_candidate', 'baseline_median',
+               'candidate_median', 'change', 'change_lower', 'change_upper',
+               'mwu_p', 'cliffs_delta', 'regression']
+    return pd.DataFrame(rows, index=[row['workload'] for row in rows],
+                        columns=columns)
+
+
+def main(args=None):
+    """
+    command line interface of the regression gate
+
+    Returns
+    -------
+    status: int
+        1 if a workload regressed or could not be compared, 0 otherwise
+    """
+    parser = argparse.ArgumentParser(
+        description="Compare the results of a candidate benchmark run "
+                    "against a baseline run and fail on regressions.")
+    parser.add_argument("baseline", help="directory of baseline results "
+                                         "or name of the baseline run")
+    parser.add_argument("candidate", help="directory of candidate results "
+                                          "or name of the candidate run")
+    parser.add_argument("--store",
+                        help="results store containing both runs")
+    parser.add_argument("--threshold", type=float, default=0.05,
+                        help="tolerated relative slowdown of the median, "
+                             "default 0.05")
+    parser.add_argument("--alpha", type=float, default=0.05,
+                        help="significance level, default 0.05")
+    parser.add_argument("--n-boot", type=int, default=1000,
+                        help="number of bootstrap resamples")
+    parser.add_argument("--min-n", type=int, default=2,
+                        help="minimum number of measurements of a workload "
+                             "in each run, default 2")
+    parser.add_argument("--allow-unpaired", action="store_true",
+                        help="do not fail on workloads that exist in only "
+                             "one of the runs")
+    args = parser.parse_args(args)
+
+    if args.store is not None:
+        from smdc_perftests.performance_tests.store import ResultsStore
+        with ResultsStore(args.store) as store:
+            baseline = load_run(store, args.baseline)
+            candidate = load_run(store, args.candidate)
+    else:
+        baseline = load_directory(args.baseline)
+        candidate = load_directory(args.candidate)
+    table = regression_table(baseline, candidate, threshold=args.threshold,
+                             alpha=args.alpha, n_boot=args.n_boot,
+                             min_n=args.min_n)
+    if len(table) == 0:
+        print "no workload exists in both runs"
+        return 1
+    with pd.option_context('display.width', 200,
+                           'display.max_columns', 20):
+        print table.to_string(float_format=lambda x: '%.4g' % x)
+
+    status = 0
+    unpaired = sorted(set(baseline) ^ set(candidate))
+    if unpaired:
+        print "not paired: {}".format(", ".join(unpaired))
+        if not args.allow_unpaired:
+            status = 1
+
+    too_few = table.index[(table['n_baseline'] < args.min_n) |
+                          (table['n_candidate'] < args.min_n)]
+    if len(too_few) > 0:
+        print "too few measurements: {}".format(", ".join(too_few))
+        status = 1
+
+    regressions = table.index[table['regression'].astype(bool)]
+    if len(regressions) > 0:
+        print "regressions: {}".format(", ".join(regressions))
+        status = 1
+    return status
+
+
+if __name__ == '__main__':
+    import sys
+    sys.exit(main())
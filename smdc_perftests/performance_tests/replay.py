@@ -0,0 +1,200 @@
+# Copyright (c) 2026,Vienna University of Technology,
+# Department of Geodesy and Geoinformation
+# All rights reserved.
+
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL VIENNA UNIVERSITY OF TECHNOLOGY,
+# DEPARTMENT OF GEODESY AND GEOINFORMATION BE LIABLE FOR ANY
+# DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND
+# ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+'''
+Record and replay of access logs.
+
+An access log has one JSON object per line with the time of the call
+in seconds, the method and its arguments, e.g.::
+
+    {"time": 0.0, "method": "get_timeseries", "args": [1234]}
+    {"time": 0.2, "method": "get_avg_image",
+     "args": ["2007-01-01T00:00:00", "2007-01-31T00:00:00"]}
+
+Dates are written as ISO 8601 strings and converted back to datetime
+objects when the log is read. kwargs are optional.
+
+Created on Mon Nov  2 09:18:46 2026
+'''
+
+import json
+import time
+from datetime import datetime
+
+from smdc_perftests.performance_tests import test_cases
+
+DATE_FORMATS = ['%Y-%m-%dT%H:%M:%S.%f', '%Y-%m-%dT%H:%M:%S', '%Y-%m-%d']
+
+
+def _encode(value):
+    """
+    JSON compatible value of an argument
+    """
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if hasattr(value, 'tolist'):
+        return value.tolist()
+    return value
+
+
+def _decode(value):
+    """
+    argument from a JSON value, ISO dates become datetime objects
+    """
+    if isinstance(value, basestring):
+        for fmt in DATE_FORMATS:
+            try:
+                return datetime.strptime(value, fmt)
+            except ValueError:
+                pass
+    return value
+
+
+class AccessLog(object):
+
+    """
+    Writes the calls of a SelfTimingDataset to an access log.
+
+    Parameters
+    ----------
+    filename: string
+        path and filename of the log, new calls are appended
+    """
+
+    def __init__(self, filename):
+        self.filename = filename
+        self._log = open(filename, 'a')
+
+    def record(self, method, timestamp, args=(), kwargs=None):
+        """
+        append a call to the log
+
+        Parameters
+        ----------
+        method: string
+            name of the called method
+        timestamp: float
+            time of the call as returned by time.time()
+        args: tuple, optional
+            positional arguments
+        kwargs: dict, optional
+            keyword arguments
+        """
+        entry = {'time': timestamp, 'method': method,
+                 'args': [_encode(arg) for arg in args]}
+        if kwargs:
+            entry['kwargs'] = dict((key, _encode(value))
+                                   for key, value in kwargs.items())
+        self._log.write(json.dumps(entry) + '\n')
+
+    def close(self):
+        self._log.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+def read_access_log(filename):
+    """
+    Parameters
+    ----------
+    filename: string
+        path and filename of the log
+
+    Returns
+    -------
+    entries: list
+        dictionaries with time, method, args and kwargs of each call
+        sorted by time
+    """
+    entries = []
+    with open(filename) as log:
+        for line in log:
+            if not line.strip():
+                continue
+            entry = json.loads(line)
+            entries.append({
+                'time': float(entry.get('time', 0.0)),
+                'method': str(entry['method']),
+                'args': [_decode(arg) for arg in entry.get('args', [])],
+                'kwargs': dict((str(key), _decode(value)) for key, value in
+                               entry.get('kwargs', {}).items())})
+    entries.sort(key=lambda entry: entry['time'])
+    return entries
+
+
+def replay(dataset, entries, name='replay', timing='fast', speed=1.0):
+    """
+    Reissue the calls of an access log against a dataset.
+
+    Parameters
+    ----------
+    dataset: dataset instance
+        instance implementing the methods in the log, e.g.
+        get_timeseries, get_avg_image and get_data
+    entries: string or list
+        filename of an access log or entries as returned
+        by read_access_log
+    name: string, optional
+        prefix of the names of the results
+    timing: string, optional
+        'fast' issues the calls as fast as possible, 'original' keeps
+        the intervals between the calls of the log. Calls that can not
+        start in time are issued immediately.
+    speed: float, optional
+        in 'original' timing the intervals are divided by speed
+
+    Returns
+    -------
+    results: dict
+        TestResults of the calls of each method by method name with the
+        I/O counters and request context as columns. In 'original'
+        timing the lag behind the schedule is stored in the lag column.
+    """
+    if timing not in ['fast', 'original']:
+        raise ValueError("Unknown timing %s" % timing)
+    if isinstance(entries, basestring):
+        entries = read_access_log(entries)
+    methods = sorted(set(entry['method'] for entry in entries))
+    timed = test_cases.SelfTimingDataset(dataset, timefuncs=methods)
+    lags = dict((method, []) for method in methods)
+
+    if entries:
+        log_start = entries[0]['time']
+    replay_start = time.time()
+    for entry in entries:
+        lag = 0.0
+        if timing == 'original':
+            scheduled = replay_start + (entry['time'] - log_start) / speed
+            wait = scheduled - time.time()
+            if wait > 0:
+                time.sleep(wait)
+            lag = max(time.time() - scheduled, 0.0)
+        lags[entry['method']].append(lag)
+        getattr(timed, entry['method'])(*entry['args'], **entry['kwargs'])
+
+    results = {}
+    for method in methods:
+        columns = timed.columns(method)
+        if timing == 'original':
+            columns['lag'] = lags[method]
+        results[method] = test_cases.TestResults(
+            timed.measurements[method], '{}_{}'.format(name, method),
+            columns=columns, attrs={'timing': timing, 'speed': speed})
+    return results
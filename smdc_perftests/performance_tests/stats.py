@@ -0,0 +1,502 @@
+# Copyright (c) 2026,Vienna University of Technology,
+# Department of Geodesy and Geoinformation
+# All rights reserved.
+
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL VIENNA UNIVERSITY OF TECHNOLOGY,
+# DEPARTMENT OF GEODESY AND GEOINFORMATION BE LIABLE FOR ANY
+# DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND
+# ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+'''
+Module contains statistics that can be computed on a stream of
+measurements in constant memory and merged afterwards.
+Created on Mon Oct 19 10:12:31 2026
+'''
+
+import math
+import numpy as np
+
+
+class RunningStats(object):
+
+    """
+    Count, mean, variance, minimum, maximum and sum of a
+    stream of values.
+
+    The mean and variance are updated with Welford's online algorithm,
+    batches and other instances are combined with the parallel
+    formula of Chan et al.
+
+    Attributes
+    ----------
+    n: int
+        number of values
+    mean: float
+        mean of the values
+    m2: float
+        sum of squared differences from the mean
+    total: float
+        sum of the values
+    min: float
+        smallest value
+    max: float
+        largest value
+    """
+
+    def __init__(self):
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.total = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+
+    def add(self, value):
+        """
+        add a single value
+
+        Parameters
+        ----------
+        value: float
+            value to add
+        """
+        self.n += 1
+        delta = value - self.mean
+        self.mean += delta / self.n
+        self.m2 += delta * (value - self.mean)
+        self.total += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def add_many(self, values):
+        """
+        add many values at once
+
+        Parameters
+        ----------
+        values: numpy.ndarray or list
+            values to add
+        """
+        values = np.asarray(values, dtype=np.float64)
+        if values.size == 0:
+            return
+        batch = RunningStats()
+        batch.n = values.size
+        batch.mean = values.mean()
+        batch.m2 = np.sum((values - batch.mean) ** 2)
+        batch.total = values.sum()
+        batch.min = values.min()
+        batch.max = values.max()
+        self.update(batch)
+
+    def update(self, other):
+        """
+        combine the values of another instance into this one
+
+        Parameters
+        ----------
+        other: RunningStats
+            instance to combine with
+        """
+        if other.n == 0:
+            return
+        n = self.n + other.n
+        delta = other.mean - self.mean
+        self.mean += delta * other.n / float(n)
+        self.m2 += other.m2 + delta ** 2 * self.n * other.n / float(n)
+        self.n = n
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def merge(self, other):
+        """
+        Parameters
+        ----------
+        other: RunningStats
+            instance to combine with
+
+        Returns
+        -------
+        merged: RunningStats
+            new instance that represents the values of both
+        """
+        merged = RunningStats()
+        merged.update(self)
+        merged.update(other)
+        return merged
+
+    def var(self, ddof=1):
+        """
+        Parameters
+        ----------
+        ddof: int, optional
+            difference degrees of freedom
+
+        Returns
+        -------
+        var: float
+            variance, nan if there are not more than ddof values
+        """
+        if self.n - ddof <= 0:
+            return np.nan
+        return self.m2 / (self.n - ddof)
+
+
+class TDigest(object):
+
+    """
+    Mergeable quantile sketch after Dunning's t-digest.
+
+    Values are buffered and regularly compressed into at most
+    about compression / 2 weighted centroids. The centroids are small
+    at the tails so extreme quantiles stay accurate. Memory does not
+    depend on the number of values.
+
+    Parameters
+    ----------
+    compression: float, optional
+        higher values give more centroids and more accurate quantiles
+    buffer_size: int, optional
+        number of values that are buffered before compressing,
+        default is five times the compression
+    """
+
+    def __init__(self, compression=200, buffer_size=None):
+        self.compression = compression
+        if buffer_size is None:
+            buffer_size = int(5 * compression)
+        self.buffer_size = buffer_size
+        self.means = np.empty(0)
+        self.weights = np.empty(0)
+        self.min = np.inf
+        self.max = -np.inf
+        self._buffer = []
+
+    def _k(self, q):
+        """
+        k1 scale function of the t-digest
+        """
+        return (self.compression / (2 * math.pi) *
+                np.arcsin(np.clip(2 * q - 1, -1, 1)))
+
+    def _compress(self, means, weights):
+        """
+        merge weighted points into centroids. Neighbouring points are
+        merged as long as they fall into the same unit interval of the
+        scale function.
+        """
+        if means.size == 0:
+            return
+        order = np.argsort(means, kind='mergesort')
+        means = means[order]
+        weights = weights[order]
+        self.min = min(self.min, means[0])
+        self.max = max(self.max, means[-1])
+        total = weights.sum()
+        q_left = (np.cumsum(weights) - weights) / total
+        ids = np.floor(self._k(q_left) - self._k(0)).astype(np.int64)
+        # ids are sorted, so the centroids stay sorted
+        ids = np.unique(ids, return_inverse=True)[1]
+        new_weights = np.bincount(ids, weights=weights)
+        self.means = np.bincount(ids, weights=weights * means) / new_weights
+        self.weights = new_weights
+
+    def _flush(self):
+        if len(self._buffer) == 0:
+            return
+        buffered = np.asarray(self._buffer, dtype=np.float64)
+        self._buffer = []
+        self._compress(np.concatenate([self.means, buffered]),
+                       np.concatenate([self.weights,
+                                       np.ones(buffered.size)]))
+
+    def add(self, value):
+        """
+        Parameters
+        ----------
+        value: float
+            value to add
+        """
+        self._buffer.append(value)
+        if len(self._buffer) >= self.buffer_size:
+            self._flush()
+
+    def add_many(self, values):
+        """
+        Parameters
+        ----------
+        values: numpy.ndarray or list
+            values to add
+        """
+        values = np.asarray(values, dtype=np.float64)
+        self._flush()
+        self._compress(np.concatenate([self.means, values]),
+                       np.concatenate([self.weights, np.ones(values.size)]))
+
+    def update(self, other):
+        """
+        combine the centroids of another digest into this one
+
+        Parameters
+        ----------
+        other: TDigest
+            digest to combine with
+        """
+        self._flush()
+        other._flush()
+        self._compress(np.concatenate([self.means, other.means]),
+                       np.concatenate([self.weights, other.weights]))
+
+    def merge(self, other):
+        """
+        Parameters
+        ----------
+        other: TDigest
+            digest to combine with
+
+        Returns
+        -------
+        merged: TDigest
+            new digest representing the values of both
+        """
+        merged = TDigest(compression=max(self.compression,
+                                         other.compression),
+                         buffer_size=self.buffer_size)
+        merged.update(self)
+        merged.update(other)
+        return merged
+
+    @property
+    def n(self):
+        """
+        number of values in the digest
+        """
+        return int(self.weights.sum()) + len(self._buffer)
+
+    def quantile(self, q):
+        """
+        estimate quantiles by interpolating between the centroids
+
+        Parameters
+        ----------
+        q: float or numpy.ndarray
+            quantiles between 0 and 1
+
+        Returns
+        -------
+        values: float or numpy.ndarray
+            estimated values at the quantiles, nan if the digest is empty
+        """
+        self._flush()
+        if self.weights.size == 0:
+            return np.nan * np.asarray(q, dtype=np.float64)
+        total = self.weights.sum()
+        centers = np.cumsum(self.weights) - self.weights / 2.0
+        positions = np.concatenate([[0], centers, [total]])
+        values = np.concatenate([[self.min], self.means, [self.max]])
+        return np.interp(np.asarray(q, dtype=np.float64) * total,
+                         positions, values)
+
+
+class LogHistogram(object):
+
+    """
+    Histogram with logarithmically growing buckets in the spirit of
+    HdrHistogram. Every bucket is precision times wider than the
+    previous one so each recorded value is known to within this
+    relative precision. Histograms with the same configuration are
+    merged by adding the counts.
+
+    Values below lowest and above highest are counted in an underflow
+    and an overflow bucket.
+
+    Parameters
+    ----------
+    lowest: float, optional
+        lower boundary of the first bucket
+    highest: float, optional
+        upper boundary of the last bucket
+    precision: float, optional
+        relative width of the buckets
+    """
+
+    def __init__(self, lowest=1e-6, highest=1e5, precision=0.01):
+        self.lowest = lowest
+        self.highest = highest
+        self.precision = precision
+        self._log_base = math.log1p(precision)
+        self.n_buckets = int(math.ceil(math.log(highest / lowest) /
+                                       self._log_base))
+        # first bucket is underflow, last bucket is overflow
+        self.counts = np.zeros(self.n_buckets + 2, dtype=np.int64)
+        self.min = np.inf
+        self.max = -np.inf
+
+    def _index(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            index = np.floor(np.log(values / self.lowest) / self._log_base)
+        index = np.where(values < self.lowest, -1, index)
+        return np.clip(index, -1, self.n_buckets).astype(np.int64) + 1
+
+    def add(self, value):
+        """
+        Parameters
+        ----------
+        value: float
+            value to add
+        """
+        self.counts[self._index(value)] += 1
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def add_many(self, values):
+        """
+        Parameters
+        ----------
+        values: numpy.ndarray or list
+            values to add
+        """
+        values = np.asarray(values, dtype=np.float64)
+        if values.size == 0:
+            return
+        self.counts += np.bincount(self._index(values),
+                                   minlength=self.counts.size)
+        self.min = min(self.min, values.min())
+        self.max = max(self.max, values.max())
+
+    def same_buckets(self, other):
+        """
+        True if the buckets of the other histogram are identical
+        """
+        return (self.lowest == other.lowest and
+                self.highest == other.highest and
+                self.precision == other.precision)
+
+    def update(self, other):
+        """
+        add the counts of another histogram to this one
+
+        Parameters
+        ----------
+        other: LogHistogram
+            histogram with the same buckets
+        """
+        if not self.same_buckets(other):
+            raise ValueError("Histograms with different buckets "
+                             "can not be combined.")
+        self.counts += other.counts
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def merge(self, other):
+        """
+        Parameters
+        ----------
+        other: LogHistogram
+            histogram with the same buckets
+
+        Returns
+        -------
+        merged: LogHistogram
+            new histogram with the counts of both
+        """
+        merged = LogHistogram(self.lowest, self.highest, self.precision)
+        merged.update(self)
+        merged.update(other)
+        return merged
+
+    @property
+    def n(self):
+        """
+        number of values in the histogram
+        """
+        return int(self.counts.sum())
+
+    def bucket_values(self):
+        """
+        Returns
+        -------
+        values: numpy.ndarray
+            representative value, the geometric center, of each bucket
+        """
+        index = np.arange(self.counts.size) - 1 + 0.5
+        values = self.lowest * np.exp(index * self._log_base)
+        values[0] = self.lowest
+        values[-1] = self.highest
+        return values
+
+    def percentile(self, q):
+        """
+        Parameters
+        ----------
+        q: float or list
+            percentiles between 0 and 100
+
+        Returns
+        -------
+        values: float or numpy.ndarray
+            value of the bucket that contains the percentile, limited to
+            the smallest and largest value added. Percentiles in the
+            underflow or overflow bucket are the smallest or largest
+            value. nan if empty.
+        """
+        q = np.asarray(q, dtype=np.float64)
+        n = self.n
+        if n == 0:
+            return np.nan * q
+        rank = np.maximum(np.ceil(q / 100.0 * n), 1)
+        index = np.searchsorted(np.cumsum(self.counts), rank)
+        values = self.bucket_values()
+        # the only known values outside of the range are the extremes
+        values[0] = self.min
+        values[-1] = self.max
+        return np.clip(values[index], self.min, self.max)
+
+    def to_sparse(self):
+        """
+        Returns
+        -------
+        index: numpy.ndarray
+            indices of the non empty buckets
+        counts: numpy.ndarray
+            counts of the non empty buckets
+        """
+        index = np.nonzero(self.counts)[0]
+        return index, self.counts[index]
+
+    @classmethod
+    def from_sparse(cls, index, counts, min_value, max_value, **kwargs):
+        """
+        create a histogram from the output of to_sparse
+
+        Parameters
+        ----------
+        index: numpy.ndarray
+            indices of the non empty buckets
+        counts: numpy.ndarray
+            counts of the non empty buckets
+        min_value: float
+            smallest value that was added
+        max_value: float
+            largest value that was added
+        **kwargs:
+            bucket configuration passed to the constructor
+        """
+        hist = cls(**kwargs)
+        hist.counts[np.asarray(index, dtype=np.int64)] = counts
+        hist.min = min_value
+        hist.max = max_value
+        return hist
@@ -0,0 +1,333 @@
+# Copyright (c) 2026,Vienna University of Technology,
+# Department of Geodesy and Geoinformation
+# All rights reserved.
+
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL VIENNA UNIVERSITY OF TECHNOLOGY,
+# DEPARTMENT OF GEODESY AND GEOINFORMATION BE LIABLE FOR ANY
+# DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND
+# ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+'''
+Module contains a results store that keeps all test results of many
+test runs in one SQLite database instead of one netCDF file per result.
+
+Created on Wed Oct 21 09:05:33 2026
+'''
+
+import json
+import sqlite3
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from smdc_perftests.performance_tests.test_cases import TestResults
+from smdc_perftests.performance_tests.test_cases import SUMMARY_STATS
+from smdc_perftests.performance_tests.regression import workload_key
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    name TEXT UNIQUE NOT NULL,
+    created TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS tests (
+    id INTEGER PRIMARY KEY,
+    run_id INTEGER REFERENCES runs(id),
+    name TEXT NOT NULL,
+    workload TEXT NOT NULL,
+    ddof INTEGER NOT NULL,
+    attrs TEXT NOT NULL,
+    UNIQUE (run_id, name)
+);
+CREATE INDEX IF NOT EXISTS tests_run ON tests(run_id);
+CREATE INDEX IF NOT EXISTS tests_workload ON tests(workload);
+CREATE TABLE IF NOT EXISTS summary (
+    test_id INTEGER PRIMARY KEY REFERENCES tests(id),
+    n INTEGER, mean REAL, median REAL, var REAL, stdev REAL, total REAL,
+    min REAL, max REAL, p95 REAL, p99 REAL, p999 REAL
+);
+CREATE TABLE IF NOT EXISTS measurements (
+    test_id INTEGER NOT NULL REFERENCES tests(id),
+    idx INTEGER NOT NULL,
+    value REAL NOT NULL,
+    PRIMARY KEY (test_id, idx)
+);
+CREATE TABLE IF NOT EXISTS measurement_columns (
+    test_id INTEGER NOT NULL REFERENCES tests(id),
+    name TEXT NOT NULL,
+    idx INTEGER NOT NULL,
+    value,
+    PRIMARY KEY (test_id, name, idx)
+);
+"""
+
+
+def _json_attrs(attrs):
+    """
+    attrs as JSON, numpy values are converted to python types
+    """
+    converted = {}
+    for key, value in attrs.items():
+        if hasattr(value, 'tolist'):
+            value = value.tolist()
+        converted[key] = value
+    return json.dumps(converted, sort_keys=True)
+
+
+class ResultsStore(object):
+
+    """
+    SQLite database holding test runs, tests, summary statistics
+    and raw measurements in indexed tables.
+
+    Parameters
+    ----------
+    filename: string
+        path of the database file, created if it does not exist
+    """
+
+    def __init__(self, filename):
+        self.filename = filename
+        self.conn = sqlite3.connect(filename)
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def add_run(self, name):
+        """
+        Parameters
+        ----------
+        name: string
+            name of the test run
+
+        Returns
+        -------
+        run_id: int
+            id of the new or already existing run
+        """
+        row = self.conn.execute("SELECT id FROM runs WHERE name = ?",
+                                (name,)).fetchone()
+        if row is not None:
+            return row[0]
+        with self.conn:
+            cursor = self.conn.execute(
+                "INSERT INTO runs (name, created) VALUES (?, ?)",
+                (name, datetime.now().isoformat()))
+        return cursor.lastrowid
+
+    def _delete_test(self, test_id):
+        for table in ['measurement_columns', 'measurements']:
+            self.conn.execute("DELETE FROM %s WHERE test_id = ?" % table,
+                              (test_id,))
+        self.conn.execute("DELETE FROM summary WHERE test_id = ?",
+                          (test_id,))
+        self.conn.execute("DELETE FROM tests WHERE id = ?", (test_id,))
+
+    def add_results(self, results, run=None):
+        """
+        store TestResults, results with the same name in the same
+        run are replaced
+
+        Parameters
+        ----------
+        results: TestResults
+            results to store
+        run: string, optional
+            name of the test run the results belong to
+
+        Returns
+        -------
+        test_id: int
+            id of the stored results
+        """
+        run_id = None
+        if run is not None:
+            run_id = self.add_run(run)
+        with self.conn:
+            row = self.conn.execute(
+                "SELECT id FROM tests WHERE name = ? AND run_id IS ?",
+                (results.name, run_id)).fetchone()
+            if row is not None:
+                self._delete_test(row[0])
+            cursor = self.conn.execute(
+                "INSERT INTO tests (run_id, name, workload, ddof, attrs) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (run_id, results.name, workload_key(results.name),
+                 results.ddof, _json_attrs(results.attrs)))
+            test_id = cursor.lastrowid
+            summary = results.summary()
+            summary = [None if np.isnan(summary[stat]) else summary[stat]
+                       for stat in SUMMARY_STATS]
+            self.conn.execute(
+                "INSERT INTO summary (test_id, %s) VALUES (?, %s)" %
+                (", ".join(SUMMARY_STATS),
+                 ", ".join(["?"] * len(SUMMARY_STATS))),
+                [test_id] + summary)
+            self.conn.executemany(
+                "INSERT INTO measurements (test_id, idx, value) "
+                "VALUES (?, ?, ?)",
+                ((test_id, idx, value) for idx, value in
+                 enumerate(results.measurements.tolist())))
+            columns = results.columns
+            for column in columns:
+                self.conn.executemany(
+                    "INSERT INTO measurement_columns "
+                    "(test_id, name, idx, value) VALUES (?, ?, ?, ?)",
+                    ((test_id, column, idx, value) for idx, value in
+                     enumerate(columns[column].tolist())))
+        return test_id
+
+    def import_nc(self, results_files, run=None):
+        """
+        import result files written by TestResults.to_nc
+
+        Parameters
+        ----------
+        results_files: list
+            list of filenames to import
+        run: string, optional
+            name of the test run the results belong to
+        """
+        for fname in results_files:
+            self.add_results(TestResults(fname), run=run)
+
+    def names(self, run=None, workload=None):
+        """
+        Parameters
+        ----------
+        run: string, optional
+            only names of this test run
+        workload: string, optional
+            only names of this workload
+
+        Returns
+        -------
+        names: list
+            names of the stored results
+        """
+        query, params = self._filter(run, workload)
+        rows = self.conn.execute(
+            "SELECT tests.name FROM tests LEFT JOIN runs "
+            "ON tests.run_id = runs.id" + query + " ORDER BY tests.name",
+            params)
+        return [row[0] for row in rows]
+
+    def _filter(self, run, workload):
+        conditions, params = [], []
+        if run is not None:
+            conditions.append("runs.name = ?")
+            params.append(run)
+        if workload is not None:
+            conditions.append("tests.workload = ?")
+            params.append(workload)
+        if not conditions:
+            return "", params
+        return " WHERE " + " AND ".join(conditions), params
+
+    def summary(self, run=None, workload=None, attrs=False):
+        """
+        summary statistics without loading any raw measurements
+
+        Parameters
+        ----------
+        run: string, optional
+            only results of this test run
+        workload: string, optional
+            only results of this workload
+        attrs: boolean, optional
+            if set the metadata attributes are added as columns
+
+        Returns
+        -------
+        summary: pandas.DataFrame
+            summary statistics, run and workload indexed by the
+            names of the results
+        """
+        query, params = self._filter(run, workload)
+        rows = self.conn.execute(
+            "SELECT tests.name, runs.name, tests.workload, %s, tests.attrs "
+            "FROM tests JOIN summary ON summary.test_id = tests.id "
+            "LEFT JOIN runs ON tests.run_id = runs.id%s "
+            "ORDER BY tests.name" %
+            (", ".join("summary." + f for f in SUMMARY_STATS), query),
+            params).fetchall()
+        columns = ['name', 'run', 'workload'] + SUMMARY_STATS
+        df = pd.DataFrame([row[:-1] for row in rows],
+                          columns=columns).set_index('name')
+        df = df.astype(dict((f, float) for f in SUMMARY_STATS[1:]))
+        if attrs:
+            attrs = pd.DataFrame([json.loads(row[-1]) for row in rows],
+                                 index=df.index)
+            df = df.join(attrs.drop([c for c in attrs.columns
+                                     if c in df.columns], axis=1))
+        return df
+
+    def load(self, name, run=None):
+        """
+        Parameters
+        ----------
+        name: string
+            name of the results
+        run: string, optional
+            name of the test run, needed if several runs contain
+            results of this name
+
+        Returns
+        -------
+        results: TestResults
+            results including raw measurements, columns and attrs
+        """
+        query, params = self._filter(run, None)
+        if query:
+            query = query.replace(" WHERE ", " AND ", 1)
+        rows = self.conn.execute(
+            "SELECT tests.id, tests.ddof, tests.attrs FROM tests "
+            "LEFT JOIN runs ON tests.run_id = runs.id "
+            "WHERE tests.name = ?" + query, [name] + params).fetchall()
+        if not rows:
+            raise KeyError("No results named %s" % name)
+        if len(rows) > 1:
+            raise ValueError("Results named %s exist in several runs, "
+                             "the run must be given" % name)
+        test_id, ddof, attrs = rows[0]
+        values = [r[0] for r in self.conn.execute(
+            "SELECT value FROM measurements WHERE test_id = ? ORDER BY idx",
+            (test_id,))]
+        columns = {}
+        for column, value in self.conn.execute(
+                "SELECT name, value FROM measurement_columns "
+                "WHERE test_id = ? ORDER BY name, idx", (test_id,)):
+            columns.setdefault(column, []).append(value)
+        return TestResults(values, name, ddof=ddof, columns=columns,
+                           attrs=json.loads(attrs))
+
+    def load_many(self, names, run=None):
+        """
+        Parameters
+        ----------
+        names: list
+            names of the results
+        run: string, optional
+            name of the test run
+
+        Returns
+        -------
+        results: list
+            list of TestResults
+        """
+        return [self.load(name, run=run) for name in names]
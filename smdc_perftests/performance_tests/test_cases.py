@@ -39,13 +39,100 @@ Created on Tue Oct 21 13:37:58 2014
 @author: christoph.paulik@geo.tuwien.ac.at
 '''
 import time
+import array
+import inspect
+import cProfile
+import pstats
 import random
+import itertools
 import numpy as np
 from scipy.stats import t
 import math
+from datetime import timedelta
 
 import netCDF4
 
+from smdc_perftests.performance_tests import stats
+from smdc_perftests import stages
+
+#: I/O counters read from /proc/self/io for every timed call
+IO_COUNTERS = ['read_bytes', 'rchar', 'syscr']
+
+
+#: request context recorded by SelfTimingDataset for every timed call,
+#: -1 if a value is not known
+CONTEXT_COLUMNS = ['gpi', 'cell', 'start_index', 'end_index', 'n_timesteps']
+
+#: meaning of the positional arguments of the timed functions
+CONTEXT_ARGS = {'get_timeseries': ['gpi', 'date_start', 'date_end'],
+                'get_avg_image': ['date_start', 'date_end', 'cell'],
+                'get_data': ['date_start', 'date_end', 'cell']}
+
+#: whether the end date of a timed function is read. The readers in
+#: smdc_perftests.datasets read time series up to but excluding the end
+#: date and images and data cubes including it. get_avg_image without
+#: an end date reads the image_span of the dataset, 0 by default.
+CONTEXT_END_INCLUDED = {'get_timeseries': False,
+                        'get_avg_image': True,
+                        'get_data': True}
+
+#: summary statistics of TestResults, stored as attributes with the
+#: prefix summary_ in the netCDF files
+SUMMARY_STATS = ['n', 'mean', 'median', 'var', 'stdev', 'total',
+                 'min', 'max', 'p95', 'p99', 'p999']
+
+
+def read_proc_io(fname='/proc/self/io'):
+    """
+    Read the I/O accounting of the current process as provided by the
+    linux kernel.
+
+    Parameters
+    ----------
+    fname: string, optional
+        file to read the counters from
+
+    Returns
+    -------
+    counters: dict or None
+        the counters listed in IO_COUNTERS as integers. None if the
+        file is not available e.g. on non linux systems.
+    """
+    try:
+        with open(fname) as io_file:
+            lines = io_file.readlines()
+    except IOError:
+        return None
+    counters = {}
+    for line in lines:
+        key, value = line.split(':')
+        if key in IO_COUNTERS:
+            counters[key] = int(value)
+    return counters
+
+
+def _to_array(values, typecode=None):
+    """
+    copy values into a compact array.array
+
+    Parameters
+    ----------
+    values: list, array.array or numpy.ndarray
+        values to copy
+    typecode: string, optional
+        'd' for floats or 'l' for integers, by default
+        it is derived from the values
+    """
+    values = np.asarray(values)
+    if typecode is None:
+        if values.dtype.kind in 'iub':
+            typecode = 'l'
+        else:
+            typecode = 'd'
+    arr = array.array(typecode)
+    arr.fromstring(values.astype(np.dtype(typecode)).tostring())
+    return arr
+
 
 class TestResults(object):
 
@@ -56,10 +143,14 @@ class TestResults(object):
 
     Objects of this type can also be plotted by
     the plotting routines.
+
+    The statistics are updated online when measurements are appended so
+    that long running tests can be recorded in constant memory. Raw
+    measurements are stored in compact arrays and can be spilled to disk.
     Parameters
     ----------
     measured times or filename: list or string
-        list of measured times or netCDF4 file produced
+        list or array of measured times or netCDF4 file produced
         by to_nc of another TestResults object
     ddof: int
         difference degrees of freedom. This is used to calculate
@@ -67,12 +158,28 @@ class TestResults(object):
         subtracted from the sample number n when estimating
         the population standard deviation and variance.
         see bessel's correction on e.g. wikipedia for explanation
-
+    columns: dict, optional
+        additional values recorded for each measurement, e.g. the
+        I/O counters of SelfTimingDataset. Keys are the column names,
+        values are lists as long as the measurements.
+    attrs: dict, optional
+        metadata describing the circumstances of the measurements.
+        Values must be strings or numbers, they are stored as attributes
+        in the netCDF file.
+    spill_file: string, optional
+        if given the raw measurements are appended to this binary file
+        whenever more than buffer_size of them are held in memory.
+        The columns are spilled to files with the column name as suffix.
+        An existing file is overwritten, so results that are in use
+        must not share a spill file.
+    buffer_size: int, optional
+        number of raw measurements to hold in memory before spilling
 
     Attributes
     ----------
     median: float
-        median of the measurements
+        median of the measurements, estimated from a t-digest
+        if measurements were spilled to disk
     n: int
         sample size
     stdev: float
@@ -83,32 +190,243 @@ class TestResults(object):
         total time expired
     mean: float
         mean time per test run
+    p95, p99, p999: float
+        tail percentiles from the latency histogram
+    histogram: stats.LogHistogram
+        log bucketed histogram of all measurements
+    measurements: numpy.ndarray
+        all raw measurements, including the spilled ones
+    columns: dict
+        additional values recorded for each measurement
+    attrs: dict
+        metadata of the measurements
+    profile: pstats.Stats
+        profile of the measured runs if they were profiled,
+        it is not stored in the netCDF file
     """
 
     def __init__(self, init_obj, name=None,
-                 ddof=1):
+                 ddof=1, columns=None, attrs=None,
+                 spill_file=None, buffer_size=100000):
 
-        if type(init_obj) == str:
+        self.histogram = None
+        self.profile = None
+        if isinstance(init_obj, basestring):
             self._from_nc(init_obj)
-        elif type(init_obj) == list:
+        else:
             self._measurements = init_obj
             if name is None:
                 raise ValueError("Name must be given for new results.")
             self.name = name
+            if columns is None:
+                columns = {}
+            for column in columns:
+                if len(columns[column]) != len(self._measurements):
+                    raise ValueError("Column %s does not have one value "
+                                     "per measurement." % column)
+            self._columns = columns
+            if attrs is None:
+                attrs = {}
+            self.attrs = dict(attrs)
 
         self.ddof = ddof
+        self.spill_file = spill_file
+        self.buffer_size = buffer_size
         self._init_metrics()
 
     def _init_metrics(self):
         """
-        Initialize the metrics
+        Initialize the streaming metrics from the measurements
+        """
+        self._measurements = _to_array(self._measurements, 'd')
+        for column in self._columns:
+            self._columns[column] = _to_array(self._columns[column])
+        self._n_spilled = 0
+        self._stats = stats.RunningStats()
+        self._stats.add_many(self._measurements)
+        self._digest = stats.TDigest()
+        self._digest.add_many(self._measurements)
+        if self.histogram is None:
+            self.histogram = stats.LogHistogram()
+            self.histogram.add_many(self._measurements)
+        if len(self._measurements) >= self.buffer_size:
+            self._spill()
+
+    def append(self, value, **columns):
         """
-        self.median = np.median(self._measurements)
-        self.n = len(self._measurements)
-        self.var = np.var(self._measurements, ddof=self.ddof)
-        self.stdev = np.sqrt(self.var)
-        self.total = sum(self._measurements)
-        self.mean = np.mean(self._measurements)
+        add a measurement and update the statistics
+
+        Parameters
+        ----------
+        value: float
+            measured time
+        **columns:
+            value of each column for this measurement
+        """
+        if set(columns) != set(self._columns):
+            raise ValueError("A value must be given for each column.")
+        self._measurements.append(value)
+        for column in columns:
+            self._columns[column].append(columns[column])
+        self._stats.add(value)
+        self._digest.add(value)
+        self.histogram.add(value)
+        if len(self._measurements) >= self.buffer_size:
+            self._spill()
+
+    def extend(self, values, columns=None):
+        """
+        add many measurements and update the statistics
+
+        Parameters
+        ----------
+        values: list or numpy.ndarray
+            measured times
+        columns: dict, optional
+            list of values for each column
+        """
+        if columns is None:
+            columns = {}
+        if set(columns) != set(self._columns):
+            raise ValueError("Values must be given for each column.")
+        values = np.asarray(values, dtype=np.float64)
+        for column in columns:
+            if len(columns[column]) != values.size:
+                raise ValueError("Column %s does not have one value "
+                                 "per measurement." % column)
+            self._columns[column].extend(
+                _to_array(columns[column], self._columns[column].typecode))
+        self._measurements.extend(_to_array(values, 'd'))
+        self._stats.add_many(values)
+        self._digest.add_many(values)
+        self.histogram.add_many(values)
+        if len(self._measurements) >= self.buffer_size:
+            self._spill()
+
+    def _spill_name(self, column=None):
+        if column is None:
+            return self.spill_file
+        return "%s.%s" % (self.spill_file, column)
+
+    def _spill(self):
+        """
+        append the raw values held in memory to the spill files,
+        existing files are overwritten by the first spill
+        """
+        if self.spill_file is None:
+            return
+        if self._n_spilled == 0:
+            mode = 'wb'
+        else:
+            mode = 'ab'
+        for column in [None] + list(self._columns):
+            if column is None:
+                values = self._measurements
+            else:
+                values = self._columns[column]
+            with open(self._spill_name(column), mode) as spill:
+                values.tofile(spill)
+            del values[:]
+        self._n_spilled = self._stats.n
+
+    def _raw(self, column=None):
+        """
+        all raw values of the measurements or a column as numpy.ndarray
+        """
+        if column is None:
+            values = self._measurements
+        else:
+            values = self._columns[column]
+        in_memory = np.frombuffer(values, dtype=np.dtype(values.typecode))
+        if self._n_spilled == 0:
+            return in_memory.copy()
+        spilled = np.fromfile(self._spill_name(column),
+                              dtype=np.dtype(values.typecode))
+        return np.concatenate([spilled, in_memory])
+
+    @property
+    def measurements(self):
+        return self._raw()
+
+    @property
+    def columns(self):
+        return dict((column, self._raw(column)) for column in self._columns)
+
+    @property
+    def n(self):
+        return self._stats.n
+
+    @property
+    def mean(self):
+        if self.n == 0:
+            return np.nan
+        return self._stats.mean
+
+    @property
+    def var(self):
+        return self._stats.var(ddof=self.ddof)
+
+    @property
+    def stdev(self):
+        return np.sqrt(self.var)
+
+    @property
+    def total(self):
+        return self._stats.total
+
+    @property
+    def median(self):
+        return self.percentile(50)
+
+    def percentile(self, q):
+        """
+        Percentiles of the measurements. They are exact as long as no
+        measurements were spilled to disk, otherwise they are estimated
+        with a t-digest.
+
+        Parameters
+        ----------
+        q: float or list
+            percentiles between 0 and 100
+
+        Returns
+        -------
+        percentiles: float or numpy.ndarray
+        """
+        if self.n == 0:
+            return np.nan * np.asarray(q, dtype=np.float64)
+        if self._n_spilled == 0:
+            return np.percentile(self._measurements, q)
+        return self._digest.quantile(np.asarray(q, dtype=np.float64) / 100.0)
+
+    def tail_percentile(self, q):
+        """
+        Percentiles from the latency histogram. They are accurate to the
+        relative precision of the histogram and do not need the raw
+        measurements.
+
+        Parameters
+        ----------
+        q: float or list
+            percentiles between 0 and 100
+
+        Returns
+        -------
+        percentiles: float or numpy.ndarray
+        """
+        return self.histogram.percentile(q)
+
+    @property
+    def p95(self):
+        return self.tail_percentile(95)
+
+    @property
+    def p99(self):
+        return self.tail_percentile(99)
+
+    @property
+    def p999(self):
+        return self.tail_percentile(99.9)
 
     def __str__(self):
         string = [""]
@@ -117,6 +435,8 @@ class TestResults(object):
         string.append("median %.4f mean %.4f stdev %.4f" %
                       (self.median, self.mean, self.stdev))
         string.append("sum %.4f" % self.total)
+        string.append("p95 %.4f p99 %.4f p99.9 %.4f" %
+                      (self.p95, self.p99, self.p999))
         string.append(
             "95%% confidence interval of the mean")
         conf = self.confidence_int()
@@ -125,8 +445,72 @@ class TestResults(object):
         string.append("mean  %.4f" % conf[1])
         string.append("       |")
         string.append("lower %.4f" % conf[0])
+        io_summary = self.io_summary()
+        if io_summary:
+            string.append("read %.4f MB/s disk %.4f MB/s" %
+                          (io_summary['read_mb_per_s'],
+                           io_summary['disk_mb_per_s']))
+            string.append("%.2f syscalls per request" %
+                          io_summary['syscalls_per_request'])
         return '\n'.join(string)
 
+    def summary(self):
+        """
+        Summary statistics of the measurements
+
+        Returns
+        -------
+        summary: dict
+            the statistics listed in SUMMARY_STATS as floats,
+            n as integer
+        """
+        p95, p99, p999 = self.tail_percentile([95, 99, 99.9])
+        summary = {'n': self.n,
+                   'mean': self.mean,
+                   'median': self.median,
+                   'var': self.var,
+                   'stdev': self.stdev,
+                   'total': self.total,
+                   'min': self.percentile(0),
+                   'max': self.percentile(100),
+                   'p95': p95, 'p99': p99, 'p999': p999}
+        for stat in summary:
+            if stat != 'n':
+                summary[stat] = float(summary[stat])
+        return summary
+
+    def io_summary(self):
+        """
+        Summarize the I/O counters that were recorded for
+        each measurement.
+
+        Returns
+        -------
+        summary: dict
+            read_mb_per_s: bytes read by the process (rchar) per second
+            of measured time, this includes reads served from the
+            page cache.
+            disk_mb_per_s: bytes fetched from the storage layer
+            (read_bytes) per second of measured time.
+            syscalls_per_request: mean number of read syscalls (syscr)
+            per measurement.
+            Empty if no I/O counters were recorded.
+        """
+        for counter in IO_COUNTERS:
+            if counter not in self._columns:
+                return {}
+        summary = {}
+        if self.total > 0:
+            summary['read_mb_per_s'] = np.sum(
+                self._raw('rchar')) / self.total / 1e6
+            summary['disk_mb_per_s'] = np.sum(
+                self._raw('read_bytes')) / self.total / 1e6
+        else:
+            summary['read_mb_per_s'] = np.nan
+            summary['disk_mb_per_s'] = np.nan
+        summary['syscalls_per_request'] = np.mean(self._raw('syscr'))
+        return summary
+
     def confidence_int(self, conf_level=95):
         """
         Calculate confidence interval of the mean
@@ -170,20 +554,124 @@ class TestResults(object):
             path and filename
         """
         with netCDF4.Dataset(filename, mode='w') as ncdata:
-            ncdata.createDimension('measurements', len(self._measurements))
+            ncdata.createDimension('measurements', self.n)
             msmts = ncdata.createVariable(
                 'measurements', 'f8', ('measurements',))
-            msmts[:] = self._measurements
+            msmts[:] = self.measurements
+            for column in self._columns:
+                if self._columns[column].typecode == 'l':
+                    dtype = 'i8'
+                else:
+                    dtype = 'f8'
+                col = ncdata.createVariable(column, dtype, ('measurements',))
+                col[:] = self._raw(column)
+
+            index, counts = self.histogram.to_sparse()
+            ncdata.createDimension('histogram', index.size)
+            hist_index = ncdata.createVariable(
+                'histogram_index', 'i8', ('histogram',))
+            hist_index[:] = index
+            hist_counts = ncdata.createVariable(
+                'histogram_counts', 'i8', ('histogram',))
+            hist_counts[:] = counts
+            hist_counts.setncatts({'lowest': self.histogram.lowest,
+                                   'highest': self.histogram.highest,
+                                   'precision': self.histogram.precision,
+                                   'min': self.histogram.min,
+                                   'max': self.histogram.max})
 
-            ncdata.setncatts({'dataset_name': self.name})
+            attrs = dict(self.attrs)
+            attrs.update(self.io_summary())
+            for stat, value in self.summary().items():
+                attrs['summary_' + stat] = value
+            attrs['dataset_name'] = self.name
+            ncdata.setncatts(attrs)
 
     def _from_nc(self, filename):
         """
         initializes object from netCDF4 file
         """
         with netCDF4.Dataset(filename) as ncdata:
-            self._measurements = ncdata.variables['measurements'][:].tolist()
+            self._measurements = ncdata.variables['measurements'][:]
             self.name = ncdata.dataset_name
+            self.attrs = {}
+            for attr in ncdata.ncattrs():
+                if attr != 'dataset_name' and \
+                        not attr.startswith('summary_'):
+                    self.attrs[attr] = ncdata.getncattr(attr)
+            self._columns = {}
+            for name, var in ncdata.variables.items():
+                if name != 'measurements' and \
+                        var.dimensions == ('measurements',):
+                    self._columns[name] = var[:]
+            if 'histogram_counts' in ncdata.variables:
+                counts = ncdata.variables['histogram_counts']
+                self.histogram = stats.LogHistogram.from_sparse(
+                    ncdata.variables['histogram_index'][:], counts[:],
+                    counts.min, counts.max, lowest=counts.lowest,
+                    highest=counts.highest, precision=counts.precision)
+
+    def merge(self, other, name=None, spill_file=None):
+        """
+        Combine the measurements of two results, e.g. from a benchmark
+        that was split across processes or machines. Counts, moments,
+        t-digest and histogram are merged directly, the raw measurements
+        are concatenated.
+
+        Parameters
+        ----------
+        other: TestResults
+            results to merge with
+        name: string, optional
+            name of the merged results, default is the name of this object
+        spill_file: string, optional
+            spill file for the raw measurements of the merged results
+
+        Returns
+        -------
+        merged: TestResults
+            results containing the measurements of both. Only columns
+            and attrs that both have in common are kept, attrs only if
+            their values are equal. The attr n_merged counts the
+            merged results.
+        """
+        if name is None:
+            name = self.name
+        attrs = {}
+        for attr in self.attrs:
+            if attr in other.attrs and attr != 'n_merged' and \
+                    np.all(self.attrs[attr] == other.attrs[attr]):
+                attrs[attr] = self.attrs[attr]
+        attrs['n_merged'] = (self.attrs.get('n_merged', 1) +
+                             other.attrs.get('n_merged', 1))
+        common = [column for column in self._columns
+                  if column in other._columns]
+
+        merged = TestResults([], name, ddof=self.ddof,
+                             columns=dict((column, []) for column in common),
+                             attrs=attrs, spill_file=spill_file,
+                             buffer_size=self.buffer_size)
+        merged._measurements = _to_array(
+            np.concatenate([self.measurements, other.measurements]), 'd')
+        for column in common:
+            merged._columns[column] = _to_array(
+                np.concatenate([self._raw(column), other._raw(column)]),
+                self._columns[column].typecode)
+        merged._stats = self._stats.merge(other._stats)
+        merged._digest = self._digest.merge(other._digest)
+        merged.histogram = self.histogram.merge(other.histogram)
+        if len(merged._measurements) >= merged.buffer_size:
+            merged._spill()
+        return merged
+
+    def __add__(self, other):
+        return self.merge(other)
+
+    def __radd__(self, other):
+        # support sum() over a list of results
+        if other == 0:
+            return self
+        return other.merge(self)
 
     def __lt__(self, other):
         """
@@ -214,33 +702,260 @@ class TestResults(object):
             return False
 
 
+def load_summary(filename):
+    """
+    Load only the name, metadata and summary statistics of results
+    stored with TestResults.to_nc. The measurements are not read.
+    Files written before the summary statistics were stored are
+    loaded completely.
+
+    Parameters
+    ----------
+    filename: string
+        path and filename
+
+    Returns
+    -------
+    summary: dict
+        the statistics listed in SUMMARY_STATS, the name of the
+        results and their metadata under the key attrs
+    """
+    with netCDF4.Dataset(filename) as ncdata:
+        attrs = dict((attr, ncdata.getncattr(attr))
+                     for attr in ncdata.ncattrs())
+    if 'summary_n' not in attrs:
+        res = TestResults(filename)
+        summary = res.summary()
+        summary['name'] = res.name
+        summary['attrs'] = res.attrs
+        return summary
+    summary = {'name': attrs.pop('dataset_name')}
+    for stat in SUMMARY_STATS:
+        value = attrs.pop('summary_' + stat)
+        summary[stat] = int(value) if stat == 'n' else float(value)
+    summary['attrs'] = attrs
+    return summary
+
+
 class SelfTimingDataset(object):
 
     """
     Dataset class that times the functions of
     a dataset instance it gets in it's constructor
 
-    Stores the results as TestResults instances in a
+    Stores the measured times as compact arrays in a
     dictionary with the timed function names as keys.
+
+    The arrays are not bounded, unlike the streaming statistics of
+    TestResults they keep every call in memory: 72 bytes per call with
+    the I/O counters and the request context, 8 more per stage. Ten
+    million calls take about 700 MB. Call reset between tests of long
+    soak runs after turning the measurements into TestResults with a
+    spill_file.
+
+    If the kernel provides /proc/self/io the I/O counters
+    listed in IO_COUNTERS are sampled before and after each
+    call and the differences are stored in io_measurements.
+
+    The request context of each call, i.e. the gpi, the cell, the
+    indices of the start and end date on the time axis and the number
+    of timesteps, is stored in context_measurements. The time axis is
+    taken from the ds and time_var attributes of the readers in
+    smdc_perftests.datasets.
+
+    Parameters
+    ----------
+    ds: instance
+        dataset to time
+    timefuncs: list, optional
+        names of the functions to time
+    io_counters: boolean, optional
+        if set the I/O counters are recorded for every call
+    before_call: function, optional
+        called without arguments before each timed call, e.g. to
+        evict the dataset from the page cache. The time it takes
+        is not measured.
+    context: boolean, optional
+        if set the request context is recorded for every call
+    trace: trace.TraceRecorder, optional
+        if given every call is recorded as a span tagged with
+        its request context
+    outliers: outliers.OutlierCapture, optional
+        if given calls over its latency threshold are written to
+        its outlier log together with the sampled stacks
+    stage_timers: boolean, optional
+        if set the durations of the stages the readers mark with
+        smdc_perftests.stages.mark are stored in stage_measurements,
+        0 for stages a call did not pass
+    access_log: replay.AccessLog, optional
+        if given every call is written to this access log so that it
+        can be replayed against another dataset
     """
 
     def __init__(self, ds, timefuncs=["get_timeseries",
                                       "get_avg_image",
-                                      "get_data"]):
+                                      "get_data"],
+                 io_counters=True, before_call=None, context=True,
+                 trace=None, outliers=None, stage_timers=False,
+                 access_log=None):
         self.ds = ds
+        self.access_log = access_log
+        self.trace = trace
+        self.outliers = outliers
+        self.stage_timers = stage_timers
+        self._stage_recorder = stages.StageRecorder()
+        self.stage_measurements = {}
         self.timefuncs = timefuncs
+        self.before_call = before_call
+        self.context = context
+        self._time_axis = None
         self.measurements = {}
+        self.io_measurements = {}
+        self.context_measurements = {}
+        self.io_counters = io_counters and read_proc_io() is not None
+        if self.io_counters:
+            self._io_overhead = self._measure_io_overhead()
         # link attributes of this class to attributes of
         # measuring class
         for func in timefuncs:
             self.gentimedfunc(func)
-            self.measurements[func] = []
+        self.reset()
+
+    def reset(self, funcname=None):
+        """
+        discard the measurements of a timed function
+
+        Parameters
+        ----------
+        funcname: string, optional
+            timed function to reset, default is all functions
+        """
+        if funcname is None:
+            funcnames = self.timefuncs
+        else:
+            funcnames = [funcname]
+        for func in funcnames:
+            self.measurements[func] = array.array('d')
+            self.io_measurements[func] = {}
+            if self.io_counters:
+                for counter in IO_COUNTERS:
+                    self.io_measurements[func][counter] = array.array('l')
+            self.stage_measurements[func] = {}
+            self.context_measurements[func] = {}
+            if self.context:
+                for column in CONTEXT_COLUMNS:
+                    self.context_measurements[func][column] = \
+                        array.array('l')
+
+    def columns(self, funcname):
+        """
+        Parameters
+        ----------
+        funcname: string
+            timed function
+
+        Returns
+        -------
+        columns: dict
+            I/O counters and request context recorded for each
+            call of the function, e.g. as columns of TestResults
+        """
+        columns = dict(self.io_measurements[funcname])
+        columns.update(self.context_measurements[funcname])
+        for stage, durations in self.stage_measurements[funcname].items():
+            columns['stage_' + stage] = durations
+        return columns
+
+    def _record_stages(self, funcname):
+        """
+        store the stage durations of a call
+        """
+        measured = self.stage_measurements[funcname]
+        durations = self._stage_recorder.durations
+        n_calls = len(self.measurements[funcname])
+        for stage in durations:
+            if stage not in measured:
+                measured[stage] = array.array('d', [0.0] * (n_calls - 1))
+        for stage in measured:
+            measured[stage].append(durations.get(stage, 0.0))
+
+    def _time_index(self, date):
+        """
+        index of a date on the time axis of the dataset, -1 if the
+        dataset has no netCDF time axis
+        """
+        if self._time_axis is None:
+            self._time_axis = False
+            ncdata = getattr(self.ds, 'ds', None)
+            time_var = getattr(self.ds, 'time_var', None)
+            if isinstance(ncdata, netCDF4.Dataset) and \
+                    time_var in ncdata.variables:
+                var = ncdata.variables[time_var]
+                self._time_axis = (var[:], var.units,
+                                   getattr(var, 'calendar', 'standard'))
+        if self._time_axis is False:
+            return -1
+        times, units, calendar = self._time_axis
+        if date is None:
+            return len(times) - 1
+        num = netCDF4.date2num(date, units, calendar)
+        return int(min(np.searchsorted(times, num), len(times) - 1))
+
+    def _record_context(self, funcname, args, kwargs):
+        """
+        store the request context of a call
+        """
+        func = getattr(self.ds, funcname)
+        callargs = inspect.getcallargs(func, *args, **kwargs)
+        argnames = inspect.getargspec(func).args[1:]
+        context = dict((role, callargs[argname]) for role, argname in
+                       zip(CONTEXT_ARGS.get(funcname, []), argnames))
+        values = dict((column, -1) for column in CONTEXT_COLUMNS)
+        for column in ['gpi', 'cell']:
+            if context.get(column) is not None:
+                values[column] = int(context[column])
+        if 'date_start' in context and self._time_index(None) != -1:
+            date_start = context['date_start']
+            date_end = context.get('date_end')
+            if date_start is None:
+                start = 0
+            else:
+                start = self._time_index(date_start)
+            if date_end is None and date_start is not None and \
+                    funcname == 'get_avg_image':
+                date_end = date_start + getattr(self.ds, 'image_span',
+                                                timedelta(0))
+            if date_end is None:
+                # until the end of the time axis
+                end = self._time_index(None)
+            elif CONTEXT_END_INCLUDED.get(funcname, True):
+                end = self._time_index(date_end)
+            else:
+                end = self._time_index(date_end) - 1
+            values['start_index'] = start
+            values['end_index'] = end
+            values['n_timesteps'] = max(end - start + 1, 0)
+        for column in CONTEXT_COLUMNS:
+            self.context_measurements[funcname][column].append(
+                values[column])
+        return values
+
+    def _measure_io_overhead(self):
+        """
+        reading /proc/self/io is itself counted by the kernel. Measure
+        how much two consecutive reads add so that it can be subtracted
+        from the measured differences.
+        """
+        first = read_proc_io()
+        second = read_proc_io()
+        return dict((counter, second[counter] - first[counter])
+                    for counter in IO_COUNTERS)
 
     def gentimedfunc(self, funcname):
         """
         generate a timed function that calls
-        the function of the given dataset
-        but returns the execution time
+        the function of the given dataset,
+        records the execution time and returns the result
 
         Parameters
         ----------
@@ -249,11 +964,44 @@ class SelfTimingDataset(object):
         """
 
         def f(*args, **kwargs):
+            if self.before_call is not None:
+                self.before_call()
+            if self.io_counters:
+                io_start = read_proc_io()
+            if self.stage_timers:
+                previous = stages.activate(self._stage_recorder)
+                self._stage_recorder.begin()
             start = time.time()
-            getattr(self.ds, funcname)(*args, **kwargs)
-            end = time.time()
+            try:
+                result = getattr(self.ds, funcname)(*args, **kwargs)
+            finally:
+                end = time.time()
+                if self.stage_timers:
+                    stages.activate(previous)
             duration = end - start
             self.measurements[funcname].append(duration)
+            if self.stage_timers:
+                self._record_stages(funcname)
+            io = {}
+            if self.io_counters:
+                io_end = read_proc_io()
+                for counter in IO_COUNTERS:
+                    delta = io_end[counter] - io_start[counter] - \
+                        self._io_overhead[counter]
+                    io[counter] = max(delta, 0)
+                    self.io_measurements[funcname][counter].append(
+                        io[counter])
+            context = None
+            if self.context:
+                context = self._record_context(funcname, args, kwargs)
+            if self.trace is not None:
+                self.trace.add(funcname, start, end, args=context)
+            if self.outliers is not None:
+                self.outliers.check(funcname, start, end, args, kwargs,
+                                    context=context, io=io)
+            if self.access_log is not None:
+                self.access_log.record(funcname, start, args, kwargs)
+            return result
 
         setattr(self, funcname, f)
 
@@ -264,47 +1012,169 @@ class SelfTimingDataset(object):
             return getattr(self.ds, name)
 
 
-def measure(exper_name, runs=5, ddof=1):
+def measure(exper_name, runs=5, ddof=1, setup=None, warmup=0,
+            after_warmup=None, min_runs=None, max_runs=None,
+            ci_target=None, conf_level=95, time_budget=None, trace=None,
+            profile=False):
     """
     Decorator that measures the running time of a function
     and calculates statistics.
 
+    By default the function is run exactly runs times. If ci_target or
+    time_budget are given the number of runs is adaptive: after min_runs
+    the measurement stops as soon as the confidence interval of the mean
+    is tight enough or the time budget is used up, but never runs more
+    than max_runs times.
+
     Parameters
     ----------
     exper_name: string
         experiment name, used for plotting and saving
     runs: int
-        number of test runs to perform
+        number of test runs to perform, default for max_runs
     ddof: int
         difference degrees of freedom. This is used to calculate
         standard deviation and variance. It is the number that is
         subtracted from the sample number n when estimating
         the population standard deviation and variance.
         see bessel's correction on e.g. wikipedia for explanation
+    setup: function, optional
+        called without arguments before each run, the time it
+        takes is not measured.
+    warmup: int, optional
+        number of runs before the measurement that are not
+        part of the statistics
+    after_warmup: function, optional
+        called without arguments after the warmup runs, e.g. to
+        reset the measurements of a SelfTimingDataset
+    min_runs: int, optional
+        minimum number of measured runs, default is max_runs
+        for a fixed number of runs and 2 for adaptive runs
+    max_runs: int, optional
+        maximum number of measured runs, default is runs
+    ci_target: float, optional
+        stop when the half width of the confidence interval of the mean
+        relative to the mean is smaller than this, e.g. 0.05 for +-5%
+    conf_level: float, optional
+        confidence level in percent used for ci_target
+    time_budget: float, optional
+        stop after this many seconds, counted from the start of the
+        warmup runs. Finished runs are always part of the statistics.
+    trace: trace.TraceRecorder, optional
+        if given the test and each of its runs are recorded as spans
+        and the experiment name is the workload of the recorded calls
+    profile: boolean, optional
+        if set the measured runs are profiled with cProfile and the
+        profile is stored in the profile attribute of the results.
+        The measured times include the overhead of the profiler.
 
     Returns
     =======
     results: dict
-        TestResults instance
+        TestResults instance, the attrs contain the number of warmup
+        runs and the reason why the measurement stopped
     """
+    if max_runs is None:
+        max_runs = runs
+    if min_runs is None:
+        if ci_target is None and time_budget is None:
+            min_runs = max_runs
+        else:
+            min_runs = min(2, max_runs)
+
     def decorator(func):
         def inner(*args, **kwargs):
+            budget_start = time.time()
+            if trace is not None:
+                trace.workload = exper_name
+            for i in xrange(warmup):
+                if setup is not None:
+                    setup()
+                start = time.time()
+                func(*args, **kwargs)
+                if trace is not None:
+                    trace.add('warmup', start, time.time(), cat='run',
+                              args={'run': i})
+            if after_warmup is not None:
+                after_warmup()
+
+            profiler = None
+            if profile:
+                profiler = cProfile.Profile()
+
             measured_times = []
-            for i in xrange(runs):
+            stop_reason = 'max_runs'
+            while len(measured_times) < max_runs:
+                if setup is not None:
+                    setup()
                 start = time.time()
+                if profiler is not None:
+                    profiler.enable()
                 func(*args, **kwargs)
+                if profiler is not None:
+                    profiler.disable()
                 end = time.time()
                 duration = end - start
+                if trace is not None:
+                    trace.add('run', start, end, cat='run',
+                              args={'run': len(measured_times)})
                 measured_times.append(duration)
-            results = TestResults(measured_times, exper_name, ddof=ddof)
+
+                if len(measured_times) < min_runs:
+                    continue
+                if ci_target is not None and len(measured_times) > ddof:
+                    results = TestResults(measured_times, exper_name,
+                                          ddof=ddof)
+                    lower, mean, upper = results.confidence_int(
+                        conf_level=conf_level)
+                    if mean > 0 and (upper - mean) / mean <= ci_target:
+                        stop_reason = 'ci_target'
+                        break
+                if time_budget is not None and \
+                        end - budget_start >= time_budget:
+                    stop_reason = 'time_budget'
+                    break
+
+            if trace is not None:
+                trace.add(exper_name, budget_start, time.time(), cat='test',
+                          args={'stop_reason': stop_reason})
+                trace.workload = None
+            results = TestResults(measured_times, exper_name, ddof=ddof,
+                                  attrs={'warmup': warmup,
+                                         'stop_reason': stop_reason})
+            if profiler is not None:
+                results.profile = pstats.Stats(profiler)
             return results
 
         return inner
     return decorator
 
 
+def _select(population, read_perc, sampler=None, index=None):
+    """
+    requests of a driver function, either the items of the population
+    at the positions of a precomputed index or a new sample
+
+    Returns
+    -------
+    n: int
+        number of requests
+    requests: iterable
+        requested items, taken from the population while iterating
+        if an index is given
+    """
+    if index is not None:
+        return len(index), itertools.imap(population.__getitem__, index)
+    if sampler is None:
+        sampler = random.sample
+    requests = sampler(population,
+                       int(math.ceil(len(population) * read_perc / 100.0)))
+    return len(requests), requests
+
+
 def read_rand_ts_by_gpi_list(dataset, gpi_list, read_perc=1.0,
-                             max_runtime=None, **kwargs):
+                             max_runtime=None, sampler=None, index=None,
+                             **kwargs):
     """
     reads time series data for random grid point indices in a list
     additional kwargs are given to read_ts method of dataset
@@ -320,13 +1190,19 @@ def read_rand_ts_by_gpi_list(dataset, gpi_list, read_perc=1.0,
         percentage of points from gpi_list to read
     max_runtime: int, optional
         maximum runtime of test in second.
+    sampler: function, optional
+        selects the requests, gets the population and the number of
+        requests, default is random.sample. See the workloads module
+        for samplers with locality.
+    index: numpy.ndarray, optional
+        positions of the requests in the gpi_list, e.g. a run of a
+        plans.WorkloadPlan. If given no sampling is done.
     **kwargs:
         other keywords are passed to the get_timeseries method
         dataset
     """
-    gpi_read = random.sample(
-        gpi_list, int(math.ceil(len(gpi_list) * read_perc / 100.0)))
-    print "reading {} out of {} time series".format(len(gpi_read), len(gpi_list))
+    n_read, gpi_read = _select(gpi_list, read_perc, sampler, index)
+    print "reading {} out of {} time series".format(n_read, len(gpi_list))
 
     start = time.time()
     for gpi in gpi_read:
@@ -339,7 +1215,8 @@ def read_rand_ts_by_gpi_list(dataset, gpi_list, read_perc=1.0,
 
 
 def read_rand_img_by_date_list(dataset, date_list, read_perc=1.0,
-                               max_runtime=None, **kwargs):
+                               max_runtime=None, sampler=None, index=None,
+                               **kwargs):
     """
     reads image data for random dates on a list
     additional kwargs are given to read_img method
@@ -356,13 +1233,19 @@ def read_rand_img_by_date_list(dataset, date_list, read_perc=1.0,
         percentage of datetimes out of date_list to read
     max_runtime: int, optional
         maximum runtime of test in second.
+    sampler: function, optional
+        selects the requests, gets the population and the number of
+        requests, default is random.sample. See the workloads module
+        for samplers with locality.
+    index: numpy.ndarray, optional
+        positions of the requests in the date_list, e.g. a run of a
+        plans.WorkloadPlan. If given no sampling is done.
     **kwargs:
         other keywords are passed to the get_avg_image method
         dataset
     """
-    date_read = random.sample(
-        date_list, int(math.ceil(len(date_list) * read_perc / 100.0)))
-    print "reading {} out of {} dates".format(len(date_read), len(date_list))
+    n_read, date_read = _select(date_list, read_perc, sampler, index)
+    print "reading {} out of {} dates".format(n_read, len(date_list))
 
     start = time.time()
     for d in date_read:
@@ -375,7 +1258,8 @@ def read_rand_img_by_date_list(dataset, date_list, read_perc=1.0,
 
 
 def read_rand_img_by_date_range(dataset, date_list, read_perc=1.0,
-                                max_runtime=None, **kwargs):
+                                max_runtime=None, sampler=None, index=None,
+                                **kwargs):
     """
     reads image data between random dates on a list
     additional kwargs are given to read_img method
@@ -395,13 +1279,19 @@ def read_rand_img_by_date_range(dataset, date_list, read_perc=1.0,
         percentage of datetimes out of date_list to read
     max_runtime: int, optional
         maximum runtime of test in second.
+    sampler: function, optional
+        selects the requests, gets the population and the number of
+        requests, default is random.sample. See the workloads module
+        for samplers with locality.
+    index: numpy.ndarray, optional
+        positions of the requests in the date_list, e.g. a run of a
+        plans.WorkloadPlan. If given no sampling is done.
     **kwargs:
         other keywords are passed to the get_avg_image method
         dataset
     """
-    date_read = random.sample(
-        date_list, int(math.ceil(len(date_list) * read_perc / 100.0)))
-    print "reading {} out of {} dates".format(len(date_read), len(date_list))
+    n_read, date_read = _select(date_list, read_perc, sampler, index)
+    print "reading {} out of {} dates".format(n_read, len(date_list))
 
     start = time.time()
     for d1, d2 in date_read:
@@ -414,7 +1304,8 @@ def read_rand_img_by_date_range(dataset, date_list, read_perc=1.0,
 
 
 def read_rand_cells_by_cell_list(dataset, cell_date_list, cell_id,
-                                 read_perc=1.0, max_runtime=None):
+                                 read_perc=1.0, max_runtime=None,
+                                 sampler=None, index=None, date_index=None):
     """
     reads data from the dataset using the get_data method.
     In this method the start and end datetimes are fixed for all
@@ -436,6 +1327,15 @@ def read_rand_cells_by_cell_list(dataset, cell_date_list, cell_id,
         percentage of cell ids to read from the
     max_runtime: int, optional
         maximum runtime of test in second.
+    sampler: function, optional
+        selects the requests, gets the population and the number of
+        requests, default is random.sample. See the workloads module
+        for samplers with locality.
+    index: numpy.ndarray, optional
+        positions of the requests in the cell list, e.g. a run of a
+        plans.WorkloadPlan. If given no sampling is done.
+    date_index: numpy.ndarray, optional
+        positions of the time intervals in the cell_date_list
     """
     # make sure cell_id is iterable
     try:
@@ -443,15 +1343,13 @@ def read_rand_cells_by_cell_list(dataset, cell_date_list, cell_id,
     except TypeError:
         cell_id = [cell_id]
 
-    cell_read = random.sample(
-        cell_id, int(math.ceil(len(cell_id) * read_perc / 100.0)))
-
-    dates_read = random.sample(
-        cell_date_list, int(math.ceil(len(cell_date_list) * read_perc / 100.0)))
+    n_read, cell_read = _select(cell_id, read_perc, sampler, index)
+    n_dates, dates_read = _select(cell_date_list, read_perc,
+                                  index=date_index)
 
-    print "reading {} out of {} cells".format(len(cell_read), len(cell_id))
+    print "reading {} out of {} cells".format(n_read, len(cell_id))
     start = time.time()
-    for c, dates in zip(cell_read, dates_read):
+    for c, dates in itertools.izip(cell_read, dates_read):
         data = dataset.get_data(dates[0], dates[1], c)
         if max_runtime is not None:
             end = time.time()
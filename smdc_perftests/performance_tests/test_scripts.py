@@ -23,9 +23,18 @@ Created on Wed Apr  1 10:59:05 2015
 
 import os
 import glob
-from datetime import datetime
+import math
+import time
+from datetime import datetime, timedelta
+from multiprocessing import Pool
+
+import numpy as np
 
 from smdc_perftests.performance_tests import test_cases
+from smdc_perftests.performance_tests import fingerprint
+from smdc_perftests.performance_tests.trace import TraceRecorder
+from smdc_perftests.performance_tests import profiling
+from smdc_perftests.performance_tests import outliers
 from smdc_perftests.datasets import esa_cci
 from smdc_perftests.datasets import ascat
 from smdc_perftests import helper
@@ -40,10 +49,28 @@ def run_performance_tests(name, dataset, save_dir,
                           date_read_perc=1.0,
                           cell_read_perc=1.0,
                           max_runtime_per_test=None,
-                          repeats=1):
+                          repeats=1,
+                          cache_mode=None,
+                          cache_scope='run',
+                          cache_files=None,
+                          warmup=0,
+                          min_repeats=None,
+                          ci_target=None,
+                          time_budget_per_test=None,
+                          store=None,
+                          trace_file=None,
+                          profile=False,
+                          outlier_log=None,
+                          outlier_threshold=None,
+                          outlier_percentile=99.9,
+                          stage_timers=False,
+                          gpi_sampler=None,
+                          date_sampler=None,
+                          cell_sampler=None,
+                          plan=None):
     """
     Run a complete test suite on a dataset and store the results
-    in the specified directory
+    in the specified directory or results store
 
     Parameters
     ----------
@@ -53,7 +80,8 @@ def run_performance_tests(name, dataset, save_dir,
         instance implementing the get_timeseries,
         get_avg_image and get_data methods.
     save_dir: string
-        directory to store the test results in
+        directory to store the test results in, not used if
+        a results store is given
     gpi_list: list, optional
         list of possible grid point indices, if given the
         timeseries reading tests will be run
@@ -79,95 +107,539 @@ def run_performance_tests(name, dataset, save_dir,
         maximum runtime per test in seconds, if given the tests will be aborted
         after taking more than this time
     repeats: int, optional
-        number of repeats for each measurement
+        number of repeats for each measurement, this is the maximum
+        number if ci_target or time_budget_per_test are given
+    cache_mode: string, optional
+        'cold' evicts the cache_files from the page cache, 'warm' reads
+        them completely into the page cache. By default the page cache
+        is not managed.
+    cache_scope: string, optional
+        'run' prepares the page cache before each run of a test,
+        'call' before each call of a dataset function. In this case
+        only the detailed results exclude the time spent preparing
+        the page cache.
+    cache_files: list, optional
+        files of the dataset whose page cache state is managed.
+        Default is the fname attribute of the dataset.
+    warmup: int, optional
+        number of runs of each test before the measurement starts
+    min_repeats: int, optional
+        minimum number of repeats if the number of repeats is adaptive
+    ci_target: float, optional
+        stop repeating a test when the half width of the 95% confidence
+        interval of the mean is smaller than this fraction of the mean
+    time_budget_per_test: float, optional
+        stop repeating a test after this many seconds
+    store: ResultsStore, optional
+        if given the results are added to this store as a run
+        with the given name instead of being written to .nc files
+    trace_file: string, optional
+        if given a timeline of all tests, runs and timed calls is
+        written to this file in the Chrome trace event format
+    profile: boolean, optional
+        if set each test is profiled with cProfile. The profiles are
+        written as .pstats files next to the results together with a
+        table of the hot functions of all tests,
+        <name>_hot_functions.txt. See profiling.hot_functions
+        to merge the profiles of several datasets.
+    outlier_log: string, optional
+        if given the stacks are sampled during all tests and calls
+        slower than the outlier threshold are written to this log,
+        see outliers.OutlierCapture. The stacks are sampled in wall
+        clock time, so time blocked on I/O shows up in the stacks of
+        an outlier.
+    outlier_threshold: float, optional
+        calls slower than this many seconds are outliers
+    outlier_percentile: float, optional
+        if no outlier_threshold is given, calls slower than this
+        percentile of the recent calls are outliers
+    stage_timers: boolean, optional
+        if set the detailed results contain the duration of each stage
+        of the readers, e.g. stage_read, as columns
+    gpi_sampler: function, optional
+        selects the gpis to read, default is random.sample.
+        See the workloads module for samplers with locality.
+    date_sampler: function, optional
+        selects the dates and date ranges to read
+    cell_sampler: function, optional
+        selects the cells to read
+    plan: plans.WorkloadPlan, optional
+        if given the requests of every run are taken from the plan
+        instead of being sampled during the tests. Workloads the plan
+        does not contain yet are added to it for warmup + repeats runs,
+        the plan can then be saved to repeat the test run exactly.
+        Can not be combined with samplers.
+
+    Notes
+    -----
+    The detailed results of every test also contain the I/O counters
+    of each call if the operating system provides /proc/self/io.
+    The result files then report the effective read throughput and
+    the read syscalls per request. They also contain the gpi, cell,
+    start and end index and number of timesteps of every call.
+
+    The cache mode and scope are stored in the metadata of every result
+    together with a fingerprint of the machine, the libraries, the layout
+    of the data file and the parameters of the test run.
     """
-
-    timed_dataset = test_cases.SelfTimingDataset(dataset)
-    timed_avg_img_dataset = test_cases.SelfTimingDataset(dataset)
-
-    if gpi_list is not None:
-        # test reading of time series by grid point/location id
-        test_name = '{}_test-rand-gpi'.format(name)
-
-        @test_cases.measure(test_name, runs=repeats)
-        def test_rand_gpi():
-            test_cases.read_rand_ts_by_gpi_list(timed_dataset, gpi_list,
-                                                read_perc=gpi_read_perc,
-                                                max_runtime=max_runtime_per_test)
-
-        results = test_rand_gpi()
-        results.to_nc(os.path.join(save_dir, test_name + ".nc"))
-
+    if cache_mode not in [None, 'cold', 'warm']:
+        raise ValueError("Unknown cache mode %s" % cache_mode)
+    if cache_scope not in ['run', 'call']:
+        raise ValueError("Unknown cache scope %s" % cache_scope)
+    if cache_files is None:
+        cache_files = []
+        if hasattr(dataset, 'fname'):
+            cache_files.append(dataset.fname)
+
+    def prepare_cache():
+        helper.prepare_page_cache(cache_files, cache_mode)
+
+    run_setup, before_call = None, None
+    if cache_mode is not None:
+        if cache_scope == 'run':
+            run_setup = prepare_cache
+        else:
+            before_call = prepare_cache
+
+    if plan is not None:
+        if any(sampler is not None for sampler in
+               [gpi_sampler, date_sampler, cell_sampler]):
+            raise ValueError("Samplers can not be used with a workload plan")
+        plan.reset()
+
+    def plan_workload(workload, population, read_perc):
+        """
+        add a workload to the plan if it is not planned yet, a planned
+        workload must have been sampled from a population of this size
+        """
+        if plan is None:
+            return
+        if workload not in plan:
+            plan.add(workload, len(population),
+                     int(math.ceil(len(population) * read_perc / 100.0)),
+                     runs=warmup + repeats)
+        elif plan.sizes[workload] != len(population):
+            raise ValueError("Workload %s of the plan was sampled from %d "
+                             "items, not %d" % (workload,
+                                                plan.sizes[workload],
+                                                len(population)))
+
+    def next_run(workload):
+        """
+        positions of the requests of the next run of a planned workload
+        """
+        if plan is None:
+            return None
+        return plan.next_run(workload)
+
+    metadata = fingerprint.fingerprint(
+        dataset, gpi_read_perc=gpi_read_perc, date_read_perc=date_read_perc,
+        cell_read_perc=cell_read_perc, repeats=repeats, warmup=warmup,
+        max_runtime_per_test=max_runtime_per_test,
+        plan_seed=None if plan is None else plan.seed)
+    metadata.update({'cache_mode': str(cache_mode),
+                     'cache_scope': cache_scope})
+
+    trace = None
+    if trace_file is not None:
+        trace = TraceRecorder(name)
+
+    capture = None
+    if outlier_log is not None:
+        capture = outliers.OutlierCapture(
+            outlier_log, threshold=outliers.LatencyThreshold(
+                absolute=outlier_threshold, percentile=outlier_percentile))
+
+    timed_dataset = test_cases.SelfTimingDataset(dataset,
+                                                 before_call=before_call,
+                                                 trace=trace,
+                                                 outliers=capture,
+                                                 stage_timers=stage_timers)
+    timed_avg_img_dataset = test_cases.SelfTimingDataset(
+        dataset, before_call=before_call, trace=trace, outliers=capture,
+        stage_timers=stage_timers)
+
+    def measure(test_name, timed, funcname):
+        """
+        measure decorator for a test of a timed function
+        """
+        return test_cases.measure(test_name, runs=repeats, setup=run_setup,
+                                  warmup=warmup,
+                                  after_warmup=lambda: timed.reset(funcname),
+                                  min_runs=min_repeats, ci_target=ci_target,
+                                  time_budget=time_budget_per_test,
+                                  trace=trace, profile=profile)
+
+    pstats_files = []
+
+    def save_results(results, timed, funcname):
+        """
+        store the results of a test and the detailed results
+        of the timed function
+        """
+        results.attrs.update(metadata)
         detailed_results = test_cases.TestResults(
-            timed_dataset.measurements['get_timeseries'],
-            name=test_name + "_detailed")
-
-        detailed_results.to_nc(
-            os.path.join(save_dir, test_name + "_detailed.nc"))
-
-    if date_range_list is not None:
-        # test reading of daily images, only start date is given
-        test_name = '{}_test-rand-daily-img'.format(name)
-
-        # make date list containing just the start dates for reading images
-        date_list = []
-        for d1, d2 in date_range_list:
-            date_list.append(d1)
-
-        @test_cases.measure(test_name, runs=repeats)
-        def test_rand_img():
-            test_cases.read_rand_img_by_date_list(timed_dataset, date_list,
-                                                  read_perc=date_read_perc,
-                                                  max_runtime=max_runtime_per_test)
-
-        results = test_rand_img()
-        results.to_nc(os.path.join(save_dir, test_name + ".nc"))
-
-        detailed_results = test_cases.TestResults(
-            timed_dataset.measurements['get_avg_image'],
-            name=test_name + "_detailed")
-
-        detailed_results.to_nc(
-            os.path.join(save_dir, test_name + "_detailed.nc"))
+            timed.measurements[funcname],
+            name=results.name + "_detailed",
+            columns=timed.columns(funcname),
+            attrs=metadata)
+
+        for res in [results, detailed_results]:
+            if store is not None:
+                store.add_results(res, run=name)
+            else:
+                res.to_nc(os.path.join(save_dir, res.name + ".nc"))
+
+        if results.profile is not None and save_dir is not None:
+            fname = os.path.join(save_dir, results.name + ".pstats")
+            results.profile.dump_stats(fname)
+            pstats_files.append(fname)
+
+    if capture is not None:
+        capture.start()
+    try:
+        if gpi_list is not None:
+            # test reading of time series by grid point/location id
+            test_name = '{}_test-rand-gpi'.format(name)
+            plan_workload('gpi', gpi_list, gpi_read_perc)
+
+            @measure(test_name, timed_dataset, 'get_timeseries')
+            def test_rand_gpi():
+                test_cases.read_rand_ts_by_gpi_list(timed_dataset, gpi_list,
+                                                    read_perc=gpi_read_perc,
+                                                    max_runtime=max_runtime_per_test,
+                                                    sampler=gpi_sampler,
+                                                    index=next_run('gpi'))
+
+            save_results(test_rand_gpi(), timed_dataset, 'get_timeseries')
+
+        if date_range_list is not None:
+            # test reading of daily images, only start date is given
+            test_name = '{}_test-rand-daily-img'.format(name)
+
+            # make date list containing just the start dates for reading images
+            date_list = []
+            for d1, d2 in date_range_list:
+                date_list.append(d1)
+            plan_workload('date', date_list, date_read_perc)
+
+            @measure(test_name, timed_dataset, 'get_avg_image')
+            def test_rand_img():
+                test_cases.read_rand_img_by_date_list(timed_dataset, date_list,
+                                                      read_perc=date_read_perc,
+                                                      max_runtime=max_runtime_per_test,
+                                                      sampler=date_sampler,
+                                                      index=next_run('date'))
+
+            save_results(test_rand_img(), timed_dataset, 'get_avg_image')
+
+            # test reading of averaged images
+            test_name = '{}_test-rand-avg-img'.format(name)
+            plan_workload('date_range', date_range_list, date_read_perc)
+
+            @measure(test_name, timed_avg_img_dataset, 'get_avg_image')
+            def test_avg_img():
+                test_cases.read_rand_img_by_date_range(timed_avg_img_dataset, date_range_list,
+                                                       read_perc=date_read_perc,
+                                                       max_runtime=max_runtime_per_test,
+                                                       sampler=date_sampler,
+                                                       index=next_run('date_range'))
+
+            save_results(test_avg_img(), timed_avg_img_dataset, 'get_avg_image')
+
+        if cell_list is not None and cell_date_list is not None:
+            # test reading of complete cells
+            test_name = '{}_test-rand-cells-data'.format(name)
+            plan_workload('cell', cell_list, cell_read_perc)
+            plan_workload('cell_date', cell_date_list, cell_read_perc)
+
+            @measure(test_name, timed_dataset, 'get_data')
+            def test_read_cell_data():
+                test_cases.read_rand_cells_by_cell_list(timed_dataset, cell_date_list, cell_list,
+                                                        read_perc=cell_read_perc,
+                                                        max_runtime=max_runtime_per_test,
+                                                        sampler=cell_sampler,
+                                                        index=next_run('cell'),
+                                                        date_index=next_run('cell_date'))
+
+            save_results(test_read_cell_data(), timed_dataset, 'get_data')
+    finally:
+        if capture is not None:
+            capture.stop()
+
+    if trace is not None:
+        trace.write(trace_file)
+    if pstats_files:
+        profiling.write_hot_functions(
+            pstats_files, os.path.join(save_dir, name + "_hot_functions.txt"))
+
+
+def _nbytes(data):
+    """
+    size in bytes of the data returned by a dataset
+    """
+    if data is None:
+        return 0
+    if hasattr(data, 'memory_usage'):
+        # pandas.DataFrame
+        return int(data.memory_usage(index=True).sum())
+    if hasattr(data, 'nbytes'):
+        return int(data.nbytes)
+    if isinstance(data, dict):
+        return sum(_nbytes(value) for value in data.values())
+    if isinstance(data, (list, tuple)):
+        return sum(_nbytes(value) for value in data)
+    return 0
+
+
+def _extract(dataset, gpis, deadline=None):
+    """
+    read the time series of a block of gpis until the deadline
+
+    Returns
+    -------
+    gpis: numpy.ndarray
+        gpis that were read
+    durations: numpy.ndarray
+        duration of each read
+    nbytes: numpy.ndarray
+        bytes of the data of each read
+    rchar: int
+        bytes read by the process, 0 if not known
+    """
+    io_start = test_cases.read_proc_io()
+    durations = []
+    nbytes = []
+    for gpi in gpis:
+        if deadline is not None and time.time() > deadline:
+            break
+        start = time.time()
+        data = dataset.get_timeseries(int(gpi))
+        durations.append(time.time() - start)
+        nbytes.append(_nbytes(data))
+    io_end = test_cases.read_proc_io()
+    rchar = 0
+    if io_start is not None and io_end is not None:
+        rchar = io_end['rchar'] - io_start['rchar']
+    return (np.asarray(gpis[:len(durations)]), np.array(durations),
+            np.array(nbytes, dtype=np.int64), rchar)
 
-        # test reading of averaged images
-        test_name = '{}_test-rand-avg-img'.format(name)
 
-        @test_cases.measure(test_name, runs=repeats)
-        def test_avg_img():
-            test_cases.read_rand_img_by_date_range(timed_avg_img_dataset, date_range_list,
-                                                   read_perc=date_read_perc,
-                                                   max_runtime=max_runtime_per_test)
+#: dataset of a bulk extraction worker process
+_worker_dataset = None
 
-        results = test_avg_img()
-        results.to_nc(os.path.join(save_dir, test_name + ".nc"))
 
-        detailed_results = test_cases.TestResults(
-            timed_avg_img_dataset.measurements['get_avg_image'],
-            name=test_name + "_detailed")
+def _init_extract_worker(dataset_factory):
+    global _worker_dataset
+    _worker_dataset = dataset_factory()
 
-        detailed_results.to_nc(
-            os.path.join(save_dir, test_name + "_detailed.nc"))
 
-    if cell_list is not None and cell_date_list is not None:
-        # test reading of complete cells
-        test_name = '{}_test-rand-cells-data'.format(name)
+def _extract_in_worker(args):
+    gpis, deadline = args
+    return _extract(_worker_dataset, gpis, deadline)
 
-        @test_cases.measure(test_name, runs=repeats)
-        def test_read_cell_data():
-            test_cases.read_rand_cells_by_cell_list(timed_dataset, cell_date_list, cell_list,
-                                                    read_perc=cell_read_perc,
-                                                    max_runtime=max_runtime_per_test)
 
-        results = test_read_cell_data()
-        results.to_nc(os.path.join(save_dir, test_name + ".nc"))
+def run_bulk_extraction(name, dataset, save_dir, gpi_list, grid=None,
+                        cell_list=None, block_size=1000, n_processes=1,
+                        dataset_factory=None, time_budget=None, store=None):
+    """
+    Read every time series of a gpi list, e.g. all land points, like a
+    processing job that needs the complete dataset. The sustained
+    throughput is stored in the attributes of the results and used to
+    project the time of a full extraction if the time budget ran out.
 
-        detailed_results = test_cases.TestResults(
-            timed_dataset.measurements['get_data'],
-            name=test_name + "_detailed")
+    Parameters
+    ----------
+    name: string
+        name of the test run, used for filenaming
+    dataset: dataset instance
+        instance implementing the get_timeseries method, only used
+        if n_processes is 1
+    save_dir: string
+        directory to store the test results in, not used if
+        a results store is given
+    gpi_list: list or numpy.ndarray
+        grid point indices to read, e.g. grid.land_ind
+    grid: pygeogrids.grids.CellGrid, optional
+        if given the gpis are read cell by cell, each cell is a
+        unit of work of the worker processes
+    cell_list: list, optional
+        only read the gpis of these cells, needs a grid
+    block_size: int, optional
+        number of consecutive gpis per unit of work if no grid is given
+    n_processes: int, optional
+        number of worker processes reading cells in parallel
+    dataset_factory: function, optional
+        called without arguments in every worker process to open its
+        own instance of the dataset, needed if n_processes > 1 since
+        netCDF files can not be shared between processes
+    time_budget: float, optional
+        stop after this many seconds and extrapolate the full run
+    store: ResultsStore, optional
+        if given the results are added to this store as a run
+        with the given name instead of being written to a .nc file
+
+    Returns
+    -------
+    results: TestResults
+        duration of every read with the gpi and the bytes of the
+        returned data as columns. The attributes contain the
+        number of series that were and should have been read, the
+        elapsed time, series_per_s, mb_per_s of returned data,
+        read_mb_per_s read by the processes and projected_time of
+        the full extraction in seconds.
+    """
+    if n_processes > 1 and dataset_factory is None:
+        raise ValueError("A dataset factory is needed for parallel reading")
+    gpi_list = np.asarray(gpi_list)
+    if grid is not None:
+        cells = grid.gpi2cell(gpi_list)
+        if cell_list is not None:
+            selected = np.in1d(cells, cell_list)
+            gpi_list, cells = gpi_list[selected], cells[selected]
+        order = np.lexsort((gpi_list, cells))
+        gpi_list, cells = gpi_list[order], cells[order]
+        bounds = np.flatnonzero(np.diff(cells)) + 1
+        blocks = np.split(gpi_list, bounds)
+    elif cell_list is not None:
+        raise ValueError("A grid is needed to read a cell list")
+    else:
+        blocks = [gpi_list[i:i + block_size]
+                  for i in xrange(0, len(gpi_list), block_size)]
+    blocks = [block for block in blocks if len(block) > 0]
+    if not blocks:
+        raise ValueError("No time series to read")
+
+    start = time.time()
+    deadline = None
+    if time_budget is not None:
+        deadline = start + time_budget
+    if n_processes > 1:
+        pool = Pool(n_processes, initializer=_init_extract_worker,
+                    initargs=(dataset_factory,))
+        try:
+            parts = pool.map(_extract_in_worker,
+                             [(block, deadline) for block in blocks],
+                             chunksize=1)
+        finally:
+            pool.close()
+            pool.join()
+    else:
+        parts = [_extract(dataset, block, deadline) for block in blocks]
+    elapsed = time.time() - start
+
+    gpis = np.concatenate([part[0] for part in parts])
+    durations = np.concatenate([part[1] for part in parts])
+    nbytes = np.concatenate([part[2] for part in parts])
+    rchar = sum(part[3] for part in parts)
+
+    n_series = len(gpi_list)
+    series_per_s = len(durations) / elapsed
+    attrs = fingerprint.fingerprint(dataset, n_processes=n_processes,
+                                    time_budget=time_budget)
+    attrs.update({'n_series': n_series,
+                  'n_series_read': len(durations),
+                  'complete': int(len(durations) == n_series),
+                  'elapsed': elapsed,
+                  'series_per_s': series_per_s,
+                  'mb_per_s': nbytes.sum() / elapsed / 1e6,
+                  'read_mb_per_s': rchar / elapsed / 1e6})
+    if len(durations) > 0:
+        attrs['projected_time'] = n_series / series_per_s
+    else:
+        attrs['projected_time'] = float('inf')
+
+    results = test_cases.TestResults(
+        durations, '{}_bulk-extraction'.format(name),
+        columns={'gpi': gpis, 'nbytes': nbytes}, attrs=attrs)
+    print "read {} out of {} time series, {:.1f} series/s, {:.2f} MB/s, " \
+        "projected time {:.0f} s".format(len(durations), n_series,
+                                         series_per_s, attrs['mb_per_s'],
+                                         attrs['projected_time'])
+    if store is not None:
+        store.add_results(results, run=name)
+    else:
+        results.to_nc(os.path.join(save_dir, results.name + ".nc"))
+    return results
+
+
+def run_image_iteration_tests(name, dataset, save_dir, date_start, date_end,
+                              step=timedelta(days=1), prefetch=2,
+                              process=None, repeats=3, warmup=0, store=None):
+    """
+    Compare walking through the images of a date range with a plain loop
+    of get_avg_image calls and with the prefetching helper.iter_images.
 
-        detailed_results.to_nc(
-            os.path.join(save_dir, test_name + "_detailed.nc"))
+    Parameters
+    ----------
+    name: string
+        name of the test run, used for filenaming
+    dataset: dataset instance
+        instance implementing the get_avg_image method
+    save_dir: string
+        directory to store the test results in, not used if
+        a results store is given
+    date_start: datetime
+        date of the first image
+    date_end: datetime
+        date of the last image
+    step: timedelta, optional
+        time between two images
+    prefetch: int, optional
+        number of images read ahead by the prefetching iterator
+    process: function, optional
+        downstream processing that gets every image, e.g. updating
+        a climatology. Prefetching can only help if there is some.
+    repeats: int, optional
+        number of runs of each test
+    warmup: int, optional
+        number of runs of each test before the measurement starts
+    store: ResultsStore, optional
+        if given the results are added to this store as a run
+        with the given name instead of being written to .nc files
+
+    Returns
+    -------
+    loop_results: TestResults
+        runtimes of the plain loop
+    prefetch_results: TestResults
+        runtimes with prefetching, the speedup of the median runtime
+        is stored in the speedup attribute
+    """
+    n_images = len(helper.image_dates(date_start, date_end, step))
+    metadata = fingerprint.fingerprint(dataset, n_images=n_images,
+                                       repeats=repeats, warmup=warmup)
+
+    def iterate(n_prefetch):
+        for date, img in helper.iter_images(dataset, date_start, date_end,
+                                            step=step, prefetch=n_prefetch):
+            if process is not None:
+                process(img)
+
+    all_results = []
+    for test, n_prefetch in [('loop', 0), ('prefetch', prefetch)]:
+        test_name = '{}_test-image-{}'.format(name, test)
+
+        @test_cases.measure(test_name, runs=repeats, warmup=warmup)
+        def test_images():
+            iterate(n_prefetch)
+
+        results = test_images()
+        results.attrs.update(metadata)
+        results.attrs['prefetch'] = n_prefetch
+        all_results.append(results)
+    loop_results, prefetch_results = all_results
+    prefetch_results.attrs['speedup'] = loop_results.median / \
+        prefetch_results.median
+    print "prefetching {} images: {:.2f}x".format(
+        n_images, prefetch_results.attrs['speedup'])
+
+    for res in all_results:
+        if store is not None:
+            store.add_results(res, run=name)
+        else:
+            res.to_nc(os.path.join(save_dir, res.name + ".nc"))
+    return loop_results, prefetch_results
 
 
 def run_esa_cci_netcdf_tests(test_dir, results_dir, variables=['sm']):
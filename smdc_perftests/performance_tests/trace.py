@@ -0,0 +1,120 @@
+# Copyright (c) 2026,Vienna University of Technology,
+# Department of Geodesy and Geoinformation
+# All rights reserved.
+
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL VIENNA UNIVERSITY OF TECHNOLOGY,
+# DEPARTMENT OF GEODESY AND GEOINFORMATION BE LIABLE FOR ANY
+# DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND
+# ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+'''
+Timeline traces of benchmark runs in the Chrome trace event format.
+The written files can be opened in chrome://tracing or
+https://ui.perfetto.dev
+
+Created on Mon Oct 26 09:21:44 2026
+'''
+
+import os
+import json
+import time
+import thread
+
+
+class TraceRecorder(object):
+
+    """
+    Buffers spans of the benchmark in memory, e.g. the tests, their
+    runs and every timed call, and writes them as complete events
+    of the Chrome trace event format.
+
+    Recording a span appends one tuple to a list, the events are
+    only converted when the trace is written.
+
+    Parameters
+    ----------
+    name: string, optional
+        name of the traced process shown in the timeline
+
+    Attributes
+    ----------
+    workload: string
+        name of the test that is currently measured, added to
+        the arguments of every recorded call
+    """
+
+    def __init__(self, name=None):
+        self.name = name
+        self.pid = os.getpid()
+        self.origin = time.time()
+        self.workload = None
+        self._spans = []
+
+    def add(self, name, start, end, cat='call', args=None):
+        """
+        record a span
+
+        Parameters
+        ----------
+        name: string
+            name of the span, e.g. the timed function
+        start: float
+            start time as returned by time.time()
+        end: float
+            end time as returned by time.time()
+        cat: string, optional
+            category of the span, e.g. 'test', 'run' or 'call'
+        args: dict, optional
+            arguments shown with the span
+        """
+        self._spans.append((name, cat, start, end, thread.get_ident(),
+                            self.workload, args))
+
+    def __len__(self):
+        return len(self._spans)
+
+    def events(self):
+        """
+        Returns
+        -------
+        events: list
+            recorded spans as trace event dictionaries with
+            timestamps in microseconds since the recorder was created
+        """
+        events = []
+        if self.name is not None:
+            events.append({'name': 'process_name', 'ph': 'M',
+                           'pid': self.pid, 'tid': 0,
+                           'args': {'name': self.name}})
+        for name, cat, start, end, tid, workload, args in self._spans:
+            event_args = {}
+            if workload is not None:
+                event_args['workload'] = workload
+            if args is not None:
+                event_args.update(args)
+            events.append({'name': name, 'cat': cat, 'ph': 'X',
+                           'ts': (start - self.origin) * 1e6,
+                           'dur': (end - start) * 1e6,
+                           'pid': self.pid, 'tid': tid,
+                           'args': event_args})
+        return events
+
+    def write(self, filename):
+        """
+        write the trace as JSON
+
+        Parameters
+        ----------
+        filename: string
+            path and filename
+        """
+        with open(filename, 'w') as trace_file:
+            json.dump({'traceEvents': self.events(),
+                       'displayTimeUnit': 'ms'}, trace_file)
@@ -0,0 +1,243 @@
+# Copyright (c) 2026,Vienna University of Technology,
+# Department of Geodesy and Geoinformation
+# All rights reserved.
+
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL VIENNA UNIVERSITY OF TECHNOLOGY,
+# DEPARTMENT OF GEODESY AND GEOINFORMATION BE LIABLE FOR ANY
+# DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND
+# ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+'''
+Samplers for access patterns with locality. Each function returns a
+sampler that can replace random.sample in the read_rand_* functions of
+test_cases: it gets the population, e.g. a gpi, date or cell list, and
+the number of requests and returns the requested items in order.
+
+Samplers that need an expensive preparation of the population, a ranking
+or a spatial index, do it once and reuse it while they are called with
+the same population object. Give the population when creating them to
+prepare it before the measured runs.
+
+Created on Fri Oct 30 09:27:40 2026
+'''
+
+from datetime import datetime
+
+import numpy as np
+from scipy.spatial import cKDTree
+
+
+def _take(population, index):
+    """
+    items of the population at the given positions
+    """
+    return [population[i] for i in index]
+
+
+def _per_population(prepare, population=None):
+    """
+    Returns a function that gets a population and returns
+    prepare(population), computed only if the population object
+    changed since the last call. If a population is given it is
+    prepared right away.
+    """
+    cache = {}
+
+    def prepared(population):
+        if 'state' not in cache or cache['population'] is not population:
+            cache['state'] = prepare(population)
+            cache['population'] = population
+        return cache['state']
+
+    if population is not None:
+        prepared(population)
+    return prepared
+
+
+def zipf_sampler(s=1.1, shuffle=True, seed=None, population=None):
+    """
+    Popularity skewed requests. The items are ranked and the k-th
+    item is requested with a probability proportional to 1 / k**s.
+    Items are drawn with replacement so that hot items are repeated.
+
+    Parameters
+    ----------
+    s: float, optional
+        exponent of the Zipf distribution, larger is more skewed
+    shuffle: boolean, optional
+        if set the ranking is a random permutation of the population,
+        otherwise the first items of the population are the most popular.
+        The ranking is kept while the sampler gets the same population.
+    seed: int, optional
+        seed of the random number generator
+    population: list, optional
+        population to compute the ranking and probabilities for now
+        instead of at the first call
+
+    Returns
+    -------
+    sampler: function
+        sampler(population, n) returning a list of n items
+    """
+    rng = np.random.RandomState(seed)
+
+    def prepare(population):
+        size = len(population)
+        cdf = np.cumsum(1.0 / np.arange(1, size + 1) ** s)
+        cdf /= cdf[-1]
+        ranking = rng.permutation(size) if shuffle else None
+        return cdf, ranking
+
+    prepared = _per_population(prepare, population)
+
+    def sampler(population, n):
+        cdf, ranking = prepared(population)
+        ranks = np.searchsorted(cdf, rng.random_sample(n), side='right')
+        ranks = np.minimum(ranks, len(cdf) - 1)
+        if ranking is not None:
+            ranks = ranking[ranks]
+        return _take(population, ranks)
+
+    return sampler
+
+
+def _start_date(item):
+    """
+    start date of a date or a [start, end] pair
+    """
+    if isinstance(item, datetime):
+        return item
+    return item[0]
+
+
+def recency_sampler(half_life=30.0, seed=None):
+    """
+    Requests weighted towards recent dates. The weight of a date halves
+    every half_life days before the most recent date of the population.
+    Items are drawn with replacement.
+
+    Parameters
+    ----------
+    half_life: float, optional
+        half life of the weights in days
+    seed: int, optional
+        seed of the random number generator
+
+    Returns
+    -------
+    sampler: function
+        sampler(population, n) for lists of dates or of
+        [start, end] date pairs, weighted by the start date
+    """
+    rng = np.random.RandomState(seed)
+
+    def sampler(population, n):
+        starts = [_start_date(item) for item in population]
+        latest = max(starts)
+        age = np.array([(latest - d).total_seconds() / 86400.0
+                        for d in starts])
+        weights = 0.5 ** (age / half_life)
+        index = rng.choice(len(population), size=n,
+                           p=weights / weights.sum())
+        return _take(population, index)
+
+    return sampler
+
+
+def spatial_walk_sampler(grid, neighbours=8, restart_prob=0.05, seed=None,
+                         population=None):
+    """
+    Spatially clustered requests. A random walk starts at a random gpi
+    and moves to one of the nearest gpis of the population with every
+    request. With probability restart_prob it jumps to a random gpi.
+
+    Parameters
+    ----------
+    grid: pygeogrids.grids.BasicGrid
+        grid providing the locations of the gpis
+    neighbours: int, optional
+        number of nearest gpis the walk can move to
+    restart_prob: float, optional
+        probability of a jump to a random gpi
+    seed: int, optional
+        seed of the random number generator
+    population: list, optional
+        gpis to find the nearest neighbours of now instead of at the
+        first call
+
+    Returns
+    -------
+    sampler: function
+        sampler(population, n) for gpi lists
+    """
+    rng = np.random.RandomState(seed)
+
+    def prepare(population):
+        size = len(population)
+        k = min(neighbours + 1, size)
+        if k < 2:
+            return size, None
+        lon, lat = grid.gpi2lonlat(np.asarray(population))
+        tree = cKDTree(np.column_stack([lon, lat]))
+        return size, tree.query(tree.data, k=k)[1]
+
+    prepared = _per_population(prepare, population)
+
+    def sampler(population, n):
+        size, near = prepared(population)
+        jumps = rng.random_sample(n) < restart_prob
+        if near is not None:
+            choices = rng.randint(1, near.shape[1], size=n)
+        index = np.empty(n, dtype=np.int64)
+        position = rng.randint(size)
+        for i in xrange(n):
+            if i > 0:
+                if jumps[i] or near is None:
+                    position = rng.randint(size)
+                else:
+                    position = near[position, choices[i]]
+            index[i] = position
+        return _take(population, index)
+
+    return sampler
+
+
+def cell_scan_sampler(grid=None, seed=None):
+    """
+    Sequential scans. The population is ordered by cell and the
+    requests read consecutive items starting at a random position,
+    wrapping around at the end.
+
+    Parameters
+    ----------
+    grid: pygeogrids.grids.CellGrid, optional
+        grid providing the cells of gpis. If not given the items
+        themselves are sorted, e.g. a list of cells.
+    seed: int, optional
+        seed of the random number generator
+
+    Returns
+    -------
+    sampler: function
+        sampler(population, n) for gpi or cell lists
+    """
+    rng = np.random.RandomState(seed)
+
+    def sampler(population, n):
+        values = np.asarray(population)
+        if grid is not None:
+            order = np.lexsort((values, grid.gpi2cell(values)))
+        else:
+            order = np.argsort(values, kind='mergesort')
+        start = rng.randint(len(population))
+        index = order[(start + np.arange(n)) % len(population)]
+        return _take(population, index)
+
+    return sampler
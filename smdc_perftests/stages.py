@@ -0,0 +1,106 @@
+# Copyright (c) 2026,Vienna University of Technology,
+# Department of Geodesy and Geoinformation
+# All rights reserved.
+
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL VIENNA UNIVERSITY OF TECHNOLOGY,
+# DEPARTMENT OF GEODESY AND GEOINFORMATION BE LIABLE FOR ANY
+# DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND
+# ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+'''
+Stage timers for the dataset readers. A reader calls mark at the end of
+each stage of a request, e.g. after the index lookup or the netCDF read.
+If no recorder is active mark returns immediately. Recorders are active
+per thread, marks of background readers do not reach the recorder of
+the timed call.
+
+Created on Thu Oct 29 09:12:31 2026
+'''
+
+import time
+import threading
+
+
+class _Active(threading.local):
+
+    """
+    recorder active in the current thread
+    """
+    recorder = None
+
+
+_active = _Active()
+
+
+class StageRecorder(object):
+
+    """
+    Sums the durations of the stages of one request. The duration of a
+    stage is the time since the previous mark or since begin.
+    """
+
+    def __init__(self):
+        self.durations = {}
+        self._last = None
+
+    def begin(self):
+        """
+        start timing a request
+        """
+        self.durations = {}
+        self._last = time.time()
+
+    def mark(self, stage):
+        """
+        end a stage
+
+        Parameters
+        ----------
+        stage: string
+            name of the stage that ended
+        """
+        now = time.time()
+        self.durations[stage] = self.durations.get(stage, 0.0) + \
+            now - self._last
+        self._last = now
+
+
+def mark(stage):
+    """
+    end a stage of the current request if a recorder is active
+
+    Parameters
+    ----------
+    stage: string
+        name of the stage that ended, e.g. 'read'
+    """
+    recorder = _active.recorder
+    if recorder is not None:
+        recorder.mark(stage)
+
+
+def activate(recorder):
+    """
+    make a recorder receive the marks of the readers
+    in the current thread
+
+    Parameters
+    ----------
+    recorder: StageRecorder or None
+        recorder to activate, None disables the stage timers
+
+    Returns
+    -------
+    previous: StageRecorder or None
+        recorder that was active before
+    """
+    previous = _active.recorder
+    _active.recorder = recorder
+    return previous
@@ -40,6 +40,7 @@ except ImportError:
     seaborn_installed = False
     pass
 
+import numpy as np
 import matplotlib.pyplot as plt
 
 
@@ -55,6 +56,9 @@ def plot_boxplots(*args, **kwargs):
         side by side
     conf_level: int, optional
         confidence level to use for the computed confidence intervals
+    tail_percentiles: list, optional
+        percentiles e.g. [95, 99, 99.9] that are taken from the latency
+        histogram of each result and marked next to its box
 
     **kwargs: varied
         all other keyword arguments will be passed on to the
@@ -69,6 +73,7 @@ def plot_boxplots(*args, **kwargs):
         conf_level = kwargs.pop('conf_level')
     else:
         conf_level = 95
+    tail_percentiles = kwargs.pop('tail_percentiles', [])
 
     measurements = []
     conf_intervals = []
@@ -76,7 +81,7 @@ def plot_boxplots(*args, **kwargs):
     names = []
     for res in args:
         conf = res.confidence_int(conf_level=conf_level)
-        measurements.append(res._measurements)
+        measurements.append(res.measurements)
         conf_intervals.append([conf[0], conf[2]])
         means.append(res.mean)
         names.append(res.name)
@@ -88,9 +93,188 @@ def plot_boxplots(*args, **kwargs):
     else:
         ax = plt.boxplot(measurements, conf_intervals=conf_intervals, notch=True,
                          usermedians=means)
+    for i, res in enumerate(args):
+        for q, marker in zip(tail_percentiles, ['^', 'v', 's', 'D', 'o']):
+            ax1.plot(i + 1.3, res.tail_percentile(q), marker=marker,
+                     color='k', linestyle='none', label='p%g' % q)
     xtickNames = plt.setp(ax1, xticklabels=names)
     plt.setp(xtickNames)
     plt.title('Boxplots with notches at confidence level %d %%.' % conf_level)
     plt.ylabel('Time [s]')
 
     return fig, ax1
+
+
+def plot_tail_percentiles(*args, **kwargs):
+    """
+    plots percentiles of the latency histograms of
+    the given TestResults objects. The raw measurements
+    are not needed for this plot.
+
+    Parameters
+    ----------
+    *args: TestResults instances
+        any Number of TestResults instances that should be plotted
+    percentiles: list, optional
+        percentiles to plot, default is [50, 90, 95, 99, 99.9]
+
+    **kwargs: varied
+        all other keyword arguments will be passed on to the
+        plt.subplots function
+
+    Returns
+    -------
+    fig: matplotlib.Figure
+    ax1: matplotlib.axes
+    """
+    percentiles = kwargs.pop('percentiles', [50, 90, 95, 99, 99.9])
+
+    fig, ax1 = plt.subplots(**kwargs)
+    positions = range(len(percentiles))
+    for res in args:
+        ax1.plot(positions, res.tail_percentile(percentiles), marker='o',
+                 label=res.name)
+    ax1.set_xticks(positions)
+    ax1.set_xticklabels(['p%g' % q for q in percentiles])
+    ax1.set_yscale('log')
+    ax1.legend(loc='best')
+    plt.title('Latency percentiles')
+    plt.ylabel('Time [s]')
+
+    return fig, ax1
+
+
+def _default_cell_size(grid, n_cells=72):
+    """
+    round raster cell size that divides the larger side of the extent
+    of the grid into about n_cells cells, 5 for a global grid in degrees
+    """
+    extent = max(np.ptp(grid.activearrlon), np.ptp(grid.activearrlat))
+    if extent == 0:
+        return 1.0
+    raw = extent / float(n_cells)
+    base = 10 ** np.floor(np.log10(raw))
+    for step in [1, 2, 2.5, 5, 10]:
+        if step * base >= raw:
+            return step * base
+
+
+def latency_grid(results, grid, cell_size=None, statistic='mean'):
+    """
+    Aggregate the latency of the calls of detailed time series
+    results on a regular raster of the locations of their gpis.
+    Works with the ESA CCI, ASCAT and Equi7 grids or any other grid
+    that provides gpi2lonlat.
+
+    Parameters
+    ----------
+    results: TestResults
+        detailed results of get_timeseries with a gpi column
+    grid: pygeogrids.grids.BasicGrid
+        grid of the dataset
+    cell_size: float, optional
+        size of the raster cells in the units of the grid, by
+        default a round size that divides the extent of the grid
+        into about 72 cells, e.g. 5 degrees for a global grid
+    statistic: string, optional
+        'mean', 'median', 'max' or 'count' of each raster cell
+
+    Returns
+    -------
+    x_edges: numpy.ndarray
+        edges of the raster columns
+    y_edges: numpy.ndarray
+        edges of the raster rows
+    values: numpy.ndarray
+        statistic of each raster cell, NaN for cells without calls
+    """
+    gpis = results.columns['gpi']
+    latency = results.measurements
+    valid = gpis >= 0
+    gpis, latency = gpis[valid], latency[valid]
+    if gpis.size == 0:
+        raise ValueError("Results %s contain no gpis." % results.name)
+    x, y = grid.gpi2lonlat(gpis)
+    if cell_size is None:
+        cell_size = _default_cell_size(grid)
+    x_start = np.floor(np.min(x) / cell_size) * cell_size
+    y_start = np.floor(np.min(y) / cell_size) * cell_size
+    cols = ((x - x_start) // cell_size).astype(np.int64)
+    rows = ((y - y_start) // cell_size).astype(np.int64)
+    n_cols, n_rows = cols.max() + 1, rows.max() + 1
+    index = rows * n_cols + cols
+
+    counts = np.bincount(index, minlength=n_rows * n_cols)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        if statistic == 'mean':
+            values = np.bincount(index, weights=latency,
+                                 minlength=n_rows * n_cols) / counts
+        elif statistic in ['median', 'max']:
+            order = np.lexsort((latency, index))
+            sorted_latency = latency[order]
+            occupied = np.flatnonzero(counts)
+            starts = np.concatenate([[0], np.cumsum(counts[occupied])[:-1]])
+            if statistic == 'max':
+                picks = starts + counts[occupied] - 1
+                values_occupied = sorted_latency[picks]
+            else:
+                lower = sorted_latency[starts + (counts[occupied] - 1) // 2]
+                upper = sorted_latency[starts + counts[occupied] // 2]
+                values_occupied = (lower + upper) / 2.0
+            values = np.full(n_rows * n_cols, np.nan)
+            values[occupied] = values_occupied
+        elif statistic == 'count':
+            values = counts.astype(np.float64)
+            values[counts == 0] = np.nan
+        else:
+            raise ValueError("Unknown statistic %s" % statistic)
+
+    x_edges = x_start + cell_size * np.arange(n_cols + 1)
+    y_edges = y_start + cell_size * np.arange(n_rows + 1)
+    return x_edges, y_edges, values.reshape(n_rows, n_cols)
+
+
+def plot_latency_map(results, grid, cell_size=None, statistic='mean',
+                     **kwargs):
+    """
+    plots the latency of the time series reads of detailed
+    results on a map of the grid, aggregated per raster cell.
+    Slow chunks or dense cells show up as hot spots.
+
+    Parameters
+    ----------
+    results: TestResults
+        detailed results of get_timeseries with a gpi column
+    grid: pygeogrids.grids.BasicGrid
+        grid of the dataset
+    cell_size: float, optional
+        size of the raster cells in the units of the grid, by
+        default derived from the extent of the grid
+    statistic: string, optional
+        'mean', 'median', 'max' or 'count' of each raster cell
+
+    **kwargs: varied
+        all other keyword arguments will be passed on to the
+        plt.subplots function
+
+    Returns
+    -------
+    fig: matplotlib.Figure
+    ax1: matplotlib.axes
+    """
+    x_edges, y_edges, values = latency_grid(results, grid,
+                                            cell_size=cell_size,
+                                            statistic=statistic)
+    fig, ax1 = plt.subplots(**kwargs)
+    mesh = ax1.pcolormesh(x_edges, y_edges,
+                          np.ma.masked_invalid(values), cmap='viridis')
+    cbar = fig.colorbar(mesh, ax=ax1)
+    if statistic == 'count':
+        cbar.set_label('calls')
+    else:
+        cbar.set_label('%s time [s]' % statistic)
+    ax1.set_aspect('equal')
+    plt.title('Latency of %s per %g cell' % (results.name,
+                                             x_edges[1] - x_edges[0]))
+
+    return fig, ax1
@@ -0,0 +1,81 @@
+# Copyright (c) 2026,Vienna University of Technology,
+# Department of Geodesy and Geoinformation
+# All rights reserved.
+
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL VIENNA UNIVERSITY OF TECHNOLOGY,
+# DEPARTMENT OF GEODESY AND GEOINFORMATION BE LIABLE FOR ANY
+# DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND
+# ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+'''
+Tests for the cost models of the analyze module
+Created on Fri Oct 23 11:02:36 2026
+'''
+
+import numpy as np
+import numpy.testing as nptest
+import pytest
+
+from smdc_perftests.performance_tests import analyze
+from smdc_perftests.performance_tests.test_cases import TestResults
+
+
+def detailed_results(overhead, per_step, n=500, seed=0):
+    rng = np.random.RandomState(seed)
+    start = rng.randint(0, 300, size=n)
+    n_timesteps = rng.randint(1, 60, size=n)
+    latency = overhead + per_step * n_timesteps + \
+        rng.normal(0, 1e-5, size=n)
+    # a few very slow calls
+    latency[:10] += 1.0
+    columns = {'start_index': start,
+               'end_index': start + n_timesteps - 1,
+               'n_timesteps': n_timesteps}
+    return TestResults(latency, 'var-{}_test-rand-avg-img_detailed'.format(
+        per_step), columns=columns, attrs={'chunks_sm': '10,720,1440'})
+
+
+def test_chunks_touched():
+    res = TestResults([1.0, 1.0, 1.0], 'chunks',
+                      columns={'start_index': [0, 9, -1],
+                               'end_index': [9, 10, -1]},
+                      attrs={'chunks_sm': '10,720,1440'})
+    assert list(analyze.chunks_touched(res, 'sm')) == [1, 2, -1]
+    assert list(analyze.chunks_touched(res, 'other')) == [1, 1, -1]
+
+
+def test_fit_cost_model():
+    res = detailed_results(0.002, 0.0005)
+    model = analyze.fit_cost_model(res)
+    nptest.assert_allclose(model['overhead'], 0.002, atol=1e-5)
+    nptest.assert_allclose(model['n_timesteps'], 0.0005, rtol=1e-2)
+    assert model['n'] == 500
+
+    model = analyze.fit_cost_model(res, features=['n_timesteps',
+                                                  'chunks_touched'],
+                                   chunk_variable='sm')
+    assert list(model.index[:3]) == ['overhead', 'n_timesteps',
+                                     'chunks_touched']
+
+    with pytest.raises(ValueError):
+        analyze.fit_cost_model(TestResults([1.0], 'short',
+                                           columns={'n_timesteps': [-1]}))
+
+
+def test_cost_models_and_prediction():
+    results = [detailed_results(0.002, 0.0005),
+               detailed_results(0.01, 0.0001, seed=1)]
+    models = analyze.cost_models(results)
+    assert list(models.index) == [res.name for res in results]
+    nptest.assert_allclose(models['overhead'], [0.002, 0.01], atol=1e-5)
+
+    workload = {'n_timesteps': [1, 30, 365]}
+    runtime = analyze.predict_runtime(models.iloc[0], workload)
+    nptest.assert_allclose(runtime, 3 * 0.002 + 396 * 0.0005, rtol=1e-2)
@@ -21,7 +21,45 @@ Created on Tue Apr 28 15:38:05 2015
 @author: christoph.paulik@geo.tuwien.ac.at
 '''
 
+from datetime import datetime
+
+import numpy as np
+import numpy.testing as nptest
+import netCDF4
+
 import smdc_perftests.datasets.ascat as ascat
+from .fixtures import tempdir
+
+
+class SmallASCAT(ascat.ASCAT_netcdf):
+
+    """
+    ASCAT dataset without the land grid
+    """
+
+    def _init_grid(self):
+        self.grid = None
+
+
+def create_ascat_file(fname, n_times=20, cells=[10, 10, 10, 11, 11, 12]):
+    with netCDF4.Dataset(fname, 'w') as ds:
+        ds.createDimension('time', n_times)
+        ds.createDimension('gpi', len(cells))
+        ds.createDimension('obs', 1)
+        time = ds.createVariable('time', 'f8', ('time',))
+        time.units = 'days since 2007-01-01'
+        time[:] = np.arange(n_times)
+        gpis = np.arange(len(cells)) + 100
+        for name in ['gpis_correct', 'gpis', 'orig_gpis']:
+            ds.createVariable(name, 'i4', ('gpi',))[:] = gpis
+        for name in ['cells_correct', 'cells']:
+            ds.createVariable(name, 'i4', ('gpi',))[:] = cells
+        ds.createVariable('row_size', 'i4', ('gpi',))[:] = 0
+        exact_time = ds.createVariable('exact_time', 'f8', ('obs',))
+        exact_time.units = 'days since 2007-01-01'
+        data = np.arange(n_times * len(cells)).reshape(n_times, len(cells))
+        ds.createVariable('ssm', 'f4', ('time', 'gpi'))[:] = data
+        ds.createVariable('ssf', 'i1', ('time', 'gpi'))[:] = data % 2
 
 
 def test_grid():
@@ -29,5 +67,31 @@ def test_grid():
     assert grid.land_ind.size == 839826
 
 
+def test_iter_cell_timeseries(tempdir):
+    create_ascat_file('ascat.nc')
+    dataset = SmallASCAT('ascat.nc', variables=['ssm', 'ssf'])
+    for prefetch in [False, True]:
+        series = list(dataset.iter_cell_timeseries([10, 12, 11],
+                                                   prefetch=prefetch))
+        assert [gpi for gpi, ts in series] == [100, 101, 102, 105, 103, 104]
+        for gpi, ts in series:
+            expected = dataset.get_timeseries(gpi)
+            nptest.assert_array_equal(ts['ssm'], expected['ssm'].values)
+            nptest.assert_array_equal(ts['ssf'], expected['ssf'].values)
+            assert len(ts['time']) == 20
+
+    series = list(dataset.iter_cell_timeseries(11, datetime(2007, 1, 3),
+                                               datetime(2007, 1, 8)))
+    assert [gpi for gpi, ts in series] == [103, 104]
+    nptest.assert_array_equal(series[0][1]['ssm'], np.arange(2, 7) * 6 + 3)
+    assert series[0][1]['time'][0] == datetime(2007, 1, 3)
+
+    # stopping early waits for the prefetched cell
+    iterator = dataset.iter_cell_timeseries([10, 11], prefetch=True)
+    next(iterator)
+    iterator.close()
+    dataset.ds.close()
+
+
 if __name__ == '__main__':
     test_grid()
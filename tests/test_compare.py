@@ -0,0 +1,103 @@
+# Copyright (c) 2026,Vienna University of Technology,
+# Department of Geodesy and Geoinformation
+# All rights reserved.
+
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL VIENNA UNIVERSITY OF TECHNOLOGY,
+# DEPARTMENT OF GEODESY AND GEOINFORMATION BE LIABLE FOR ANY
+# DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND
+# ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+'''
+Tests for the statistical comparison of test results
+Created on Tue Oct 20 10:02:11 2026
+'''
+
+import numpy as np
+import numpy.testing as nptest
+import pytest
+from scipy import stats
+
+from smdc_perftests.performance_tests import compare
+from smdc_perftests.performance_tests.test_cases import TestResults
+
+
+def lognormal_results(name, scale, n=400, seed=0):
+    rng = np.random.RandomState(seed)
+    return TestResults(scale * rng.lognormal(mean=-3, sigma=0.5, size=n),
+                       name)
+
+
+def test_welch_ttest():
+    a = lognormal_results('a', 1.0, seed=1)
+    b = lognormal_results('b', 1.03, n=300, seed=2)
+    t_val, df, p_val = compare.welch_ttest(a, b)
+    t_ref, p_ref = stats.ttest_ind(b.measurements, a.measurements,
+                                   equal_var=False)
+    nptest.assert_almost_equal(t_val, t_ref)
+    nptest.assert_almost_equal(p_val, p_ref)
+
+
+def test_mann_whitney_u():
+    a = lognormal_results('a', 1.0, seed=1)
+    b = lognormal_results('b', 1.1, n=300, seed=2)
+    u_val, p_val, delta = compare.mann_whitney_u(a, b)
+    u_ref, p_ref = stats.mannwhitneyu(b.measurements, a.measurements,
+                                      alternative='two-sided')
+    nptest.assert_almost_equal(u_val, u_ref)
+    nptest.assert_almost_equal(p_val, p_ref)
+    assert delta > 0
+    # ties
+    u_val, p_val, delta = compare.mann_whitney_u(
+        TestResults([1, 1, 2, 3], 'a'), TestResults([1, 2, 2], 'b'))
+    u_ref, p_ref = stats.mannwhitneyu([1, 2, 2], [1, 1, 2, 3],
+                                      alternative='two-sided')
+    nptest.assert_almost_equal(u_val, u_ref)
+    nptest.assert_almost_equal(p_val, p_ref)
+
+
+def test_median_ratio():
+    a = lognormal_results('a', 1.0, n=20000, seed=1)
+    b = TestResults(a.measurements * 1.03, 'b')
+    lower, ratio, upper = compare.median_ratio(a, b, n_boot=500)
+    nptest.assert_almost_equal(ratio, 1.03)
+    assert 1.0 < lower < ratio < upper
+    assert compare.median_ratio(a, b, n_boot=500) == \
+        (lower, ratio, upper)
+
+
+def test_compare_matrix():
+    results = [lognormal_results('r%d' % i, 1 + 0.03 * i, n=3000, seed=i)
+               for i in range(4)]
+    matrices = compare.compare_matrix(results, n_boot=200)
+    ratio = matrices['median_ratio']
+    assert list(ratio.index) == ['r0', 'r1', 'r2', 'r3']
+    nptest.assert_almost_equal(ratio.loc['r0', 'r3'],
+                               results[3].median / results[0].median)
+    single = compare.compare(results[0], results[2])
+    nptest.assert_almost_equal(matrices['hedges_g'].loc['r0', 'r2'],
+                               single['hedges_g'])
+    nptest.assert_almost_equal(matrices['cliffs_delta'].loc['r0', 'r2'],
+                               single['cliffs_delta'])
+    nptest.assert_almost_equal(matrices['cliffs_delta'].loc['r2', 'r0'],
+                               -single['cliffs_delta'])
+    # 6 comparisons, holm multiplies the smallest p-value by 6
+    raw = compare.compare_matrix(results, n_boot=200, adjust=None)
+    p_min = np.nanmin(raw['mwu_p'].values)
+    nptest.assert_almost_equal(np.nanmin(matrices['mwu_p'].values),
+                               min(6 * p_min, 1))
+    assert matrices['ratio_lower'].loc['r0', 'r3'] > 1
+    with pytest.raises(ValueError):
+        compare.compare_matrix(results, adjust='fdr')
+
+
+def test_holm():
+    adjusted = compare.holm([0.01, 0.04, 0.03, np.nan])
+    nptest.assert_almost_equal(adjusted[:3], [0.03, 0.06, 0.06])
+    assert np.isnan(adjusted[3])
@@ -0,0 +1,99 @@
+# Copyright (c) 2026,Vienna University of Technology,
+# Department of Geodesy and Geoinformation
+# All rights reserved.
+
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL VIENNA UNIVERSITY OF TECHNOLOGY,
+# DEPARTMENT OF GEODESY AND GEOINFORMATION BE LIABLE FOR ANY
+# DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND
+# ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+'''
+Tests for the environment and dataset fingerprint
+Created on Thu Oct 22 10:55:02 2026
+'''
+
+import os
+import netCDF4
+
+from smdc_perftests.performance_tests import fingerprint
+from smdc_perftests.performance_tests import test_scripts
+from smdc_perftests.performance_tests import analyze
+from smdc_perftests.performance_tests.test_cases import TestResults
+from .fixtures import tempdir
+from .test_test_cases import FakeDataset
+
+
+class FileDataset(FakeDataset):
+
+    def __init__(self, fname):
+        super(FileDataset, self).__init__()
+        self.fname = fname
+        self.ds = netCDF4.Dataset(fname)
+        self.variables = ['sm']
+
+
+def write_dataset(fname):
+    with netCDF4.Dataset(fname, mode='w') as ncdata:
+        ncdata.createDimension('time', 10)
+        ncdata.createDimension('gpi', 100)
+        sm = ncdata.createVariable('sm', 'f4', ('time', 'gpi'),
+                                   zlib=True, complevel=4, shuffle=False,
+                                   chunksizes=(10, 20))
+        sm[:] = 1
+        flag = ncdata.createVariable('flag', 'i1', ('gpi',),
+                                     contiguous=True)
+        flag[:] = 0
+
+
+def test_fingerprint(tempdir):
+    write_dataset('data.nc')
+    dataset = FileDataset('data.nc')
+    fp = fingerprint.fingerprint(dataset, repeats=3, max_runtime=None)
+    assert fp['cpu_count'] >= 1
+    assert fp['repeats'] == 3
+    assert fp['max_runtime'] == 'None'
+    assert fp['file_size'] == os.path.getsize('data.nc')
+    assert fp['chunks_sm'] == '10,20'
+    assert fp['compression_sm'] == 'zlib4'
+    assert 'chunks_flag' not in fp
+    assert fp['netcdf4_python_version'] == netCDF4.__version__
+
+    layout = fingerprint.variable_layout(dataset.ds)
+    assert layout['chunks_flag'] == 'contiguous'
+    assert layout['compression_flag'] == 'none'
+
+
+def test_filesystem_type(tempdir):
+    with open('mounts', 'w') as mounts:
+        mounts.write("rootfs / ext4 rw 0 0\n"
+                     "tmpfs /data tmpfs rw 0 0\n")
+    assert fingerprint.filesystem_type('/data/x.nc', 'mounts') == 'tmpfs'
+    assert fingerprint.filesystem_type('/database', 'mounts') == 'ext4'
+    assert fingerprint.filesystem_type('/x', 'missing') == 'unknown'
+
+
+def test_group_and_filter_by_fingerprint(tempdir):
+    write_dataset('data.nc')
+    for repeats in [1, 2]:
+        test_scripts.run_performance_tests(
+            'repeats-{}'.format(repeats), FileDataset('data.nc'), '.',
+            gpi_list=range(100), repeats=repeats)
+    res = TestResults('repeats-2_test-rand-gpi.nc')
+    assert res.attrs['chunks_sm'] == '10,20'
+    assert res.attrs['repeats'] == 2
+
+    fnames = ['repeats-1_test-rand-gpi.nc', 'repeats-2_test-rand-gpi.nc']
+    table = analyze.summary_table(fnames)
+    assert list(table['repeats']) == [1, 2]
+    df = analyze.prep_results(fnames, name_fm=lambda n: 'gpi',
+                              group_by='repeats')
+    assert sorted(df.columns) == ['1', '2']
+    df = analyze.prep_results(fnames, filters={'repeats': lambda r: r > 1})
+    assert list(df.index) == ['repeats-2_test-rand-gpi']
@@ -22,9 +22,13 @@ Created on Wed Apr  1 15:21:15 2015
 '''
 
 
-from datetime import datetime
+import time
+from datetime import datetime, timedelta
+import numpy as np
+import pytest
 
 from smdc_perftests import helper
+from .fixtures import tempdir
 
 
 def test_generate_date_list():
@@ -55,6 +59,128 @@ def test_generate_date_same_random_seed():
     dl2 = helper.generate_date_list(minimum, maximum, n=10, max_spread=0)
     assert dl == dl2
 
+
+def test_prepare_page_cache(tempdir):
+    """
+    The page cache state can not be checked without mincore
+    but evicting and warming must work on files we own.
+    """
+    with open("data.bin", "wb") as f:
+        f.write(b"0" * 100000)
+    helper.prepare_page_cache(["data.bin"], 'cold')
+    helper.prepare_page_cache(["data.bin"], 'warm')
+    helper.prepare_page_cache(["data.bin"], None)
+    with pytest.raises(ValueError):
+        helper.prepare_page_cache(["data.bin"], 'lukewarm')
+
+
+def test_generate_date_ranges():
+    minimum = datetime(2007, 01, 15)
+    maximum = datetime(2012, 01, 01)
+    dr = helper.generate_date_ranges(minimum, maximum, n=1000,
+                                     min_spread=0, max_spread=10)
+    assert dr.shape == (1000, 2)
+    days = (dr[:, 1] - dr[:, 0]).astype(int)
+    assert days.min() >= 0
+    assert days.max() <= 10
+    assert dr.min() >= np.datetime64(minimum)
+    assert dr.max() <= np.datetime64(maximum)
+    np.testing.assert_array_equal(
+        dr, helper.generate_date_ranges(minimum, maximum, n=1000,
+                                        min_spread=0, max_spread=10))
+
+    dr = helper.generate_date_ranges(minimum, maximum, n=1000,
+                                     spread='fixed', max_spread=5)
+    days = (dr[:, 1] - dr[:, 0]).astype(int)
+    assert np.all((days == 5) | (dr[:, 1] == np.datetime64(maximum)))
+
+    dr = helper.generate_date_ranges(minimum, maximum, n=1000,
+                                     spread='loguniform', min_spread=1,
+                                     max_spread=100)
+    days = (dr[:, 1] - dr[:, 0]).astype(int)
+    assert days.min() >= 1
+    assert np.median(days) < 50
+
+    uniform = helper.generate_date_ranges(minimum, maximum, n=1000)
+    recent = helper.generate_date_ranges(minimum, maximum, n=1000,
+                                         start='recency', half_life=30)
+    assert np.median(recent[:, 0].astype(int)) > \
+        np.median(uniform[:, 0].astype(int))
+    assert recent.min() >= np.datetime64(minimum)
+
+    with pytest.raises(ValueError):
+        helper.generate_date_ranges(minimum, maximum, spread='normal')
+
+
+def test_generate_date_ranges_periods():
+    minimum = datetime(2007, 01, 15)
+    maximum = datetime(2012, 01, 01)
+    months = helper.generate_date_ranges(minimum, maximum, n=100,
+                                         period='month')
+    starts = months[:, 0].astype('datetime64[M]')
+    ends = months[:, 1].astype('datetime64[M]')
+    np.testing.assert_array_equal(starts, ends)
+    # ranges start on the first of the month unless clipped
+    first = months[:, 0] == starts.astype('datetime64[D]')
+    assert np.all(first | (months[:, 0] == np.datetime64(minimum)))
+
+    years = helper.generate_date_ranges(minimum, maximum, n=100,
+                                        period='year')
+    assert set(years[:, 0].astype('datetime64[Y]').astype(int) + 1970) <= \
+        set(range(2007, 2012))
+    assert all(str(end)[5:] == '12-31' for end in years[:, 1]
+               if end != np.datetime64(maximum))
+
+    dl = helper.date_range_list(months)
+    assert len(dl) == 100
+    for d1, d2 in dl:
+        assert type(d1) == datetime
+        assert d1 <= d2
+
+
+class ImageDataset(helper.ImageIterationMixin):
+
+    def __init__(self, fail_at=None):
+        self.fail_at = fail_at
+        self.read = []
+
+    def get_avg_image(self, date_start, date_end=None, cellID=None):
+        if date_start == self.fail_at:
+            raise IOError("can not read image")
+        self.read.append(date_start)
+        return {'sm': np.full(3, date_start.day), 'cell': cellID}
+
+
+def test_iter_images():
+    start, end = datetime(2007, 1, 1), datetime(2007, 1, 10)
+    dates = helper.image_dates(start, end, timedelta(days=3))
+    assert dates == [datetime(2007, 1, d) for d in [1, 4, 7, 10]]
+
+    for prefetch in [0, 1, 3]:
+        images = list(helper.iter_images(ImageDataset(), start, end,
+                                         prefetch=prefetch, cellID=5))
+        assert [date for date, img in images] == helper.image_dates(start,
+                                                                    end)
+        for date, img in images:
+            assert img['sm'][0] == date.day
+            assert img['cell'] == 5
+
+    images = list(ImageDataset().iter_images(start, end, cellID=3))
+    assert len(images) == 10
+    assert images[0][1]['cell'] == 3
+
+    # the reader stays at most prefetch images ahead
+    ds = ImageDataset()
+    iterator = helper.iter_images(ds, start, end, prefetch=2)
+    next(iterator)
+    time.sleep(0.1)
+    assert len(ds.read) <= 4
+    iterator.close()
+
+    with pytest.raises(IOError):
+        list(helper.iter_images(ImageDataset(fail_at=datetime(2007, 1, 5)),
+                                start, end))
+
 if __name__ == '__main__':
     test_generate_date_list()
     test_generate_date_same_random_seed()
@@ -0,0 +1,45 @@
+# Copyright (c) 2026,Vienna University of Technology,
+# Department of Geodesy and Geoinformation
+# All rights reserved.
+
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL VIENNA UNIVERSITY OF TECHNOLOGY,
+# DEPARTMENT OF GEODESY AND GEOINFORMATION BE LIABLE FOR ANY
+# DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND
+# ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+'''
+Tests for merging the results of sharded benchmark runs
+Created on Mon Oct 19 14:41:07 2026
+'''
+
+import os
+import numpy as np
+import numpy.testing as nptest
+
+from smdc_perftests.performance_tests import merge_results
+from smdc_perftests.performance_tests.test_cases import TestResults
+from .fixtures import tempdir
+
+
+def test_merge_directories(tempdir):
+    for shard in range(3):
+        os.mkdir("shard%d" % shard)
+        for test in ['test-rand-gpi', 'test-rand-cells-data']:
+            res = TestResults([shard, shard + 0.5], test)
+            res.to_nc(os.path.join("shard%d" % shard, test + ".nc"))
+
+    merge_results.main(["shard0", "shard1", "shard2", "-o", "merged"])
+    assert sorted(os.listdir("merged")) == ["test-rand-cells-data.nc",
+                                            "test-rand-gpi.nc"]
+    res = TestResults(os.path.join("merged", "test-rand-gpi.nc"))
+    assert res.n == 6
+    assert res.attrs['n_merged'] == 3
+    nptest.assert_array_equal(np.sort(res.measurements),
+                              [0, 0.5, 1, 1.5, 2, 2.5])
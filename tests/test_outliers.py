@@ -0,0 +1,134 @@
+# Copyright (c) 2026,Vienna University of Technology,
+# Department of Geodesy and Geoinformation
+# All rights reserved.
+
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL VIENNA UNIVERSITY OF TECHNOLOGY,
+# DEPARTMENT OF GEODESY AND GEOINFORMATION BE LIABLE FOR ANY
+# DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND
+# ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+'''
+Tests for the capture of slow outlier calls
+Created on Wed Oct 28 11:07:26 2026
+'''
+
+import time
+import signal
+
+import pytest
+
+from smdc_perftests.performance_tests import outliers
+from smdc_perftests.performance_tests import test_cases
+from smdc_perftests.performance_tests import test_scripts
+from .fixtures import tempdir
+from .test_test_cases import FakeDataset
+
+
+def busy(seconds):
+    end = time.time() + seconds
+    while time.time() < end:
+        pass
+
+
+def idle(seconds):
+    # the sampling signal ends time.sleep early on Python 2
+    end = time.time() + seconds
+    while time.time() < end:
+        time.sleep(end - time.time())
+
+
+class SpikyDataset(FakeDataset):
+
+    """
+    Fake dataset with a slow, CPU bound call for gpi 13
+    """
+
+    def get_timeseries(self, gpi, date_start=None, date_end=None):
+        if gpi == 13:
+            busy(0.1)
+        return None
+
+
+def test_latency_threshold():
+    threshold = outliers.LatencyThreshold(absolute=0.5)
+    assert not threshold.is_outlier(0.4)
+    assert threshold.is_outlier(0.6)
+
+    threshold = outliers.LatencyThreshold(percentile=90, window=100,
+                                          min_calls=10, update_every=5)
+    assert not any(threshold.is_outlier(1.0) for i in range(9))
+    assert not threshold.is_outlier(1.0)
+    assert threshold.value == 1.0
+    assert threshold.is_outlier(5.0)
+
+
+def test_stack_sampler():
+    for timer, signum in [('real', signal.SIGALRM),
+                          ('prof', signal.SIGPROF)]:
+        sampler = outliers.StackSampler(interval=0.001, timer=timer)
+        handler = signal.getsignal(signum)
+        sampler.start()
+        start = time.time()
+        busy(0.1)
+        end = time.time()
+        sampler.stop()
+        assert signal.getsignal(signum) == handler
+        stacks = sampler.samples_between(start, end)
+        assert len(stacks) > 10
+        assert 'busy' in stacks[0][0]
+        assert sampler.samples_between(end + 1, end + 2) == []
+
+    with pytest.raises(ValueError):
+        outliers.StackSampler(timer='virtual')
+
+
+def test_stack_sampler_blocked():
+    sampler = outliers.StackSampler(interval=0.001)
+    assert sampler.timer == 'real'
+    sampler.start()
+    start = time.time()
+    idle(0.1)
+    end = time.time()
+    sampler.stop()
+    stacks = sampler.samples_between(start, end)
+    assert len(stacks) > 10
+    assert all('idle' in stack[0] for stack in stacks)
+
+
+def test_outlier_capture(tempdir):
+    capture = outliers.OutlierCapture(
+        'outliers.jsonl', threshold=outliers.LatencyThreshold(absolute=0.05),
+        sampler=outliers.StackSampler(interval=0.001))
+    std = test_cases.SelfTimingDataset(SpikyDataset(), outliers=capture)
+    with capture:
+        for gpi in [1, 13, 2]:
+            std.get_timeseries(gpi, date_end=None)
+    assert capture.n_outliers == 1
+    records = outliers.read_outlier_log('outliers.jsonl')
+    assert len(records) == 1
+    record = records[0]
+    assert record['function'] == 'get_timeseries'
+    assert record['duration'] >= 0.1
+    assert record['args'] == ['13']
+    assert record['kwargs'] == {'date_end': 'None'}
+    assert record['context']['gpi'] == 13
+    if std.io_counters:
+        assert set(record['io']) == set(test_cases.IO_COUNTERS)
+    assert any('busy' in stack[0] for stack in record['stacks'])
+
+
+def test_run_performance_tests_outliers(tempdir):
+    test_scripts.run_performance_tests('spiky', SpikyDataset(), '.',
+                                       gpi_list=range(1000),
+                                       gpi_read_perc=100.0,
+                                       outlier_log='outliers.jsonl',
+                                       outlier_threshold=0.05)
+    records = outliers.read_outlier_log('outliers.jsonl')
+    assert [record['context']['gpi'] for record in records] == [13]
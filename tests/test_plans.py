@@ -0,0 +1,119 @@
+# Copyright (c) 2026,Vienna University of Technology,
+# Department of Geodesy and Geoinformation
+# All rights reserved.
+
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL VIENNA UNIVERSITY OF TECHNOLOGY,
+# DEPARTMENT OF GEODESY AND GEOINFORMATION BE LIABLE FOR ANY
+# DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND
+# ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+'''
+Tests for the precomputed workload plans
+Created on Tue Nov  3 11:02:15 2026
+'''
+
+import datetime as dt
+
+import numpy as np
+import numpy.testing as nptest
+import pytest
+
+from smdc_perftests.performance_tests import plans
+from smdc_perftests.performance_tests import test_cases
+from smdc_perftests.performance_tests import test_scripts
+from smdc_perftests.performance_tests import workloads
+from smdc_perftests.performance_tests.test_cases import TestResults
+from .fixtures import tempdir
+from .test_test_cases import FakeDataset
+
+
+def test_plan_streams():
+    plan = plans.WorkloadPlan(seed=42)
+    gpi = plan.add('gpi', 1000, 10, runs=3)
+    assert gpi.shape == (3, 10)
+    # requests of a run are distinct
+    assert len(set(gpi[0])) == 10
+
+    other = plans.WorkloadPlan(seed=42)
+    other.add('date', 500, 20)
+    nptest.assert_array_equal(other.add('gpi', 1000, 10, runs=3), gpi)
+    assert not np.array_equal(plans.WorkloadPlan(seed=43).add(
+        'gpi', 1000, 10, runs=3), gpi)
+
+    nptest.assert_array_equal(plan.next_run('gpi'), gpi[0])
+    nptest.assert_array_equal(plan.next_run('gpi'), gpi[1])
+    nptest.assert_array_equal(plan.next_run('gpi'), gpi[2])
+    nptest.assert_array_equal(plan.next_run('gpi'), gpi[0])
+    plan.reset()
+    nptest.assert_array_equal(plan.next_run('gpi'), gpi[0])
+
+
+def test_plan_save_load(tempdir):
+    plan = plans.WorkloadPlan(seed=7)
+    plan.add('gpi', 1000, 10, runs=2)
+    plan.add('cell_date', 50, 5, replace=True)
+    plan.save('plan.npz')
+    loaded = plans.load_plan('plan.npz')
+    assert loaded.seed == 7
+    assert loaded.sizes == {'gpi': 1000, 'cell_date': 50}
+    assert sorted(loaded.indices) == ['cell_date', 'gpi']
+    for workload in plan.indices:
+        nptest.assert_array_equal(loaded.indices[workload],
+                                  plan.indices[workload])
+
+
+def test_driver_with_index():
+    fd = FakeDataset()
+    std = test_cases.SelfTimingDataset(fd)
+    test_cases.read_rand_ts_by_gpi_list(std, range(100, 200),
+                                        index=np.array([5, 3, 5]))
+    nptest.assert_array_equal(
+        std.context_measurements['get_timeseries']['gpi'], [105, 103, 105])
+
+
+def test_run_with_plan(tempdir):
+    dates = [[dt.datetime(2007, 1, 1) + dt.timedelta(days=i),
+              dt.datetime(2007, 2, 1) + dt.timedelta(days=i)]
+             for i in range(100)]
+    plan = plans.WorkloadPlan(seed=1)
+    test_scripts.run_performance_tests('first', FakeDataset(), '.',
+                                       gpi_list=range(1000),
+                                       date_range_list=dates,
+                                       cell_list=range(100),
+                                       cell_date_list=dates,
+                                       date_read_perc=10,
+                                       cell_read_perc=10,
+                                       repeats=2, plan=plan)
+    assert sorted(plan.indices) == ['cell', 'cell_date', 'date',
+                                    'date_range', 'gpi']
+    assert plan.indices['gpi'].shape == (2, 10)
+    plan.save('plan.npz')
+
+    test_scripts.run_performance_tests('second', FakeDataset(), '.',
+                                       gpi_list=range(1000),
+                                       repeats=2,
+                                       plan=plans.load_plan('plan.npz'))
+    first = TestResults('first_test-rand-gpi_detailed.nc')
+    second = TestResults('second_test-rand-gpi_detailed.nc')
+    nptest.assert_array_equal(first.columns['gpi'], second.columns['gpi'])
+    nptest.assert_array_equal(first.columns['gpi'],
+                              plan.indices['gpi'].ravel())
+    assert first.attrs['plan_seed'] == 1
+
+    # the plan does not fit a different gpi list
+    with pytest.raises(ValueError):
+        test_scripts.run_performance_tests('other', FakeDataset(), '.',
+                                           gpi_list=range(500),
+                                           plan=plans.load_plan('plan.npz'))
+
+    with pytest.raises(ValueError):
+        test_scripts.run_performance_tests(
+            'both', FakeDataset(), '.', gpi_list=range(1000), plan=plan,
+            gpi_sampler=workloads.zipf_sampler())
@@ -0,0 +1,65 @@
+# Copyright (c) 2026,Vienna University of Technology,
+# Department of Geodesy and Geoinformation
+# All rights reserved.
+
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL VIENNA UNIVERSITY OF TECHNOLOGY,
+# DEPARTMENT OF GEODESY AND GEOINFORMATION BE LIABLE FOR ANY
+# DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND
+# ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+'''
+Tests for the profiling of tests
+Created on Tue Oct 27 11:20:48 2026
+'''
+
+import os
+import glob
+import time
+
+from smdc_perftests.performance_tests import test_cases
+from smdc_perftests.performance_tests import test_scripts
+from smdc_perftests.performance_tests import profiling
+from .fixtures import tempdir
+from .test_test_cases import FakeDataset
+
+
+def test_measure_profile():
+    @test_cases.measure('profiled', runs=2, profile=True)
+    def test():
+        time.sleep(0.01)
+
+    res = test()
+    assert res.n == 2
+    sleep = [func for func in res.profile.stats if func[2] ==
+             "<time.sleep>"]
+    assert res.profile.stats[sleep[0]][1] == 2
+
+    @test_cases.measure('not_profiled', runs=1)
+    def test():
+        pass
+    assert test().profile is None
+
+
+def test_run_performance_tests_profile(tempdir):
+    test_scripts.run_performance_tests('prof', FakeDataset(), '.',
+                                       gpi_list=range(1000),
+                                       profile=True)
+    assert sorted(glob.glob('*.pstats')) == ['prof_test-rand-gpi.pstats']
+    assert len(glob.glob('*.nc')) == 2
+    assert os.path.exists('prof_hot_functions.txt')
+
+    table = profiling.hot_functions(['prof_test-rand-gpi.pstats'] * 2,
+                                    top=5)
+    assert len(table) == 5
+    assert table['tottime'].is_monotonic_decreasing
+    assert '<time.sleep>' in table.index
+    assert table.loc['<time.sleep>', 'ncalls'] == 20
+    assert table.loc['<time.sleep>', 'profiles'] == 2
+    assert table['percent'].sum() <= 100.0 + 1e-9
@@ -0,0 +1,120 @@
+# Copyright (c) 2026,Vienna University of Technology,
+# Department of Geodesy and Geoinformation
+# All rights reserved.
+
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL VIENNA UNIVERSITY OF TECHNOLOGY,
+# DEPARTMENT OF GEODESY AND GEOINFORMATION BE LIABLE FOR ANY
+# DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND
+# ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+'''
+Tests for the regression gate
+Created on Tue Oct 20 14:30:52 2026
+'''
+
+import os
+import numpy as np
+
+from smdc_perftests.performance_tests import regression
+from smdc_perftests.performance_tests.test_cases import TestResults
+from .fixtures import tempdir
+
+
+def write_run(run_dir, name, scales, seed):
+    os.mkdir(run_dir)
+    rng = np.random.RandomState(seed)
+    for workload, scale in scales.items():
+        values = scale * rng.lognormal(mean=-3, sigma=0.3, size=2000)
+        res = TestResults(values, '{}_{}'.format(name, workload))
+        res.to_nc(os.path.join(run_dir, res.name + '.nc'))
+
+
+def test_workload_key():
+    assert regression.workload_key(
+        'ESACCI-2Images_test-rand-gpi_detailed') == 'test-rand-gpi_detailed'
+    assert regression.workload_key('other') == 'other'
+
+
+def test_regression_gate(tempdir):
+    write_run('baseline', 'chunk-1', {'test-rand-gpi': 1.0,
+                                      'test-rand-avg-img': 1.0,
+                                      'test-rand-cells-data': 1.0}, 1)
+    write_run('faster', 'chunk-2', {'test-rand-gpi': 0.9,
+                                    'test-rand-avg-img': 1.0}, 2)
+    write_run('slower', 'chunk-3', {'test-rand-gpi': 1.2,
+                                    'test-rand-avg-img': 1.02}, 3)
+
+    # test-rand-cells-data only exists in the baseline
+    assert regression.main(['baseline', 'faster']) == 1
+    assert regression.main(['baseline', 'faster', '--allow-unpaired']) == 0
+    assert regression.main(['baseline', 'slower', '--allow-unpaired']) == 1
+    assert regression.main(['baseline', 'slower', '--allow-unpaired',
+                            '--threshold', '0.3']) == 0
+
+    table = regression.regression_table(
+        regression.load_directory('baseline'),
+        regression.load_directory('slower'))
+    assert list(table.index) == ['test-rand-avg-img', 'test-rand-gpi']
+    assert table.loc['test-rand-gpi', 'regression']
+    assert not table.loc['test-rand-avg-img', 'regression']
+    assert table.loc['test-rand-gpi', 'change_lower'] > 0.1
+
+
+def test_colliding_workload_keys(tempdir):
+    os.mkdir('baseline')
+    os.mkdir('candidate')
+    for run_dir, scale in [('baseline', 1.0), ('candidate', 1.5)]:
+        for name, chunk_scale in [('cci_chunk1', 1.0), ('cci_chunk2', 2.0)]:
+            res = TestResults(scale * chunk_scale * np.ones(10),
+                              '{}_test-rand-gpi'.format(name))
+            res.to_nc(os.path.join(run_dir, res.name + '.nc'))
+
+    baseline = regression.load_directory('baseline')
+    assert sorted(baseline) == ['chunk1_test-rand-gpi',
+                                'chunk2_test-rand-gpi']
+    table = regression.regression_table(
+        baseline, regression.load_directory('candidate'))
+    np.testing.assert_allclose(table['baseline_median'], [1, 2])
+    np.testing.assert_allclose(table['change'], [0.5, 0.5])
+
+
+def test_several_datasets_per_run(tempdir):
+    os.mkdir('baseline')
+    os.mkdir('candidate')
+    for run_dir, run, scale in [('baseline', 'v1', 1.0),
+                                ('candidate', 'v2', 1.5)]:
+        for dataset, ds_scale in [('cci', 1.0), ('ascat', 2.0)]:
+            for workload in ['test-rand-gpi', 'test-rand-avg-img']:
+                res = TestResults(scale * ds_scale * np.ones(10),
+                                  '{}_{}_{}'.format(run, dataset, workload))
+                res.to_nc(os.path.join(run_dir, res.name + '.nc'))
+
+    baseline = regression.load_directory('baseline')
+    candidate = regression.load_directory('candidate')
+    assert sorted(baseline) == sorted(candidate) == [
+        'ascat_test-rand-avg-img', 'ascat_test-rand-gpi',
+        'cci_test-rand-avg-img', 'cci_test-rand-gpi']
+    table = regression.regression_table(baseline, candidate)
+    np.testing.assert_allclose(table['baseline_median'], [2, 2, 1, 1])
+    np.testing.assert_allclose(table['change'], [0.5] * 4)
+    assert regression.main(['baseline', 'candidate']) == 1
+
+
+def test_gate_fails_closed(tempdir):
+    write_run('baseline', 'chunk-1', {'test-rand-gpi': 1.0}, 1)
+    write_run('other', 'chunk-2', {'test-rand-avg-img': 1.0}, 2)
+    write_run('candidate', 'chunk-3', {'test-rand-gpi': 1.0}, 3)
+
+    # nothing to compare
+    assert regression.main(['baseline', 'other']) == 1
+    assert regression.main(['baseline', 'other', '--allow-unpaired']) == 1
+    # too few measurements
+    assert regression.main(['baseline', 'candidate', '--min-n', '5000']) == 1
+    assert regression.main(['baseline', 'candidate']) == 0
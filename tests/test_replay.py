@@ -0,0 +1,85 @@
+# Copyright (c) 2026,Vienna University of Technology,
+# Department of Geodesy and Geoinformation
+# All rights reserved.
+
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL VIENNA UNIVERSITY OF TECHNOLOGY,
+# DEPARTMENT OF GEODESY AND GEOINFORMATION BE LIABLE FOR ANY
+# DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND
+# ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+'''
+Tests for the record and replay of access logs
+Created on Mon Nov  2 10:40:12 2026
+'''
+
+import time
+from datetime import datetime
+
+import pytest
+
+from smdc_perftests.performance_tests import replay
+from smdc_perftests.performance_tests import test_cases
+from .fixtures import tempdir
+from .test_test_cases import FakeDataset
+
+
+def test_record_and_read(tempdir):
+    with replay.AccessLog('access.jsonl') as log:
+        std = test_cases.SelfTimingDataset(FakeDataset(), access_log=log)
+        std.get_timeseries(12, date_end=datetime(2007, 1, 31))
+        std.get_avg_image(datetime(2007, 1, 1), datetime(2007, 1, 2))
+        std.get_data(datetime(2007, 1, 1), datetime(2007, 2, 1), 4)
+    entries = replay.read_access_log('access.jsonl')
+    assert [e['method'] for e in entries] == ['get_timeseries',
+                                              'get_avg_image', 'get_data']
+    assert entries[0]['args'] == [12]
+    assert entries[0]['kwargs'] == {'date_end': datetime(2007, 1, 31)}
+    assert entries[1]['args'] == [datetime(2007, 1, 1),
+                                  datetime(2007, 1, 2)]
+    assert entries[2]['args'][2] == 4
+    assert entries[0]['time'] <= entries[1]['time'] <= entries[2]['time']
+
+
+def test_replay_fast(tempdir):
+    with open('access.jsonl', 'w') as log:
+        log.write('{"time": 10, "method": "get_timeseries", "args": [1]}\n'
+                  '{"time": 5, "method": "get_timeseries", "args": [2]}\n'
+                  '{"time": 12, "method": "get_avg_image", '
+                  '"args": ["2007-01-01", "2007-01-05T12:00:00"]}\n')
+    fd = FakeDataset()
+    start = time.time()
+    results = replay.replay(fd, 'access.jsonl', name='layout-a')
+    assert time.time() - start < 1
+    assert sorted(results) == ['get_avg_image', 'get_timeseries']
+    ts = results['get_timeseries']
+    assert ts.name == 'layout-a_get_timeseries'
+    assert ts.n == 2
+    assert list(ts.columns['gpi']) == [2, 1]
+    assert ts.attrs['timing'] == 'fast'
+    assert results['get_avg_image'].n == 1
+    assert fd.ts_read == 2 and fd.img_read == 1
+
+
+def test_replay_original_timing():
+    entries = [{'time': 100.0 + 0.05 * i, 'method': 'get_timeseries',
+                'args': [i], 'kwargs': {}} for i in range(5)]
+    start = time.time()
+    results = replay.replay(FakeDataset(), entries, timing='original')
+    assert time.time() - start >= 0.2
+    res = results['get_timeseries']
+    assert res.n == 5
+    assert max(res.columns['lag']) < 0.05
+
+    start = time.time()
+    replay.replay(FakeDataset(), entries, timing='original', speed=10)
+    assert time.time() - start < 0.1
+
+    with pytest.raises(ValueError):
+        replay.replay(FakeDataset(), entries, timing='slow')
@@ -0,0 +1,101 @@
+# Copyright (c) 2026,Vienna University of Technology,
+# Department of Geodesy and Geoinformation
+# All rights reserved.
+
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL VIENNA UNIVERSITY OF TECHNOLOGY,
+# DEPARTMENT OF GEODESY AND GEOINFORMATION BE LIABLE FOR ANY
+# DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND
+# ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+'''
+Tests for the stage timers of the readers
+Created on Thu Oct 29 10:44:05 2026
+'''
+
+import time
+import threading
+
+from smdc_perftests import stages
+from smdc_perftests.performance_tests import test_cases
+from .test_test_cases import FakeDataset
+
+
+class StagedDataset(FakeDataset):
+
+    """
+    Fake dataset that marks stages like the readers
+    """
+
+    def get_timeseries(self, gpi, date_start=None, date_end=None):
+        time.sleep(0.01)
+        stages.mark('index_lookup')
+        time.sleep(0.02)
+        stages.mark('read')
+        if gpi == 2:
+            stages.mark('exact_time')
+        return None
+
+
+def test_mark_without_recorder():
+    assert stages.activate(None) is None
+    stages.mark('read')
+
+
+def test_marks_of_other_threads():
+    recorder = stages.StageRecorder()
+    recorder.begin()
+    previous = stages.activate(recorder)
+    try:
+        thread = threading.Thread(target=stages.mark, args=('read',))
+        thread.start()
+        thread.join()
+        assert recorder.durations == {}
+        stages.mark('read')
+        assert list(recorder.durations) == ['read']
+    finally:
+        stages.activate(previous)
+
+
+def test_stage_recorder():
+    recorder = stages.StageRecorder()
+    recorder.begin()
+    recorder.mark('read')
+    time.sleep(0.01)
+    recorder.mark('read')
+    assert recorder.durations['read'] >= 0.01
+    recorder.begin()
+    assert recorder.durations == {}
+
+
+def test_self_timing_dataset_stages():
+    std = test_cases.SelfTimingDataset(StagedDataset(), stage_timers=True)
+    std.get_timeseries(1)
+    std.get_timeseries(2)
+    std.get_timeseries(3)
+    measured = std.stage_measurements['get_timeseries']
+    assert sorted(measured) == ['exact_time', 'index_lookup', 'read']
+    assert min(measured['index_lookup']) >= 0.009
+    assert min(measured['read']) >= 0.019
+    assert list(measured['exact_time'])[0] == 0.0
+    assert list(measured['exact_time'])[2] == 0.0
+    for durations in measured.values():
+        assert len(durations) == 3
+    for i, total in enumerate(std.measurements['get_timeseries']):
+        assert sum(d[i] for d in measured.values()) <= total
+    columns = std.columns('get_timeseries')
+    assert 'stage_read' in columns
+    res = test_cases.TestResults(std.measurements['get_timeseries'],
+                                 'stages', columns=columns)
+    assert len(res.columns['stage_read']) == 3
+    assert stages._active.recorder is None
+
+    std = test_cases.SelfTimingDataset(StagedDataset())
+    std.get_timeseries(1)
+    assert std.stage_measurements['get_timeseries'] == {}
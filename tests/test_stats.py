@@ -0,0 +1,129 @@
+# Copyright (c) 2026,Vienna University of Technology,
+# Department of Geodesy and Geoinformation
+# All rights reserved.
+
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL VIENNA UNIVERSITY OF TECHNOLOGY,
+# DEPARTMENT OF GEODESY AND GEOINFORMATION BE LIABLE FOR ANY
+# DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND
+# ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+'''
+Tests for the streaming statistics
+Created on Mon Oct 19 11:02:45 2026
+'''
+
+import numpy as np
+import numpy.testing as nptest
+import pytest
+
+from smdc_perftests.performance_tests import stats
+
+
+def test_running_stats():
+    values = np.random.RandomState(1).lognormal(size=1000)
+    rs = stats.RunningStats()
+    for v in values[:500]:
+        rs.add(v)
+    rs.add_many(values[500:])
+    assert rs.n == 1000
+    nptest.assert_almost_equal(rs.mean, values.mean())
+    nptest.assert_almost_equal(rs.var(ddof=1), values.var(ddof=1))
+    nptest.assert_almost_equal(rs.total, values.sum())
+    assert rs.min == values.min()
+    assert rs.max == values.max()
+
+
+def test_running_stats_merge():
+    values = np.random.RandomState(2).normal(size=100)
+    rs1 = stats.RunningStats()
+    rs1.add_many(values[:30])
+    rs2 = stats.RunningStats()
+    rs2.add_many(values[30:])
+    merged = rs1.merge(rs2)
+    assert merged.n == 100
+    nptest.assert_almost_equal(merged.mean, values.mean())
+    nptest.assert_almost_equal(merged.var(ddof=0), values.var())
+    assert np.isnan(stats.RunningStats().var())
+
+
+def test_tdigest_quantiles():
+    values = np.random.RandomState(3).lognormal(size=100000)
+    digest = stats.TDigest()
+    for v in values[:5000]:
+        digest.add(v)
+    digest.add_many(values[5000:])
+    assert digest.n == 100000
+    # constant memory
+    assert digest.means.size <= digest.compression
+    for q in [0.5, 0.9, 0.99]:
+        exact = np.percentile(values, q * 100)
+        nptest.assert_allclose(digest.quantile(q), exact, rtol=0.01)
+    # the error in the far tail is small in terms of rank
+    for q in [0.999, 0.9999]:
+        rank = np.mean(values <= digest.quantile(q))
+        assert abs(rank - q) < 0.0005
+    assert digest.quantile(0) == values.min()
+    assert digest.quantile(1) == values.max()
+
+
+def test_tdigest_merge():
+    values = np.random.RandomState(4).exponential(size=20000)
+    d1 = stats.TDigest()
+    d1.add_many(values[:5000])
+    d2 = stats.TDigest()
+    d2.add_many(values[5000:])
+    merged = d1.merge(d2)
+    assert merged.n == 20000
+    nptest.assert_allclose(merged.quantile(0.99),
+                           np.percentile(values, 99), rtol=0.02)
+    assert np.isnan(stats.TDigest().quantile(0.5))
+
+
+def test_log_histogram_percentiles():
+    values = np.random.RandomState(6).lognormal(mean=-4, size=100000)
+    hist = stats.LogHistogram(precision=0.01)
+    for v in values[:1000]:
+        hist.add(v)
+    hist.add_many(values[1000:])
+    assert hist.n == 100000
+    for q in [50, 95, 99, 99.9, 99.99]:
+        exact = np.percentile(values, q)
+        nptest.assert_allclose(hist.percentile(q), exact, rtol=0.01)
+    assert hist.percentile(100) == values.max()
+
+
+def test_log_histogram_out_of_range():
+    hist = stats.LogHistogram(lowest=1e-3, highest=1.0)
+    hist.add_many([1e-5, 0, 0.5, 10])
+    assert hist.counts[0] == 2
+    assert hist.counts[-1] == 1
+    assert hist.percentile(0) == 0
+    assert hist.percentile(100) == 10
+
+
+def test_log_histogram_merge_and_sparse():
+    values = np.random.RandomState(7).exponential(size=1000)
+    h1 = stats.LogHistogram()
+    h1.add_many(values[:400])
+    h2 = stats.LogHistogram()
+    h2.add_many(values[400:])
+    merged = h1.merge(h2)
+    full = stats.LogHistogram()
+    full.add_many(values)
+    nptest.assert_array_equal(merged.counts, full.counts)
+
+    index, counts = merged.to_sparse()
+    restored = stats.LogHistogram.from_sparse(index, counts,
+                                              merged.min, merged.max)
+    nptest.assert_array_equal(restored.counts, full.counts)
+    assert restored.percentile(99) == full.percentile(99)
+
+    with pytest.raises(ValueError):
+        h1.merge(stats.LogHistogram(precision=0.05))
@@ -0,0 +1,121 @@
+# Copyright (c) 2026,Vienna University of Technology,
+# Department of Geodesy and Geoinformation
+# All rights reserved.
+
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL VIENNA UNIVERSITY OF TECHNOLOGY,
+# DEPARTMENT OF GEODESY AND GEOINFORMATION BE LIABLE FOR ANY
+# DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND
+# ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+'''
+Tests for the SQLite results store
+Created on Wed Oct 21 10:12:40 2026
+'''
+
+import numpy as np
+import pytest
+import numpy.testing as nptest
+
+from smdc_perftests.performance_tests.store import ResultsStore
+from smdc_perftests.performance_tests.test_cases import TestResults
+from smdc_perftests.performance_tests import analyze
+from smdc_perftests.performance_tests import regression
+from .fixtures import tempdir
+
+
+def test_store_roundtrip(tempdir):
+    res = TestResults([0.1, 0.2, 0.4], 'run-1_test-rand-gpi_detailed',
+                      columns={'read_bytes': [10, 20, 40]},
+                      attrs={'cache_mode': 'cold', 'repeats': np.int64(3)})
+    with ResultsStore('results.sqlite') as store:
+        store.add_results(res, run='run-1')
+    with ResultsStore('results.sqlite') as store:
+        loaded = store.load(res.name)
+        assert store.names(run='run-1') == [res.name]
+        assert store.names(run='run-2') == []
+    nptest.assert_allclose(loaded.measurements, res.measurements)
+    nptest.assert_array_equal(loaded.columns['read_bytes'], [10, 20, 40])
+    assert loaded.columns['read_bytes'].dtype.kind == 'i'
+    assert loaded.attrs == {'cache_mode': 'cold', 'repeats': 3}
+    assert loaded.mean == res.mean
+
+
+def test_store_replace_and_summary(tempdir):
+    with ResultsStore('results.sqlite') as store:
+        store.add_results(TestResults([1, 2], 'a_test-rand-gpi'), run='a')
+        store.add_results(TestResults([1, 2, 3], 'a_test-rand-gpi'), run='a')
+        store.add_results(TestResults([4, 6], 'b_test-rand-gpi'), run='b')
+        summary = store.summary()
+        assert list(summary.index) == ['a_test-rand-gpi', 'b_test-rand-gpi']
+        assert list(summary['run']) == ['a', 'b']
+        assert list(summary['workload']) == ['test-rand-gpi'] * 2
+        nptest.assert_allclose(summary['mean'], [2, 5])
+        nptest.assert_allclose(summary['n'], [3, 2])
+        nptest.assert_allclose(summary['max'], [3, 6])
+        assert len(store.summary(run='b')) == 1
+        assert len(store.load('a_test-rand-gpi').measurements) == 3
+
+        df = analyze.prep_results(store)
+        nptest.assert_allclose(df['means'], [2, 5])
+
+
+def test_import_nc_and_regression_gate(tempdir):
+    rng = np.random.RandomState(0)
+    fnames = []
+    for run, scale in [('base', 1.0), ('slow', 1.3)]:
+        res = TestResults(scale * rng.lognormal(-3, 0.3, size=500),
+                          '{}_test-rand-gpi'.format(run))
+        fname = res.name + '.nc'
+        res.to_nc(fname)
+        fnames.append((run, fname))
+    with ResultsStore('results.sqlite') as store:
+        for run, fname in fnames:
+            store.import_nc([fname], run=run)
+        assert len(store.load('base_test-rand-gpi').measurements) == 500
+
+    assert regression.main(['base', 'slow', '--store',
+                            'results.sqlite']) == 1
+    assert regression.main(['slow', 'base', '--store',
+                            'results.sqlite']) == 0
+
+
+def test_same_names_in_several_runs(tempdir):
+    with ResultsStore('results.sqlite') as store:
+        for run, scale in [('baseline', 1.0), ('candidate', 1.5)]:
+            for name, chunk_scale in [('cci_chunk1', 1.0),
+                                      ('cci_chunk2', 2.0)]:
+                store.add_results(
+                    TestResults(scale * chunk_scale * np.ones(10),
+                                '{}_test-rand-gpi'.format(name)), run=run)
+        names = ['cci_chunk1_test-rand-gpi', 'cci_chunk2_test-rand-gpi']
+        assert store.names(run='baseline') == names
+        assert store.names(run='candidate') == names
+        assert store.load(names[0], run='candidate').mean == 1.5
+        with pytest.raises(ValueError):
+            store.load(names[0])
+
+        baseline = regression.load_run(store, 'baseline')
+        assert sorted(baseline) == ['chunk1_test-rand-gpi',
+                                    'chunk2_test-rand-gpi']
+        table = regression.regression_table(
+            baseline, regression.load_run(store, 'candidate'))
+        nptest.assert_allclose(table['change'], [0.5, 0.5])
+
+
+def test_prep_results_from_files(tempdir):
+    fnames = []
+    for i in range(20):
+        res = TestResults([i, i + 2.0], 'chunk-{}_test-rand-gpi'.format(i))
+        res.to_nc(res.name + '.nc')
+        fnames.append(res.name + '.nc')
+    df = analyze.prep_results(fnames, n_processes=4)
+    assert list(df.index) == ['chunk-{}_test-rand-gpi'.format(i)
+                              for i in range(20)]
+    nptest.assert_allclose(df['means'], np.arange(20) + 1)
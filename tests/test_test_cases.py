@@ -39,6 +39,9 @@ import datetime as dt
 import time
 import math
 import pytest
+import numpy as np
+import numpy.testing as nptest
+import netCDF4
 from .fixtures import tempdir
 
 
@@ -354,5 +357,293 @@ def test_run_rand_by_cell_list_self_timing_max_runtime():
     results = test()
     assert std.cells_read == 12
     assert len(std.measurements['get_data']) == std.cells_read
+
+
+def test_read_proc_io():
+    """
+    The counters are only available on linux, if they are
+    they have to be integers.
+    """
+    counters = test_cases.read_proc_io()
+    if counters is not None:
+        for counter in test_cases.IO_COUNTERS:
+            assert type(counters[counter]) in (int, long)
+    assert test_cases.read_proc_io("/not/existing") is None
+
+
+def test_self_timing_dataset_io_counters():
+    fd = FakeDataset()
+    std = test_cases.SelfTimingDataset(fd)
+    std.get_timeseries(12)
+    std.get_timeseries(13)
+    io = std.io_measurements['get_timeseries']
+    if std.io_counters:
+        for counter in test_cases.IO_COUNTERS:
+            assert len(io[counter]) == 2
+            assert min(io[counter]) >= 0
+    else:
+        assert io == {}
+
+    std = test_cases.SelfTimingDataset(fd, io_counters=False)
+    std.get_timeseries(12)
+    assert std.io_measurements['get_timeseries'] == {}
+
+
+class TimeAxisDataset(FakeDataset):
+
+    """
+    Fake dataset with a daily netCDF time axis like the
+    readers in smdc_perftests.datasets
+    """
+
+    def __init__(self, fname):
+        super(TimeAxisDataset, self).__init__()
+        with netCDF4.Dataset(fname, mode='w') as ncdata:
+            ncdata.createDimension('time', 365)
+            time_var = ncdata.createVariable('time', 'f8', ('time',))
+            time_var.units = 'days since 2007-01-01'
+            time_var[:] = np.arange(365)
+        self.ds = netCDF4.Dataset(fname)
+        self.time_var = 'time'
+
+
+def test_self_timing_dataset_context(tempdir):
+    std = test_cases.SelfTimingDataset(TimeAxisDataset("time.nc"))
+    assert std.get_timeseries(12) is None
+    std.get_timeseries(13, dt.datetime(2007, 1, 11), dt.datetime(2007, 1, 20))
+    std.get_avg_image(dt.datetime(2007, 2, 1), dt.datetime(2007, 12, 31))
+    std.get_avg_image(dt.datetime(2007, 2, 1))
+    std.get_data(dt.datetime(2007, 1, 1), dt.datetime(2007, 1, 2), 4)
+    ts = std.columns('get_timeseries')
+    assert list(ts['gpi']) == [12, 13]
+    assert list(ts['cell']) == [-1, -1]
+    assert list(ts['start_index']) == [0, 10]
+    # the end date of a time series is not read
+    assert list(ts['end_index']) == [364, 18]
+    assert list(ts['n_timesteps']) == [365, 9]
+    img = std.context_measurements['get_avg_image']
+    assert list(img['n_timesteps']) == [334, 1]
+    data = std.context_measurements['get_data']
+    assert list(data['cell']) == [4]
+    assert list(data['n_timesteps']) == [2]
+
+    res = test_cases.TestResults(std.measurements['get_timeseries'],
+                                 'context',
+                                 columns=std.columns('get_timeseries'))
+    res.to_nc("test.nc")
+    res2 = test_cases.TestResults("test.nc")
+    assert list(res2.columns['n_timesteps']) == [365, 9]
+
+    # images of a whole day like ASCAT_netcdf.get_avg_image
+    dataset = TimeAxisDataset("time2.nc")
+    dataset.image_span = dt.timedelta(days=1)
+    std = test_cases.SelfTimingDataset(dataset)
+    std.get_avg_image(dt.datetime(2007, 2, 1))
+    std.get_timeseries(12, dt.datetime(2007, 12, 1))
+    img = std.context_measurements['get_avg_image']
+    assert list(img['end_index']) == [32]
+    assert list(img['n_timesteps']) == [2]
+    ts = std.context_measurements['get_timeseries']
+    assert list(ts['n_timesteps']) == [31]
+
+    std = test_cases.SelfTimingDataset(FakeDataset(), context=False)
+    std.get_timeseries(12)
+    assert std.context_measurements['get_timeseries'] == {}
+    std = test_cases.SelfTimingDataset(FakeDataset())
+    std.get_timeseries(12)
+    assert list(std.context_measurements['get_timeseries']['gpi']) == [12]
+    assert list(
+        std.context_measurements['get_timeseries']['n_timesteps']) == [-1]
+
+
+def test_io_summary(tempdir):
+    columns = {'read_bytes': [1e6, 0],
+               'rchar': [2e6, 2e6],
+               'syscr': [3, 5]}
+    res = test_cases.TestResults([1.0, 1.0], 'io', columns=columns)
+    summary = res.io_summary()
+    assert summary['disk_mb_per_s'] == 0.5
+    assert summary['read_mb_per_s'] == 2.0
+    assert summary['syscalls_per_request'] == 4
+    res.to_nc("test.nc")
+
+    res2 = test_cases.TestResults("test.nc")
+    assert list(res2.columns['syscr']) == [3, 5]
+    assert res2.io_summary() == summary
+
+    assert test_cases.TestResults([1.0], 'no_io').io_summary() == {}
+    with pytest.raises(ValueError):
+        test_cases.TestResults([1.0], 'wrong', columns={'syscr': [1, 2]})
+
+
+def test_measure_setup_and_before_call():
+    """
+    setup and before_call hooks are called but not timed
+    """
+    calls = []
+
+    def slow_setup():
+        calls.append('setup')
+        time.sleep(0.1)
+
+    def slow_before_call():
+        calls.append('before')
+        time.sleep(0.1)
+
+    fd = FakeDataset()
+    std = test_cases.SelfTimingDataset(fd, before_call=slow_before_call)
+
+    @test_cases.measure('test_setup', runs=2, setup=slow_setup)
+    def test():
+        std.get_timeseries(1)
+
+    results = test()
+    assert calls == ['setup', 'before', 'setup', 'before']
+    # before_call is part of the run but not of the call
+    assert results.total < 0.3
+    assert sum(std.measurements['get_timeseries']) < 0.1
+
+
+def test_measure_warmup():
+    """
+    warmup runs are not part of the statistics
+    """
+    fd = FakeDataset()
+    std = test_cases.SelfTimingDataset(fd)
+
+    @test_cases.measure('test_warmup', runs=3, warmup=2,
+                        after_warmup=std.reset)
+    def test():
+        std.get_timeseries(1)
+
+    results = test()
+    assert results.n == 3
+    assert fd.ts_read == 5
+    assert len(std.measurements['get_timeseries']) == 3
+    assert results.attrs['warmup'] == 2
+    assert results.attrs['stop_reason'] == 'max_runs'
+
+
+def test_measure_ci_target():
+    """
+    constant runtimes give a tight confidence interval
+    so the measurement should stop after min_runs
+    """
+    @test_cases.measure('test_ci', max_runs=50, min_runs=3, ci_target=0.5)
+    def test():
+        time.sleep(0.01)
+
+    results = test()
+    assert results.n == 3
+    assert results.attrs['stop_reason'] == 'ci_target'
+
+
+def test_measure_time_budget():
+    @test_cases.measure('test_budget', max_runs=100, time_budget=0.2)
+    def test():
+        time.sleep(0.05)
+
+    results = test()
+    assert 2 <= results.n <= 5
+    assert results.attrs['stop_reason'] == 'time_budget'
+
+
+def test_streaming_results(tempdir):
+    """
+    appending measurements updates the statistics and
+    spilled raw measurements are kept on disk
+    """
+    values = np.random.RandomState(5).lognormal(size=2500)
+    res = test_cases.TestResults([], 'stream', columns={'gpi': []},
+                                 spill_file="spill.bin", buffer_size=1000)
+    for i, v in enumerate(values[:1500]):
+        res.append(v, gpi=i)
+    res.extend(values[1500:], columns={'gpi': range(1500, 2500)})
+    assert res.n == 2500
+    assert len(res._measurements) < 1000
+    nptest.assert_almost_equal(res.mean, values.mean())
+    nptest.assert_almost_equal(res.var, values.var(ddof=1))
+    nptest.assert_allclose(res.median, np.median(values), rtol=0.02)
+    nptest.assert_array_equal(res.measurements, values)
+    nptest.assert_array_equal(res.columns['gpi'], np.arange(2500))
+    with pytest.raises(ValueError):
+        res.append(1.0)
+
+    res.to_nc("test.nc")
+    res2 = test_cases.TestResults("test.nc")
+    nptest.assert_array_equal(res2.measurements, values)
+    nptest.assert_array_equal(res2.columns['gpi'], np.arange(2500))
+    assert res2.median == np.median(values)
+
+    # a new result overwrites the old spill file
+    res3 = test_cases.TestResults([5, 6, 7], 'stream',
+                                  spill_file="spill.bin", buffer_size=2)
+    assert res3.n == 3
+    nptest.assert_array_equal(res3.measurements, [5, 6, 7])
+
+
+def test_tail_percentiles(tempdir):
+    values = np.random.RandomState(8).lognormal(mean=-3, size=5000)
+    res = test_cases.TestResults(values, 'tail')
+    nptest.assert_allclose(res.p99, np.percentile(values, 99), rtol=0.01)
+    nptest.assert_allclose(res.p999, np.percentile(values, 99.9), rtol=0.01)
+    assert 'p99.9' in str(res)
+    res.to_nc("test.nc")
+    res2 = test_cases.TestResults("test.nc")
+    nptest.assert_array_equal(res2.histogram.counts, res.histogram.counts)
+    assert res2.p95 == res.p95
+
+
+def test_merge_results():
+    values = np.random.RandomState(9).lognormal(size=3000)
+    res1 = test_cases.TestResults(values[:1000], 'shard',
+                                  columns={'gpi': range(1000)},
+                                  attrs={'cache_mode': 'cold',
+                                         'stop_reason': 'max_runs'})
+    res2 = test_cases.TestResults(values[1000:2000], 'shard',
+                                  columns={'gpi': range(1000, 2000),
+                                           'syscr': range(1000)},
+                                  attrs={'cache_mode': 'cold',
+                                         'stop_reason': 'ci_target'})
+    res3 = test_cases.TestResults(values[2000:], 'shard')
+    full = test_cases.TestResults(values, 'full')
+
+    merged = res1 + res2
+    assert merged.n == 2000
+    nptest.assert_array_equal(merged.columns['gpi'], np.arange(2000))
+    assert 'syscr' not in merged.columns
+    assert merged.attrs == {'cache_mode': 'cold', 'n_merged': 2}
+
+    merged = sum([res1, res2, res3])
+    assert merged.name == 'shard'
+    assert merged.attrs['n_merged'] == 3
+    assert merged.n == full.n
+    nptest.assert_almost_equal(merged.mean, full.mean)
+    nptest.assert_almost_equal(merged.var, full.var)
+    assert merged.median == full.median
+    nptest.assert_array_equal(merged.histogram.counts, full.histogram.counts)
+
+
+def test_attrs_to_netcdf(tempdir):
+    res = test_cases.TestResults([1.0, 2.0], 'attrs',
+                                 attrs={'cache_mode': 'cold'})
+    res.to_nc("test.nc")
+    res2 = test_cases.TestResults("test.nc")
+    assert res2.attrs == {'cache_mode': 'cold'}
+
+
+def test_load_summary(tempdir):
+    res = test_cases.TestResults([1.0, 2.0, 6.0], 'summary',
+                                 attrs={'cache_mode': 'cold'})
+    res.to_nc("test.nc")
+    summary = test_cases.load_summary("test.nc")
+    assert summary['name'] == 'summary'
+    assert summary['attrs'] == {'cache_mode': 'cold'}
+    assert summary['n'] == 3
+    for stat in test_cases.SUMMARY_STATS:
+        nptest.assert_allclose(summary[stat], res.summary()[stat])
+    nptest.assert_allclose([summary['mean'], summary['median'],
+                            summary['max']], [3, 2, 6])
+
 if __name__ == '__main__':
     test_self_timing_dataset()
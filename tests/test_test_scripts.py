@@ -24,9 +24,15 @@ Created on Tue Apr  7 14:32:23 2015
 
 import os
 import glob
+import time
+import pytest
+import numpy as np
+from pygeogrids import grids
 
 from datetime import datetime
 from smdc_perftests.performance_tests import test_scripts
+from smdc_perftests.performance_tests.test_cases import TestResults
+from smdc_perftests.performance_tests.store import ResultsStore
 from smdc_perftests.datasets.esa_cci import ESACCI_netcdf
 from smdc_perftests import helper
 
@@ -102,3 +108,111 @@ def test_cci_test_runner(tempdir):
 
 def test_equi7_test_runner(tempdir):
     run_test_for_dataset(test_scripts.run_equi7_tests, 'equi7-test')
+
+
+def test_cache_modes(tempdir):
+    with open("data.bin", "wb") as f:
+        f.write(b"0" * 100000)
+    gpi_list = range(1000)
+    for mode, scope in [('cold', 'run'), ('warm', 'call')]:
+        test_scripts.run_performance_tests(mode, FakeDataset(), ".",
+                                           gpi_list=gpi_list,
+                                           cache_mode=mode,
+                                           cache_scope=scope,
+                                           cache_files=["data.bin"])
+        for fname in ["{}_test-rand-gpi.nc", "{}_test-rand-gpi_detailed.nc"]:
+            res = TestResults(fname.format(mode))
+            assert res.attrs['cache_mode'] == mode
+            assert res.attrs['cache_scope'] == scope
+    with pytest.raises(ValueError):
+        test_scripts.run_performance_tests('wrong', FakeDataset(), ".",
+                                           cache_mode='cold',
+                                           cache_scope='test')
+    fd = FakeDataset()
+    with pytest.raises(ValueError):
+        test_scripts.run_performance_tests('wrong', fd, ".",
+                                           gpi_list=gpi_list,
+                                           cache_mode='lukewarm')
+    # no test ran before the error
+    assert fd.ts_read == 0
+
+
+def test_adaptive_repeats(tempdir):
+    fd = FakeDataset()
+    test_scripts.run_performance_tests('adaptive', fd, ".",
+                                       gpi_list=range(1000),
+                                       repeats=20, warmup=1,
+                                       ci_target=0.5, min_repeats=3)
+    res = TestResults("adaptive_test-rand-gpi.nc")
+    detailed = TestResults("adaptive_test-rand-gpi_detailed.nc")
+    assert res.attrs['stop_reason'] == 'ci_target'
+    assert fd.ts_read == (res.n + 1) * 10
+    # the calls of the warmup run are not in the detailed results
+    assert detailed.n == res.n * 10
+
+
+def test_results_store(tempdir):
+    with ResultsStore("results.sqlite") as store:
+        test_scripts.run_performance_tests('stored', FakeDataset(), None,
+                                           gpi_list=range(1000),
+                                           store=store)
+        assert store.names(run='stored') == [
+            'stored_test-rand-gpi', 'stored_test-rand-gpi_detailed']
+        detailed = store.load('stored_test-rand-gpi_detailed')
+        assert detailed.n == 10
+        assert detailed.attrs['cache_mode'] == 'None'
+    assert glob.glob("*.nc") == []
+
+
+def test_bulk_extraction(tempdir):
+    fd = FakeDataset()
+    grid = grids.BasicGrid(np.arange(0, 10, 0.1),
+                           np.zeros(100)).to_cell_grid(5.)
+    res = test_scripts.run_bulk_extraction('bulk', fd, ".", range(100),
+                                           grid=grid)
+    assert fd.ts_read == 100
+    assert res.attrs['complete'] == 1
+    assert res.attrs['series_per_s'] > 0
+    assert sorted(res.columns['gpi']) == range(100)
+    # gpis are read cell by cell
+    cells = grid.gpi2cell(res.columns['gpi'])
+    assert np.count_nonzero(np.diff(cells)) == 1
+    loaded = TestResults("bulk_bulk-extraction.nc")
+    assert loaded.attrs['n_series'] == 100
+
+    res = test_scripts.run_bulk_extraction('cells', FakeDataset(), ".",
+                                           range(100), grid=grid,
+                                           cell_list=[grid.gpi2cell(0)])
+    assert res.attrs['n_series'] == 50
+
+    slow = FakeDataset(sleep_time=0.01)
+    res = test_scripts.run_bulk_extraction('budget', slow, ".",
+                                           range(1000), block_size=10,
+                                           time_budget=0.2)
+    assert res.attrs['complete'] == 0
+    assert res.n < 1000
+    assert res.attrs['projected_time'] > 1
+
+
+def test_bulk_extraction_parallel(tempdir):
+    res = test_scripts.run_bulk_extraction('parallel', None, ".",
+                                           range(200), block_size=20,
+                                           n_processes=2,
+                                           dataset_factory=FakeDataset)
+    assert res.n == 200
+    assert sorted(res.columns['gpi']) == range(200)
+    with pytest.raises(ValueError):
+        test_scripts.run_bulk_extraction('parallel', None, ".",
+                                         range(200), n_processes=2)
+
+
+def test_image_iteration(tempdir):
+    fd = FakeDataset(sleep_time=0.005)
+    loop, prefetched = test_scripts.run_image_iteration_tests(
+        'images', fd, ".", datetime(2007, 1, 1), datetime(2007, 1, 20),
+        process=lambda img: time.sleep(0.005), repeats=2)
+    assert fd.img_read == 2 * 2 * 20
+    assert prefetched.attrs['prefetch'] == 2
+    assert prefetched.attrs['speedup'] > 1.2
+    loaded = TestResults("images_test-image-loop.nc")
+    assert loaded.attrs['n_images'] == 20
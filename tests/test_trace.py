@@ -0,0 +1,83 @@
+# Copyright (c) 2026,Vienna University of Technology,
+# Department of Geodesy and Geoinformation
+# All rights reserved.
+
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL VIENNA UNIVERSITY OF TECHNOLOGY,
+# DEPARTMENT OF GEODESY AND GEOINFORMATION BE LIABLE FOR ANY
+# DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND
+# ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+'''
+Tests for the timeline traces
+Created on Mon Oct 26 10:37:15 2026
+'''
+
+import json
+
+from smdc_perftests.performance_tests import test_cases
+from smdc_perftests.performance_tests import test_scripts
+from smdc_perftests.performance_tests.trace import TraceRecorder
+from .fixtures import tempdir
+from .test_test_cases import FakeDataset
+
+
+def test_trace_recorder(tempdir):
+    trace = TraceRecorder('bench')
+    start = trace.origin
+    trace.workload = 'test-a'
+    trace.add('get_timeseries', start + 1, start + 1.5, args={'gpi': 3})
+    trace.workload = None
+    trace.add('run', start, start + 2, cat='run')
+    assert len(trace) == 2
+    trace.write('trace.json')
+    with open('trace.json') as trace_file:
+        events = json.load(trace_file)['traceEvents']
+    assert events[0]['ph'] == 'M'
+    assert events[0]['args'] == {'name': 'bench'}
+    call = events[1]
+    assert call['ph'] == 'X'
+    assert call['ts'] == 1e6
+    assert call['dur'] == 5e5
+    assert call['args'] == {'workload': 'test-a', 'gpi': 3}
+    assert events[2]['args'] == {}
+
+
+def test_traced_measure():
+    trace = TraceRecorder()
+    std = test_cases.SelfTimingDataset(FakeDataset(), trace=trace)
+
+    @test_cases.measure('traced', runs=3, warmup=1, trace=trace)
+    def test():
+        std.get_timeseries(5)
+        std.get_timeseries(6)
+
+    test()
+    events = trace.events()
+    assert [e['cat'] for e in events].count('call') == 8
+    assert [e['name'] for e in events if e['cat'] != 'call'] == \
+        ['warmup', 'run', 'run', 'run', 'traced']
+    test_span = events[-1]
+    for event in events[:-1]:
+        assert event['args']['workload'] == 'traced'
+        assert event['ts'] >= test_span['ts']
+        assert event['ts'] + event['dur'] <= \
+            test_span['ts'] + test_span['dur'] + 1e-3
+    assert events[0]['args']['gpi'] == 5
+
+
+def test_run_performance_tests_trace(tempdir):
+    test_scripts.run_performance_tests('traced', FakeDataset(), '.',
+                                       gpi_list=range(1000),
+                                       trace_file='trace.json')
+    with open('trace.json') as trace_file:
+        events = json.load(trace_file)['traceEvents']
+    tests = [e for e in events if e.get('cat') == 'test']
+    assert [e['name'] for e in tests] == ['traced_test-rand-gpi']
+    assert len([e for e in events if e.get('cat') == 'call']) == 10
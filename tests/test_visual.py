@@ -36,6 +36,9 @@ Created on Tue Nov 25 14:06:48 2014
 import smdc_perftests.visual as vis
 import smdc_perftests.performance_tests.test_cases as test_cases
 import matplotlib.pyplot as plt
+import numpy as np
+import numpy.testing as nptest
+from pygeogrids import grids
 
 
 def test_boxplots():
@@ -51,3 +54,68 @@ def test_boxplots():
     fig, axes = vis.plot_boxplots(
         res1, res2, res3, conf_level=50, figsize=(5, 3), dpi=150)
     plt.show()
+
+    fig, axes = vis.plot_boxplots(
+        res1, res2, res3, tail_percentiles=[95, 99, 99.9])
+    plt.close(fig)
+
+
+def test_tail_percentiles():
+    list1 = [5.8, 6.3, 6.2, 5.2, 4.3, 6.1, 4.2, 5.5]
+    list2 = [6.7, 8.3, 9.4, 7.3, 8.5]
+
+    res1 = test_cases.TestResults(list1, 'list1')
+    res2 = test_cases.TestResults(list2, 'list2')
+
+    fig, axes = vis.plot_tail_percentiles(res1, res2,
+                                          percentiles=[50, 99])
+    assert len(axes.lines) == 2
+    plt.close(fig)
+
+
+def test_latency_map():
+    lons, lats = np.meshgrid(np.arange(-179.5, 180, 1.),
+                             np.arange(89.5, -90, -1.))
+    grid = grids.BasicGrid(lons.ravel(), lats.ravel())
+    gpis = np.array([0, 1, 2, 3, 400, 64799, -1])
+    latency = [1.0, 3.0, 2.0, 10.0, 5.0, 7.0, 100.0]
+    res = test_cases.TestResults(latency, 'map', columns={'gpi': gpis})
+
+    x_edges, y_edges, values = vis.latency_grid(res, grid)
+    assert values.shape == (len(y_edges) - 1, len(x_edges) - 1)
+    assert values.shape == (36, 72)
+    # gpis 0-3 are in the top left cell, 400 is at -139.5 E 88.5 N
+    nptest.assert_allclose(values[-1, 0], 4.0)
+    assert values[-1, 8] == 5.0
+    assert values[0, -1] == 7.0
+    assert np.isnan(values[10, 10])
+    nptest.assert_allclose(vis.latency_grid(res, grid,
+                                            statistic='median')[2][-1, 0],
+                           2.5)
+    assert vis.latency_grid(res, grid, statistic='max')[2][-1, 0] == 10.0
+    assert vis.latency_grid(res, grid, statistic='count')[2][-1, 0] == 4
+    assert np.nansum(vis.latency_grid(res, grid, cell_size=1.0,
+                                      statistic='count')[2]) == 6
+
+    fig, ax = vis.plot_latency_map(res, grid, statistic='median')
+    plt.close(fig)
+
+
+def test_latency_map_metric_grid():
+    # 10 km grid of 3000 x 2000 km in metres like an Equi7 tile
+    x, y = np.meshgrid(np.arange(5000, 3000000, 10000.),
+                       np.arange(5000, 2000000, 10000.))
+    grid = grids.BasicGrid(x.ravel(), y.ravel())
+    gpis = np.array([0, 1, 300 * 199 + 299])
+    res = test_cases.TestResults([1.0, 3.0, 5.0], 'metric',
+                                 columns={'gpi': gpis})
+
+    x_edges, y_edges, values = vis.latency_grid(res, grid)
+    nptest.assert_allclose(np.diff(x_edges), 50000)
+    assert values.shape == (40, 60)
+    assert values[0, 0] == 2.0
+    assert values[-1, -1] == 5.0
+    assert np.nansum(vis.latency_grid(res, grid, statistic='count')[2]) == 3
+
+    fig, ax = vis.plot_latency_map(res, grid)
+    plt.close(fig)
@@ -0,0 +1,123 @@
+# Copyright (c) 2026,Vienna University of Technology,
+# Department of Geodesy and Geoinformation
+# All rights reserved.
+
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL VIENNA UNIVERSITY OF TECHNOLOGY,
+# DEPARTMENT OF GEODESY AND GEOINFORMATION BE LIABLE FOR ANY
+# DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND
+# ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+'''
+Tests for the samplers of access patterns
+Created on Fri Oct 30 10:51:19 2026
+'''
+
+from datetime import datetime, timedelta
+
+import numpy as np
+from pygeogrids import grids
+
+from smdc_perftests.performance_tests import workloads
+from smdc_perftests.performance_tests import test_cases
+from smdc_perftests.performance_tests import test_scripts
+from .fixtures import tempdir
+from .test_test_cases import FakeDataset
+
+
+def global_grid():
+    lons, lats = np.meshgrid(np.arange(-179.5, 180, 1.),
+                             np.arange(89.5, -90, -1.))
+    return grids.BasicGrid(lons.ravel(), lats.ravel()).to_cell_grid(5.)
+
+
+def test_zipf_sampler():
+    population = range(1000)
+    sampled = workloads.zipf_sampler(s=1.5, shuffle=False,
+                                     seed=1)(population, 10000)
+    assert len(sampled) == 10000
+    counts = np.bincount(sampled, minlength=1000)
+    assert counts[0] > counts[1] > counts[10] > counts[500]
+    assert counts[0] > 3000
+
+    shuffled = workloads.zipf_sampler(s=1.5, seed=1)(population, 10000)
+    assert np.bincount(shuffled).max() > 3000
+    assert np.argmax(np.bincount(shuffled)) != 0
+    assert workloads.zipf_sampler(seed=2)(population, 50) == \
+        workloads.zipf_sampler(seed=2)(population, 50)
+
+    # the ranking is kept for the same population
+    sampler = workloads.zipf_sampler(s=3, seed=3, population=population)
+    hot = [np.argmax(np.bincount(sampler(population, 1000)))
+           for _ in range(5)]
+    assert len(set(hot)) == 1
+    assert max(sampler(range(5), 100)) < 5
+
+
+def test_recency_sampler():
+    dates = [datetime(2007, 1, 1) + timedelta(days=i) for i in range(365)]
+    sampled = workloads.recency_sampler(half_life=10, seed=0)(dates, 1000)
+    age = np.array([(dates[-1] - d).days for d in sampled])
+    assert np.median(age) < 15
+    assert age.max() < 200
+
+    ranges = [[d, d + timedelta(days=30)] for d in dates]
+    sampled = workloads.recency_sampler(seed=0)(ranges, 10)
+    assert all(isinstance(item, list) for item in sampled)
+
+
+def test_spatial_walk_sampler():
+    grid = global_grid()
+    population = np.arange(0, 64800, 3)
+    sampled = workloads.spatial_walk_sampler(grid, restart_prob=0.0,
+                                             seed=0)(population, 200)
+    assert len(sampled) == 200
+    lon, lat = grid.gpi2lonlat(np.array(sampled))
+    steps = np.hypot(np.diff(lon), np.diff(lat))
+    assert steps.max() < 4
+    assert set(sampled) <= set(population)
+
+    jumping = workloads.spatial_walk_sampler(grid, restart_prob=1.0,
+                                             seed=0)(population, 200)
+    lon, lat = grid.gpi2lonlat(np.array(jumping))
+    assert np.hypot(np.diff(lon), np.diff(lat)).max() > 50
+
+    prepared = workloads.spatial_walk_sampler(grid, restart_prob=0.0, seed=0,
+                                              population=population)
+    assert prepared(population, 200) == sampled
+    assert len(workloads.spatial_walk_sampler(grid)([5], 3)) == 3
+
+
+def test_cell_scan_sampler():
+    grid = global_grid()
+    population = np.arange(64800)
+    sampled = workloads.cell_scan_sampler(grid, seed=0)(population, 100)
+    cells = grid.gpi2cell(np.array(sampled))
+    # consecutive gpis of 5 cells with 25 gpis each
+    assert len(np.unique(cells)) <= 5
+    assert np.count_nonzero(np.diff(cells)) == len(np.unique(cells)) - 1
+
+    cells = [5, 1, 3, 2, 4]
+    assert workloads.cell_scan_sampler(seed=0)(cells, 5) in \
+        [[1, 2, 3, 4, 5][i:] + [1, 2, 3, 4, 5][:i] for i in range(5)]
+
+
+def test_drivers_with_sampler(tempdir):
+    fd = FakeDataset()
+    std = test_cases.SelfTimingDataset(fd)
+    test_cases.read_rand_ts_by_gpi_list(
+        std, range(100), read_perc=50,
+        sampler=workloads.zipf_sampler(s=3, shuffle=False, seed=0))
+    gpis = std.context_measurements['get_timeseries']['gpi']
+    assert len(gpis) == 50
+    assert list(gpis).count(0) > 25
+
+    test_scripts.run_performance_tests(
+        'scan', fd, '.', gpi_list=range(1000),
+        gpi_sampler=workloads.cell_scan_sampler(seed=0))